@@ -7,13 +7,28 @@ Run: streamlit run 04_software.py --server.port 8502
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import joblib, json
 from datetime import datetime, date, timedelta
+import os
+import bundle
+import changefeed
+import dataserver
+import drift
+import export
+import intake
+import ops
+import outreach
+import pages
+import priority
+from lookup import StudentIndex
+from records import RecordStore
+from scoring import ApplicantScorer
+from service import ScoringClient, ServiceUnavailable
 
 st.set_page_config(page_title="Gaborone Technical | Student System", page_icon="🎓", layout="wide")
+ops.configure_logging()
+run = ops.start("software", profile=st.query_params.get("profile"))
 
 st.markdown("""
 <style>
@@ -207,31 +222,102 @@ div[style*="color:#161717"] {
 """, unsafe_allow_html=True)
 
 # ── LOAD ──────────────────────────────────────────────────────────
-@st.cache_resource
-def load_model():
-    m = joblib.load("model.pkl")
-    lc = joblib.load("le_campus.pkl")
-    lp = joblib.load("le_program.pkl")
-    ls = joblib.load("le_source.pkl")
-    lpar = joblib.load("le_parent.pkl")
-    lg = joblib.load("le_gender.pkl")
-    with open("features.json") as f: feat = json.load(f)
-    return m, lc, lp, ls, lpar, lg, feat
-
-@st.cache_data
-def load_data():
-    return pd.read_csv("student_data_scored.csv")
-
-model, le_campus, le_program, le_source, le_parent, le_gender, FEATURES = load_model()
-df = load_data()
-
-CAMPUSES = sorted(le_campus.classes_.tolist())
-PROGRAMS = sorted(le_program.classes_.tolist())
-SOURCES  = sorted(le_source.classes_.tolist())
-
-# Session state
-if "registrations" not in st.session_state: st.session_state.registrations = []
-if "interventions" not in st.session_state: st.session_state.interventions = []
+# model.bundle: trees memory-mapped, encoders + feature order from the manifest (fails fast if stale).
+# With SCORING_URL set (e.g. http://127.0.0.1:8600) the form calls service.py instead of holding a model.
+# If the service is down, the client scores with the in-process model until it answers again.
+@ops.cached(st.cache_resource)
+def load_scorer():
+    url = os.environ.get("SCORING_URL")
+    if url:
+        return ScoringClient(url, fallback=load_local_scorer)
+    return load_local_scorer()
+
+@ops.cached(st.cache_resource)
+def load_local_scorer():
+    return ApplicantScorer.from_bundle(bundle.load_or_build())
+
+# Drift counters for the registrations this process saves or queues (once per applicant, not per rerun);
+# the Ops page adds up every process's (drift.py)
+@ops.cached(st.cache_resource)
+def load_drift():
+    return drift.load_monitor("app")
+
+# Columns each page reads from the store (status + at_risk feed the sidebar counters on every page)
+BASE_COLUMNS = ["student_id", "status", "at_risk"]
+PAGE_COLUMNS = {
+    "📝  Register New Student": [],
+    "📥  Bulk Import":          [],
+    "⚠️  At-Risk Alert Board":  ["program", "campus", "risk_level", "dropout_probability", "attendance_rate_pct",
+                                 "grade_average_pct", "courses_failed", "warnings_issued"],
+    "📞  Log Intervention":     [],
+    "📣  Outreach":             ["program", "campus", "risk_level", "dropout_probability"],
+    "📅  Follow-Ups":           [],
+    "🔍  Check Student Record": ["age", "gender", "campus", "program", "year_enrolled", "semester_enrolled",
+                                 "enrollment_source", "distance_from_campus_km", "has_transport",
+                                 "has_financial_aid", "attendance_rate_pct", "grade_average_pct",
+                                 "courses_failed", "warnings_issued"],
+    "📋  Registration Queue":   [],
+}
+
+STUDENT_COLUMNS = list(dict.fromkeys(BASE_COLUMNS + [c for cols in PAGE_COLUMNS.values() for c in cols]))
+
+# With DATASET_DIR set, rows come from dataserver.py's shared-memory snapshot (one copy per machine)
+@ops.cached(st.cache_resource)
+def load_source():
+    return dataserver.connect()
+
+# One compact frame shared by every session; pages take their column projection of it. A new source
+# version (the data file changed) replaces it, and the index below
+@ops.cached(st.cache_resource(max_entries=1))
+def load_data(version):
+    return ops.frame_mb("students", load_source().frame(STUDENT_COLUMNS))
+
+# student_records.db: registrations + interventions, shared by every session (records.py)
+@ops.cached(st.cache_resource)
+def load_records():
+    return RecordStore()
+
+# Hash + typeahead index over student IDs; row positions match every column projection of the store
+@ops.cached(st.cache_resource(max_entries=1))
+def load_index(version):
+    ix = StudentIndex(load_source().frame(["student_id"]))
+    ops.gauge("memory.student_index_mb", ix.nbytes() / 1e6)
+    return ix
+
+# Search over the registration queue (reg_id / name / Omang); rebuilt only when registrations are added
+@ops.cached(st.cache_resource(max_entries=1))
+def load_reg_index(last_seq):
+    keys = load_records().registration_keys()
+    return keys["reg_id"].to_numpy(), StudentIndex(keys, key="reg_id")
+
+# Alert board order, kept per (campus, program) and moved in place as the change feed rescores students
+@ops.cached(st.cache_resource(max_entries=1))
+def load_board(version):
+    return priority.PriorityBoard(load_data(version))
+
+# Outreach jobs run on background threads; every session sees (and polls) the same list.
+# OUTREACH_SMTP=host:port sends e-mail through that server, otherwise messages go to outbox.jsonl
+@ops.cached(st.cache_resource)
+def load_outreach():
+    return {"transports": outreach.transports_from_env(), "jobs": []}
+
+# Change feed: fresh attendance / grade figures are rescored for the changed students only, on a
+# background thread that also keeps this process's copy of the score overlay (pages only read it)
+@ops.cached(st.cache_resource)
+def load_feed():
+    return changefeed.FeedWorker(changefeed.ChangeFeed(), load_source())
+
+scorer  = load_scorer()
+records = load_records()
+
+CAMPUSES = scorer.categories("campus")
+PROGRAMS = scorer.categories("program")
+SOURCES  = scorer.categories("source")
+BOARD_PAGE = 200          # alert board rows per "load more"
+REG_PAGE   = 25           # registration queue cards per page
+LOG_ROWS   = 200          # latest interventions shown on the log page (the export has all of them)
+# Student lists keep percentages numeric (sortable); the table shows them as "80%"
+PCT_COLUMNS = {c: st.column_config.NumberColumn(format="%.0f%%") for c in pages.PCT_COLUMNS}
 
 def kcard(color, val, lbl, sub=""):
     return f'<div class="kcard {color}"><div class="kval">{val}</div><div class="klbl">{lbl}</div>{"<div class=ksub>"+sub+"</div>" if sub else ""}</div>'
@@ -245,467 +331,660 @@ with st.sidebar:
     st.markdown("## 🎓 Student Management")
     st.markdown("*Gaborone Technical College*")
     st.markdown("---")
-    nav = st.radio("Go to", [
-        "📝  Register New Student",
-        "⚠️  At-Risk Alert Board",
-        "📞  Log Intervention",
-        "🔍  Check Student Record",
-        "📋  Registration Queue",
-    ])
+    nav = st.radio("Go to", list(PAGE_COLUMNS))
+    # Hidden Ops page: timings, cache hit rates, memory for this server process
+    if st.query_params.get("ops") == "1":
+        nav = "🛠  Ops"
+    run.set_page(nav)
+    version = load_source().version()
+    df = load_data(version)[BASE_COLUMNS + PAGE_COLUMNS.get(nav, [])]
+    overlay = load_feed().overlay()
+    with ops.span("changefeed.overlay"):
+        df = changefeed.apply(df, overlay, load_index(version))
     st.markdown("---")
-    active = (df["status"]=="Active").sum()
-    at_risk = df[(df["status"]=="Active") & (df["at_risk"]==1)].shape[0]
-    pending_reg = len(st.session_state.registrations)
+    counts = pages.sidebar_counts(df)
+    active, at_risk = counts["active"], counts["at_risk"]
+    pending_reg = records.registration_counts().get("Pending Approval", 0)
+    fu_counts   = records.follow_up_counts(str(date.today()))
     st.markdown(f"👥 **Active students:** {active}")
     st.markdown(f"🔴 **At-risk:** {at_risk}")
     st.markdown(f"📋 **Pending registrations:** {pending_reg}")
+    st.markdown(f"📅 **Follow-ups due:** {fu_counts['overdue'] + fu_counts['today']}")
+
+try:
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 1 — REGISTER NEW STUDENT
+    # Automates the registration form + instant dropout risk check
+    # ════════════════════════════════════════════════════════════════
+    if nav == "📝  Register New Student":
+        st.markdown('<div class="topbar"><h1>📝 New Student Registration</h1><p>Quick registration form with instant dropout risk assessment</p></div>', unsafe_allow_html=True)
+
+        st.markdown("### 👤 Student Information")
+        col1,col2,col3 = st.columns(3)
+
+        with col1:
+            st.markdown("**Personal Details**")
+            full_name = st.text_input("Full Name")
+            omang     = st.text_input("Omang / ID Number")
+            age       = st.number_input("Age", 16, 65, 20)
+            gender    = st.selectbox("Gender", ["Male","Female"])
+            phone     = st.text_input("Phone Number")
+
+        with col2:
+            st.markdown("**Program & Campus**")
+            campus    = st.selectbox("Campus", CAMPUSES)
+            program   = st.selectbox("Program", PROGRAMS)
+            year_enr  = st.selectbox("Enrollment Year", [2024, 2025, 2026])
+            semester  = st.selectbox("Semester", ["Semester 1","Semester 2"])
+            source    = st.selectbox("How Did You Hear About Us?", SOURCES)
+
+        with col3:
+            st.markdown("**Background & Support**")
+            distance  = st.number_input("Distance from Campus (km)", 0.5, 150.0, 10.0, 0.5)
+            transport = st.checkbox("Has Own Transport?")
+            parent_ed = st.selectbox("Parent/Guardian Education", ["None","Primary","Secondary","Tertiary"])
+            fin_aid   = st.checkbox("Applying for Financial Aid?")
+            working   = st.checkbox("Working Part-Time?")
+
+        st.markdown("---")
+
+        # Remember the check across reruns so the Save button below can fire
+        if st.button("🔍  CHECK REGISTRATION & ASSESS RISK"): st.session_state.reg_checked = True
+        if st.session_state.get("reg_checked"):
+            if not full_name or not omang:
+                st.error("Please fill in at least Full Name and Omang.")
+            else:
+                applicant = {"age": age, "gender": gender, "campus": campus, "program": program,
+                             "year": year_enr, "source": source, "distance": distance, "transport": transport,
+                             "parent_ed": parent_ed, "fin_aid": fin_aid, "working": working}
+                try:
+                    with ops.span("model.score"):
+                        result = scorer.score(applicant)
+                except ValueError as e:
+                    st.error(f"Cannot assess this registration: {e}")
+                    st.stop()
+                except ServiceUnavailable as e:
+                    st.error(f"Cannot assess this registration right now: {e}. Please try again shortly.")
+                    st.stop()
+                if getattr(scorer, "degraded", False):
+                    ops.count("service.fallback")
+                    st.warning(f"Scoring service unavailable ({scorer.last_error}) — assessed with the in-app model.")
+                prob  = result["probability"] * 100
+                level = result["level"]
+
+                # Risk level styling
+                if level == "LOW RISK":
+                    bg = "#052e16"
+                    border = "#22c55e"
+                    icon = "🟢"
+                    colour = "#86efac"
+                elif level == "MEDIUM RISK":
+                    bg = "#422006"
+                    border = "#f97316"
+                    icon = "🟡"
+                    colour = "#fde68a"
+                else:
+                    bg = "#450a0a"
+                    border = "#ef4444"
+                    icon = "🔴"
+                    colour = "#fca5a5"
 
-# ════════════════════════════════════════════════════════════════
-# PAGE 1 — REGISTER NEW STUDENT
-# Automates the registration form + instant dropout risk check
-# ════════════════════════════════════════════════════════════════
-if nav == "📝  Register New Student":
-    st.markdown('<div class="topbar"><h1>📝 New Student Registration</h1><p>Quick registration form with instant dropout risk assessment</p></div>', unsafe_allow_html=True)
-
-    st.markdown("### 👤 Student Information")
-    col1,col2,col3 = st.columns(3)
-
-    with col1:
-        st.markdown("**Personal Details**")
-        full_name = st.text_input("Full Name")
-        omang     = st.text_input("Omang / ID Number")
-        age       = st.number_input("Age", 16, 65, 20)
-        gender    = st.selectbox("Gender", ["Male","Female"])
-        phone     = st.text_input("Phone Number")
-
-    with col2:
-        st.markdown("**Program & Campus**")
-        campus    = st.selectbox("Campus", CAMPUSES)
-        program   = st.selectbox("Program", PROGRAMS)
-        year_enr  = st.selectbox("Enrollment Year", [2024, 2025, 2026])
-        semester  = st.selectbox("Semester", ["Semester 1","Semester 2"])
-        source    = st.selectbox("How Did You Hear About Us?", SOURCES)
-
-    with col3:
-        st.markdown("**Background & Support**")
-        distance  = st.number_input("Distance from Campus (km)", 0.5, 150.0, 10.0, 0.5)
-        transport = st.checkbox("Has Own Transport?")
-        parent_ed = st.selectbox("Parent/Guardian Education", ["None","Primary","Secondary","Tertiary"])
-        fin_aid   = st.checkbox("Applying for Financial Aid?")
-        working   = st.checkbox("Working Part-Time?")
-
-    st.markdown("---")
+                # Result banner
+                st.markdown(f"""
+                <div style="background:{bg};border:2px solid {border};border-radius:14px;padding:2rem;margin:1rem 0;text-align:center;">
+                  <div style="font-size:3rem;margin-bottom:.5rem">{icon}</div>
+                  <div style="font-size:2.5rem;font-weight:800;color:{colour}">{level}</div>
+                  <div style="color:#94a3b8;margin-top:.5rem">{full_name} &nbsp;·&nbsp; Predicted dropout risk: {prob:.0f}%</div>
+                </div>
+                """, unsafe_allow_html=True)
 
-    if st.button("🔍  CHECK REGISTRATION & ASSESS RISK"):
-        if not full_name or not omang:
-            st.error("Please fill in at least Full Name and Omang.")
-        else:
-            # Feature engineering
-            prog_len = 1 if "Certificate" in program else 2
-            attendance_low = 0  # can't know yet
-            grade_low      = 0  # can't know yet
-            failed_mult    = 0  # can't know yet
-            distance_far   = 1 if distance > 40 else 0
-            age_mature     = 1 if age > 30 else 0
-            parent_low     = 1 if parent_ed in ("None","Primary") else 0
+                # Risk factors identified - FIXED: Changed color from #161717 to #ffffff
+                st.markdown("### 🚩 Risk Factors Identified")
+                flags = result["flags"]
 
-            try:
-                campus_enc = le_campus.transform([campus])[0]
-                program_enc= le_program.transform([program])[0]
-                source_enc = le_source.transform([source])[0]
-                parent_enc = le_parent.transform([parent_ed])[0]
-                gender_enc = le_gender.transform([gender])[0]
-            except:
-                campus_enc=program_enc=source_enc=parent_enc=gender_enc=0
-
-            # Predict with limited info (we don't have attendance/grades yet)
-            # Use average values for unknown features
-            avg_att = 80.0
-            avg_grade = 55.0
-            courses_fail = 0
-            warnings = 0
-
-            row = np.array([[
-                age, distance, int(transport), int(fin_aid), int(working),
-                avg_att, avg_grade, courses_fail, warnings,
-                prog_len, year_enr,
-                campus_enc, program_enc, source_enc, parent_enc, gender_enc,
-                attendance_low, grade_low, failed_mult, distance_far, age_mature, parent_low,
-            ]])
-
-            prob = model.predict_proba(row)[0][1] * 100
-
-            # Risk level
-            if prob < 30:
-                level = "LOW RISK"
-                bg = "#052e16"
-                border = "#22c55e"
-                icon = "🟢"
-                colour = "#86efac"
-            elif prob < 55:
-                level = "MEDIUM RISK"
-                bg = "#422006"
-                border = "#f97316"
-                icon = "🟡"
-                colour = "#fde68a"
-            else:
-                level = "HIGH RISK"
-                bg = "#450a0a"
-                border = "#ef4444"
-                icon = "🔴"
-                colour = "#fca5a5"
-
-            # Result banner
-            st.markdown(f"""
-            <div style="background:{bg};border:2px solid {border};border-radius:14px;padding:2rem;margin:1rem 0;text-align:center;">
-              <div style="font-size:3rem;margin-bottom:.5rem">{icon}</div>
-              <div style="font-size:2.5rem;font-weight:800;color:{colour}">{level}</div>
-              <div style="color:#94a3b8;margin-top:.5rem">{full_name} &nbsp;·&nbsp; Predicted dropout risk: {prob:.0f}%</div>
+                if flags:
+                    for f in flags:
+                        c = "#ef4444" if level == "HIGH RISK" else "#f97316"
+                        # FIXED: Changed color from #161717 to #ffffff
+                        st.markdown(f'<div style="background:#1e293b;border-left:4px solid {c};border-radius:8px;padding:.85rem;margin:.4rem 0;color:#ffffff">⚠️ {f}</div>', unsafe_allow_html=True)
+                else:
+                    st.success("✅ No major risk factors identified at enrollment")
+
+                # Recommendation
+                st.markdown("### 📋 Enrollment Recommendation")
+                if level == "LOW RISK":
+                    st.markdown("""
+                    <div class="result-pass">
+                    <h4 style="color:#86efac;margin-top:0">✅ APPROVE REGISTRATION</h4>
+                    <p>This student has a good profile for success. Proceed with standard enrollment.</p>
+                    <p><b>Suggested support:</b> Assign to regular academic advisor, no special monitoring needed.</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                elif level == "MEDIUM RISK":
+                    st.markdown("""
+                    <div class="result-risk">
+                    <h4 style="color:#fde68a;margin-top:0">⚠️ APPROVE WITH MONITORING</h4>
+                    <p>This student has some risk factors. Accept them but provide extra support.</p>
+                    <p><b>Suggested support:</b></p>
+                    <ul>
+                      <li>Assign to an academic advisor experienced with at-risk students</li>
+                      <li>Check in after first month to see how they're coping</li>
+                      <li>Flag for early intervention if attendance drops below 80%</li>
+                    </ul>
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.markdown("""
+                    <div class="result-fail">
+                    <h4 style="color:#fca5a5;margin-top:0">🔴 APPROVE WITH INTENSIVE SUPPORT</h4>
+                    <p>This student has significant risk factors. They need proactive support to succeed.</p>
+                    <p><b>Required support plan:</b></p>
+                    <ul>
+                      <li>Assign to Student Support Services immediately upon enrollment</li>
+                      <li>Weekly check-ins for first 8 weeks</li>
+                      <li>Connect with counselor if they live far or lack transport — arrange carpooling or accommodation</li>
+                      <li>Priority consideration for financial aid or work-study programs</li>
+                      <li>If attendance drops below 85% in first month, trigger immediate intervention</li>
+                    </ul>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                # Save registration
+                st.markdown("---")
+                st.markdown("### 💾 Complete Registration")
+                reg_officer = st.text_input("Your Name (Admissions Officer)")
+                notes       = st.text_area("Notes (optional)")
+                if st.button("💾  Save Registration", key="save_reg"):
+                    reg_id = records.add_registration({
+                        "date":        str(date.today()),
+                        "student_name":full_name,
+                        "omang":       omang,
+                        "age":         age,
+                        "gender":      gender,
+                        "phone":       phone,
+                        "campus":      campus,
+                        "program":     program,
+                        "year":        year_enr,
+                        "semester":    semester,
+                        "source":      source,
+                        "risk_level":  level,
+                        "risk_score":  f"{prob:.0f}%",
+                        "officer":     reg_officer,
+                        "notes":       notes,
+                        "status":      "Pending Approval",
+                    })
+                    load_drift().observe([applicant])
+                    st.success(f"✅ Registration {reg_id} saved! Go to **Registration Queue** to review.")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 1b — BULK IMPORT
+    # Intake week: a whole file of applicants validated, scored and queued at once (intake.py)
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "📥  Bulk Import":
+        st.markdown('<div class="topbar"><h1>📥 Bulk Applicant Import</h1><p>Upload a CSV or Excel file of applicants — every row is checked and risk-scored, then added to the Registration Queue in one step</p></div>', unsafe_allow_html=True)
+
+        c1,c2 = st.columns([3,1])
+        upload = c1.file_uploader("Applicants file (CSV or Excel)", type=["csv", "xlsx"])
+        c2.download_button("📄 Download template", intake.template_bytes(), "applicants_template.csv", "text/csv")
+        bulk_officer = c2.text_input("Your Name (Admissions Officer)", key="bulk_officer")
+
+        if upload is not None:
+            # One check per uploaded file; reruns (e.g. typing the officer name) reuse the result
+            if st.session_state.get("bulk_file") != upload.file_id:
+                try:
+                    applicants = intake.read(upload, upload.name)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                    st.stop()
+                bar = st.progress(0.0, text=f"Read {len(applicants):,} rows")
+                try:
+                    with ops.span("intake.check"):
+                        result = intake.check(applicants, scorer, progress=lambda f, text: bar.progress(f, text=text),
+                                              records=records)
+                except ServiceUnavailable as e:
+                    st.error(f"❌ Could not score the file: {e}. Please try again shortly.")
+                    st.stop()
+                bar.empty()
+                if getattr(scorer, "degraded", False):
+                    st.warning(f"Scoring service unavailable ({scorer.last_error}) — scored with the in-app model.")
+                st.session_state.update(bulk_file=upload.file_id, bulk_result=result, bulk_queued=None)
+            summary, rejected, scored = st.session_state["bulk_result"]
+
+            c1,c2,c3,c4 = st.columns(4)
+            c1.markdown(kcard("blue",   f"{summary['rows']:,}",    "Rows in File", upload.name), unsafe_allow_html=True)
+            c2.markdown(kcard("green",  f"{summary['valid']:,}",   "Ready to Queue", f"checked in {summary['seconds']:.2f}s"), unsafe_allow_html=True)
+            c3.markdown(kcard("red",    f"{summary['invalid']:,}", "Rejected Rows", "fix and re-upload"), unsafe_allow_html=True)
+            c4.markdown(kcard("orange", f"{summary['levels'].get('HIGH RISK', 0):,}", "High Risk", "need intensive support"), unsafe_allow_html=True)
+
+            if len(rejected):
+                st.markdown("### ❌ Rows with Errors")
+                st.dataframe(rejected[["student_name", "omang", "errors"]], use_container_width=True)
+                export.download(st, "📥 Export Rejected Rows", rejected, "rejected_applicants", version=upload.file_id)
+
+            if len(scored):
+                st.markdown("### ✅ Scored Applicants")
+                preview = scored[["student_name", "omang", "campus", "program", "level"]].assign(
+                    **{"Risk %": scored["probability"] * 100})
+                st.dataframe(preview.head(1000), use_container_width=True,
+                             column_config={"Risk %": st.column_config.NumberColumn(format="%.0f%%")})
+                if len(preview) > 1000:
+                    st.caption(f"Showing 1,000 of {len(preview):,} — all of them are added to the queue")
+
+                queued = st.session_state.get("bulk_queued")
+                if queued:
+                    st.success(f"✅ {len(queued):,} registrations added ({queued[0]} – {queued[-1]}). Go to **Registration Queue** to review.")
+                elif st.button(f"💾  Add {len(scored):,} registrations to the queue", key="bulk_save"):
+                    with ops.span("intake.queue"):
+                        st.session_state["bulk_queued"] = intake.queue(scored, records, bulk_officer)
+                    load_drift().observe_table(scored)
+                    st.rerun()
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 2 — AT-RISK ALERT BOARD
+    # Daily priority list sorted by urgency
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "⚠️  At-Risk Alert Board":
+        st.markdown('<div class="topbar"><h1>⚠️ At-Risk Student Alert Board</h1><p>Students who need immediate intervention to prevent dropout</p></div>', unsafe_allow_html=True)
+        if len(overlay):
+            st.caption(f"🔄 {len(overlay):,} students rescored from new attendance / grade figures · "
+                       f"latest {datetime.fromtimestamp(overlay['scored_at'].max()):%d %b %H:%M:%S}")
+
+        rc = pages.alert_counts(df)
+
+        c1,c2,c3,c4 = st.columns(4)
+        c1.markdown(kcard("red",    f"{rc.get('Critical',0):,}",    "Critical Risk",    "Urgent intervention needed"), unsafe_allow_html=True)
+        c2.markdown(kcard("orange", f"{rc.get('High Risk',0):,}",   "High Risk",        "Meet with them this week"), unsafe_allow_html=True)
+        c3.markdown(kcard("blue",   f"{rc.get('Medium Risk',0):,}", "Medium Risk",      "Monitor closely"), unsafe_allow_html=True)
+        c4.markdown(kcard("green",  f"{rc.get('Low Risk',0):,}",    "On Track",         "No immediate action"), unsafe_allow_html=True)
+
+        st.markdown("---")
+        st.markdown("### 📏 Action Plan by Risk Level")
+        e1,e2,e3 = st.columns(3)
+        with e1:
+            st.markdown("""
+            <div style="background:#450a0a;border:1px solid #ef4444;border-radius:10px;padding:1.2rem">
+            <h4 style="color:#fca5a5;margin-top:0">🔴 CRITICAL</h4>
+            <p><b>Step 1:</b> Call or meet student TODAY</p>
+            <p><b>Step 2:</b> Contact parent/guardian if student is under 21</p>
+            <p><b>Step 3:</b> Refer to counselor for support plan</p>
+            <p><b>Step 4:</b> Log all contact in system</p>
+            </div>
+            """, unsafe_allow_html=True)
+        with e2:
+            st.markdown("""
+            <div style="background:#431407;border:1px solid #f97316;border-radius:10px;padding:1.2rem">
+            <h4 style="color:#fed7aa;margin-top:0">🟠 HIGH RISK</h4>
+            <p><b>Step 1:</b> Schedule meeting within 5 days</p>
+            <p><b>Step 2:</b> Review attendance and grades with student</p>
+            <p><b>Step 3:</b> Offer tutoring or study group support</p>
+            <p><b>Step 4:</b> Follow up in 2 weeks</p>
+            </div>
+            """, unsafe_allow_html=True)
+        with e3:
+            st.markdown("""
+            <div style="background:#422006;border:1px solid #f59e0b;border-radius:10px;padding:1.2rem">
+            <h4 style="color:#fde68a;margin-top:0">🟡 MEDIUM RISK</h4>
+            <p><b>Step 1:</b> Send friendly check-in email or SMS</p>
+            <p><b>Step 2:</b> Remind them of tutoring hours available</p>
+            <p><b>Step 3:</b> Monitor next 4 weeks</p>
             </div>
             """, unsafe_allow_html=True)
 
-            # Risk factors identified - FIXED: Changed color from #161717 to #ffffff
-            st.markdown("### 🚩 Risk Factors Identified")
-            flags = []
-            if distance > 40:        flags.append(f"Lives {distance:.0f}km from campus — commute is difficult")
-            if not transport:        flags.append("No personal transport — relies on public transport")
-            if working:              flags.append("Working part-time — may struggle to balance job and studies")
-            if parent_ed in ("None","Primary"): flags.append("Low parent/guardian education — less academic support at home")
-            if not fin_aid:          flags.append("Not applying for financial aid — may face financial pressure")
-            if age > 30:             flags.append(f"Age {age} — mature students often face work/family competing priorities")
-
-            if flags:
-                for f in flags:
-                    c = "#ef4444" if level == "HIGH RISK" else "#f97316"
-                    # FIXED: Changed color from #161717 to #ffffff
-                    st.markdown(f'<div style="background:#1e293b;border-left:4px solid {c};border-radius:8px;padding:.85rem;margin:.4rem 0;color:#ffffff">⚠️ {f}</div>', unsafe_allow_html=True)
-            else:
-                st.success("✅ No major risk factors identified at enrollment")
-
-            # Recommendation
-            st.markdown("### 📋 Enrollment Recommendation")
-            if level == "LOW RISK":
-                st.markdown("""
-                <div class="result-pass">
-                <h4 style="color:#86efac;margin-top:0">✅ APPROVE REGISTRATION</h4>
-                <p>This student has a good profile for success. Proceed with standard enrollment.</p>
-                <p><b>Suggested support:</b> Assign to regular academic advisor, no special monitoring needed.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif level == "MEDIUM RISK":
-                st.markdown("""
-                <div class="result-risk">
-                <h4 style="color:#fde68a;margin-top:0">⚠️ APPROVE WITH MONITORING</h4>
-                <p>This student has some risk factors. Accept them but provide extra support.</p>
-                <p><b>Suggested support:</b></p>
-                <ul>
-                  <li>Assign to an academic advisor experienced with at-risk students</li>
-                  <li>Check in after first month to see how they're coping</li>
-                  <li>Flag for early intervention if attendance drops below 80%</li>
-                </ul>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class="result-fail">
-                <h4 style="color:#fca5a5;margin-top:0">🔴 APPROVE WITH INTENSIVE SUPPORT</h4>
-                <p>This student has significant risk factors. They need proactive support to succeed.</p>
-                <p><b>Required support plan:</b></p>
-                <ul>
-                  <li>Assign to Student Support Services immediately upon enrollment</li>
-                  <li>Weekly check-ins for first 8 weeks</li>
-                  <li>Connect with counselor if they live far or lack transport — arrange carpooling or accommodation</li>
-                  <li>Priority consideration for financial aid or work-study programs</li>
-                  <li>If attendance drops below 85% in first month, trigger immediate intervention</li>
-                </ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-            # Save registration
-            st.markdown("---")
-            st.markdown("### 💾 Complete Registration")
-            reg_officer = st.text_input("Your Name (Admissions Officer)")
-            notes       = st.text_area("Notes (optional)")
-            if st.button("💾  Save Registration", key="save_reg"):
-                st.session_state.registrations.append({
-                    "reg_id":      f"REG-{len(st.session_state.registrations)+1:04d}",
+        st.markdown("---")
+        st.markdown("### 🔴 Priority Contact List — Sorted by Urgency")
+        st.caption("Work from top to bottom — these students are most at risk right now")
+
+        board = load_board(version)
+        with ops.span("priority.sync"):
+            board.sync(overlay)
+        bc1,bc2 = st.columns(2)
+        b_campus  = bc1.selectbox("Campus", ["All campuses"] + board.campuses())
+        b_campus  = None if b_campus == "All campuses" else b_campus
+        b_program = bc2.selectbox("Program", ["All programs"] + board.programs(b_campus))
+        b_program = None if b_program == "All programs" else b_program
+        total = board.count(b_campus, b_program)
+        # Rows loaded so far for this filter; "Load more" fetches the next page of the index
+        shown_key = f"board_rows:{b_campus}:{b_program}"
+        n_shown = st.session_state.setdefault(shown_key, BOARD_PAGE)
+
+        if total > 0:
+            show = pages.priority_page(df, board, 0, n_shown, b_campus, b_program)
+            st.dataframe(show, use_container_width=True, column_config=PCT_COLUMNS)
+            st.caption(f"Showing {len(show):,} of {total:,} at-risk students")
+            if len(show) < total and st.button(f"⬇️  Load {min(BOARD_PAGE, total - len(show)):,} more"):
+                st.session_state[shown_key] = n_shown + BOARD_PAGE
+                st.rerun()
+            # The full list is only put together when someone asks for the file
+            export.download(st, f"📥 Download all {total:,} At-Risk Students",
+                            lambda: pages.priority_all(df, board, b_campus, b_program),
+                            "at_risk_students", pct=pages.PCT_COLUMNS, version=(version, b_campus, b_program))
+        else:
+            st.success("✅ No students currently flagged as at-risk!")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 3 — LOG INTERVENTION
+    # Track all support actions taken
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "📞  Log Intervention":
+        st.markdown('<div class="topbar"><h1>📞 Log Student Intervention</h1><p>Record all meetings, calls, and support actions for at-risk students</p></div>', unsafe_allow_html=True)
+
+        st.markdown("### 📝 Intervention Details")
+        ic1,ic2 = st.columns(2)
+
+        with ic1:
+            query         = st.text_input("Search student ID", placeholder="e.g. GTC-0004 or 0042", key="log_query")
+            matches       = pages.lookup_matches(df, load_index(version), query, status="Active")
+            student_id    = st.selectbox("Select Student", matches)
+            if not matches:
+                st.caption(f"No active student matches “{query}”.")
+            intervention  = st.selectbox("Type of Intervention", [
+                "Phone Call","In-Person Meeting","Email Sent","SMS Sent",
+                "Parent/Guardian Meeting","Counselor Referral","Tutoring Arranged",
+                "Financial Aid Discussion","Academic Warning Issued","Study Plan Created"
+            ])
+            staff_name    = st.text_input("Your Name")
+            follow_up_date= st.date_input("Follow-Up Date", value=date.today()+timedelta(days=7))
+
+        with ic2:
+            outcome       = st.selectbox("Outcome", [
+                "Student responded positively","Student agreed to action plan","No response yet",
+                "Student declined support","Parent involved and supportive",
+                "Referred to counseling","Issue resolved","Situation unchanged"
+            ])
+            notes         = st.text_area("Notes", height=120)
+
+        if st.button("💾  Save Intervention Log"):
+            if not student_id:
+                st.error("Please select a student.")
+            elif staff_name:
+                records.add_intervention({
+                    "student_id":  student_id,
                     "date":        str(date.today()),
-                    "student_name":full_name,
-                    "omang":       omang,
-                    "age":         age,
-                    "gender":      gender,
-                    "phone":       phone,
-                    "campus":      campus,
-                    "program":     program,
-                    "year":        year_enr,
-                    "semester":    semester,
-                    "source":      source,
-                    "risk_level":  level,
-                    "risk_score":  f"{prob:.0f}%",
-                    "officer":     reg_officer,
+                    "intervention":intervention,
+                    "outcome":     outcome,
+                    "staff":       staff_name,
+                    "follow_up":   str(follow_up_date),
                     "notes":       notes,
-                    "status":      "Pending Approval",
                 })
-                st.success(f"✅ Registration saved! Go to **Registration Queue** to review.")
-
-# ════════════════════════════════════════════════════════════════
-# PAGE 2 — AT-RISK ALERT BOARD
-# Daily priority list sorted by urgency
-# ════════════════════════════════════════════════════════════════
-elif nav == "⚠️  At-Risk Alert Board":
-    st.markdown('<div class="topbar"><h1>⚠️ At-Risk Student Alert Board</h1><p>Students who need immediate intervention to prevent dropout</p></div>', unsafe_allow_html=True)
-
-    active_students = df[df["status"]=="Active"]
-    if "risk_level" in active_students.columns and not active_students["risk_level"].isna().all():
-        rc = active_students["risk_level"].value_counts()
-    else:
-        rc = pd.Series(dtype=int)
-
-    at_risk_total = (active_students["at_risk"]==1).sum() if "at_risk" in active_students.columns else 0
-
-    c1,c2,c3,c4 = st.columns(4)
-    c1.markdown(kcard("red",    f"{rc.get('Critical',0):,}",    "Critical Risk",    "Urgent intervention needed"), unsafe_allow_html=True)
-    c2.markdown(kcard("orange", f"{rc.get('High Risk',0):,}",   "High Risk",        "Meet with them this week"), unsafe_allow_html=True)
-    c3.markdown(kcard("blue",   f"{rc.get('Medium Risk',0):,}", "Medium Risk",      "Monitor closely"), unsafe_allow_html=True)
-    c4.markdown(kcard("green",  f"{rc.get('Low Risk',0):,}",    "On Track",         "No immediate action"), unsafe_allow_html=True)
-
-    st.markdown("---")
-    st.markdown("### 📏 Action Plan by Risk Level")
-    e1,e2,e3 = st.columns(3)
-    with e1:
-        st.markdown("""
-        <div style="background:#450a0a;border:1px solid #ef4444;border-radius:10px;padding:1.2rem">
-        <h4 style="color:#fca5a5;margin-top:0">🔴 CRITICAL</h4>
-        <p><b>Step 1:</b> Call or meet student TODAY</p>
-        <p><b>Step 2:</b> Contact parent/guardian if student is under 21</p>
-        <p><b>Step 3:</b> Refer to counselor for support plan</p>
-        <p><b>Step 4:</b> Log all contact in system</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with e2:
-        st.markdown("""
-        <div style="background:#431407;border:1px solid #f97316;border-radius:10px;padding:1.2rem">
-        <h4 style="color:#fed7aa;margin-top:0">🟠 HIGH RISK</h4>
-        <p><b>Step 1:</b> Schedule meeting within 5 days</p>
-        <p><b>Step 2:</b> Review attendance and grades with student</p>
-        <p><b>Step 3:</b> Offer tutoring or study group support</p>
-        <p><b>Step 4:</b> Follow up in 2 weeks</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with e3:
-        st.markdown("""
-        <div style="background:#422006;border:1px solid #f59e0b;border-radius:10px;padding:1.2rem">
-        <h4 style="color:#fde68a;margin-top:0">🟡 MEDIUM RISK</h4>
-        <p><b>Step 1:</b> Send friendly check-in email or SMS</p>
-        <p><b>Step 2:</b> Remind them of tutoring hours available</p>
-        <p><b>Step 3:</b> Monitor next 4 weeks</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    st.markdown("---")
-    st.markdown("### 🔴 Priority Contact List — Sorted by Urgency")
-    st.caption("Work from top to bottom — these students are most at risk right now")
-
-    urgent = active_students[active_students["at_risk"]==1].copy() if "at_risk" in active_students.columns else pd.DataFrame()
-    if len(urgent) > 0:
-        urgent = urgent.sort_values("dropout_probability" if "dropout_probability" in urgent.columns else "attendance_rate_pct")
-        show = urgent[["student_id","program","campus","attendance_rate_pct","grade_average_pct",
-                       "courses_failed","warnings_issued"]].copy()
-        if "risk_level" in urgent.columns:
-            show.insert(7, "risk_level", urgent["risk_level"])
-        show["attendance_rate_pct"] = show["attendance_rate_pct"].apply(lambda x: f"{x:.0f}%")
-        show["grade_average_pct"]   = show["grade_average_pct"].apply(lambda x: f"{x:.0f}%")
-        show.columns = ["Student ID","Program","Campus","Attendance","Avg Grade","Failed Courses","Warnings"] + (["Risk"] if "risk_level" in urgent.columns else [])
-        st.dataframe(show.reset_index(drop=True), use_container_width=True)
-        csv = show.to_csv(index=False).encode()
-        st.download_button("📥 Download At-Risk List", csv, "at_risk_students.csv", "text/csv")
-    else:
-        st.success("✅ No students currently flagged as at-risk!")
-
-# ════════════════════════════════════════════════════════════════
-# PAGE 3 — LOG INTERVENTION
-# Track all support actions taken
-# ════════════════════════════════════════════════════════════════
-elif nav == "📞  Log Intervention":
-    st.markdown('<div class="topbar"><h1>📞 Log Student Intervention</h1><p>Record all meetings, calls, and support actions for at-risk students</p></div>', unsafe_allow_html=True)
-
-    st.markdown("### 📝 Intervention Details")
-    ic1,ic2 = st.columns(2)
-
-    with ic1:
-        student_id    = st.selectbox("Select Student", sorted(df[df["status"]=="Active"]["student_id"].tolist()))
-        intervention  = st.selectbox("Type of Intervention", [
-            "Phone Call","In-Person Meeting","Email Sent","SMS Sent",
-            "Parent/Guardian Meeting","Counselor Referral","Tutoring Arranged",
-            "Financial Aid Discussion","Academic Warning Issued","Study Plan Created"
-        ])
-        staff_name    = st.text_input("Your Name")
-        follow_up_date= st.date_input("Follow-Up Date", value=date.today()+timedelta(days=7))
-
-    with ic2:
-        outcome       = st.selectbox("Outcome", [
-            "Student responded positively","Student agreed to action plan","No response yet",
-            "Student declined support","Parent involved and supportive",
-            "Referred to counseling","Issue resolved","Situation unchanged"
-        ])
-        notes         = st.text_area("Notes", height=120)
-
-    if st.button("💾  Save Intervention Log"):
-        if staff_name:
-            st.session_state.interventions.append({
-                "student_id":  student_id,
-                "date":        str(date.today()),
-                "intervention":intervention,
-                "outcome":     outcome,
-                "staff":       staff_name,
-                "follow_up":   str(follow_up_date),
-                "notes":       notes,
-            })
-            st.success(f"✅ Intervention logged for {student_id}")
+                st.success(f"✅ Intervention logged for {student_id}")
+            else:
+                st.error("Please enter your name.")
+
+        st.markdown("---")
+        logged = records.intervention_count()
+        if logged:
+            st.markdown(f"### 📋 All Logged Interventions ({logged:,})")
+            st.dataframe(pd.DataFrame(records.interventions(limit=LOG_ROWS)), use_container_width=True)
+            if logged > LOG_ROWS:
+                st.caption(f"Showing the latest {LOG_ROWS:,} — the export has all {logged:,}")
+            export.download(st, "📥 Export Intervention Log", records.intervention_frames, "interventions",
+                            version=logged)
         else:
-            st.error("Please enter your name.")
-
-    st.markdown("---")
-    if st.session_state.interventions:
-        st.markdown("### 📋 All Logged Interventions (This Session)")
-        st.dataframe(pd.DataFrame(st.session_state.interventions), use_container_width=True)
-        csv = pd.DataFrame(st.session_state.interventions).to_csv(index=False).encode()
-        st.download_button("📥 Export Intervention Log", csv, "interventions.csv", "text/csv")
-    else:
-        st.info("No interventions logged yet.")
-
-# ════════════════════════════════════════════════════════════════
-# PAGE 4 — CHECK STUDENT RECORD
-# Full profile lookup
-# ════════════════════════════════════════════════════════════════
-elif nav == "🔍  Check Student Record":
-    st.markdown('<div class="topbar"><h1>🔍 Student Record Lookup</h1><p>View full academic record and risk profile for any student</p></div>', unsafe_allow_html=True)
-
-    student_id = st.selectbox("Select Student", sorted(df["student_id"].unique()))
-    row = df[df["student_id"] == student_id].iloc[0]
-
-    c1,c2,c3,c4 = st.columns(4)
-    status_c = "red" if row["status"]=="Dropped Out" else "green" if row["status"]=="Graduated" else "blue"
-    c1.markdown(kcard("blue",   row["program"],                "Program",          row["campus"]), unsafe_allow_html=True)
-    c2.markdown(kcard(status_c, row["status"],                 "Status",           f"Enrolled {row['year_enrolled']}"), unsafe_allow_html=True)
-    c3.markdown(kcard("orange", f"{row['attendance_rate_pct']:.0f}%","Attendance Rate",""), unsafe_allow_html=True)
-    c4.markdown(kcard("blue",   f"{row['grade_average_pct']:.0f}%",  "Grade Average", ""), unsafe_allow_html=True)
+            st.info("No interventions logged yet.")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 3b — OUTREACH
+    # Templated SMS / email check-ins to the whole Critical + High Risk cohort (outreach.py)
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "📣  Outreach":
+        st.markdown('<div class="topbar"><h1>📣 Student Outreach</h1><p>Send a check-in message to every high-risk student at once — each send is logged as an intervention</p></div>', unsafe_allow_html=True)
+
+        oc1,oc2 = st.columns(2)
+        with oc1:
+            levels  = st.multiselect("Risk levels", ["Critical", "High Risk", "Medium Risk"], default=outreach.LEVELS)
+            channel = st.radio("Channel", list(outreach.CHANNELS), horizontal=True)
+            o_staff = st.text_input("Your Name", key="outreach_staff")
+        with oc2:
+            template = st.text_area("Message", outreach.TEMPLATES[channel], height=160, key=f"outreach_template_{channel}")
+            st.caption("Placeholders: {student_id}, {program}, {campus}, {staff}")
+
+        cohort = pages.outreach_cohort(df, levels)
+        rate   = outreach.CHANNELS[channel]["rate"]
+        st.markdown(f"**{len(cohort):,} students** · {channel} at {rate:.0f} / second → about {len(cohort) / rate / 60:.1f} minutes")
+        if len(cohort):
+            try:
+                st.info(outreach.render(template, cohort.iloc[0].to_dict(), o_staff or "Your Name"))
+            except (KeyError, ValueError) as e:
+                st.error(f"Unknown placeholder in the message: {e}")
+                st.stop()
+
+        state = load_outreach()
+        if st.button(f"📣  Send to {len(cohort):,} students", disabled=not len(cohort)):
+            if o_staff:
+                dispatcher = outreach.Dispatcher(state["transports"], records)
+                state["jobs"].append(outreach.OutreachJob(dispatcher, cohort.to_dict("records"), channel, o_staff, template))
+                ops.count("outreach.jobs")
+            else:
+                st.error("Please enter your name.")
 
-    st.markdown("---")
-    col1,col2 = st.columns(2)
-
-    with col1:
-        st.markdown("#### 👤 Student Profile")
-        prof = [
-            ("Age",           row["age"]),
-            ("Gender",        row["gender"]),
-            ("Campus",        row["campus"]),
-            ("Program",       row["program"]),
-            ("Year Enrolled", row["year_enrolled"]),
-            ("Semester",      row["semester_enrolled"]),
-            ("Enrollment Source", row["enrollment_source"]),
-            ("Distance (km)", row["distance_from_campus_km"]),
-            ("Has Transport", "Yes" if row["has_transport"] else "No"),
-            ("Financial Aid", "Yes" if row["has_financial_aid"] else "No"),
-        ]
-        for label,val in prof:
-            st.markdown(f"""
-            <div style="display:flex;justify-content:space-between;padding:.5rem 0;border-bottom:1px solid #1e293b;">
-              <span style="color:#94a3b8">{label}</span>
-              <span style="font-weight:600;color:#ffffff">{val}</span>
-            </div>""", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("#### ⚡ Academic Performance")
-        acad = [
-            ("Attendance Rate", f"{row['attendance_rate_pct']:.0f}%"),
-            ("Grade Average",   f"{row['grade_average_pct']:.0f}%"),
-            ("Courses Failed",  row["courses_failed"]),
-            ("Warnings Issued", row["warnings_issued"]),
-            ("At-Risk Flag",    "Yes" if row.get("at_risk",0)==1 else "No"),
-        ]
-        for label,val in acad:
-            # Convert to string for processing
-            val_str = str(val)
+        if state["jobs"]:
+            st.markdown("---")
+            st.markdown("### 📬 Outreach Jobs")
+            for job in reversed(state["jobs"][-10:]):
+                p = job.progress
+                finished = p["sent"] + p["failed"]
+                label = (f"{p['channel']} by {p['staff']} · {p['sent']:,} sent · {p['failed']:,} failed · "
+                         f"{p['retries']:,} retries · {p['logged']:,} logged")
+                st.progress(finished / max(p["total"], 1), text=label if job.done else f"{label} · ~{job.eta():.0f}s left")
+                if job.error:
+                    st.error(f"❌ {job.error}")
+                if p["errors"]:
+                    with st.expander(f"Failed sends ({p['failed']:,})"):
+                        st.text("\n".join(p["errors"]))
+            if not all(job.done for job in state["jobs"]):
+                st.button("🔄 Refresh progress")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 3c — FOLLOW-UPS
+    # Due today / overdue board and per-staff worklists, read off the open follow-ups index (records.py)
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "📅  Follow-Ups":
+        st.markdown('<div class="topbar"><h1>📅 Follow-Up Board</h1><p>Every intervention follow-up that is due today or overdue — oldest first</p></div>', unsafe_allow_html=True)
+
+        today    = str(date.today())
+        staff_n  = records.follow_up_staff()
+        fc1,fc2  = st.columns([2,1])
+        fu_staff = fc1.selectbox("Worklist", ["All staff"] + [s for s in staff_n if s],
+                                 format_func=lambda s: s if s == "All staff" else f"{s} ({staff_n[s]:,} open)")
+        horizon  = fc2.selectbox("Show", ["Due today + overdue", "Due this week"])
+        fu_who   = None if fu_staff == "All staff" else fu_staff
+        fu_by    = today if horizon == "Due today + overdue" else str(date.today() + timedelta(days=7))
+        fc       = records.follow_up_counts(today, fu_who)
+
+        c1,c2,c3 = st.columns(3)
+        c1.markdown(kcard("red",    f"{fc['overdue']:,}", "Overdue",       "Past the follow-up date"), unsafe_allow_html=True)
+        c2.markdown(kcard("orange", f"{fc['today']:,}",   "Due Today",     today), unsafe_allow_html=True)
+        c3.markdown(kcard("blue",   f"{fc['open']:,}",    "Open Follow-Ups", "All dates"), unsafe_allow_html=True)
+
+        st.markdown("---")
+        due = records.due_follow_ups(fu_by, fu_who, limit=200)
+        if not due:
+            st.success("✅ Nothing due — every follow-up is on schedule.")
+        else:
+            st.markdown(f"### ⏰ Work from the top ({len(due):,}{'+' if len(due) == 200 else ''} shown)")
+            board = pd.DataFrame(due)
+            board.insert(3, "days_overdue", (pd.Timestamp(today) - pd.to_datetime(board["due"])).dt.days.clip(lower=0))
+            st.dataframe(board.drop(columns="id"), use_container_width=True)
+
+            picked = st.multiselect("Follow-ups to close", board["id"].tolist(),
+                                    format_func=lambda i: f"{board.loc[board['id'] == i, 'student_id'].iat[0]} · due {board.loc[board['id'] == i, 'due'].iat[0]}")
+            d1,d2,d3 = st.columns([1,1,2])
+            if d1.button("✅  Mark done", disabled=not picked):
+                records.complete_follow_ups(picked); st.rerun()
+            new_due = d3.date_input("New follow-up date", value=date.today() + timedelta(days=7))
+            if d2.button("📆  Reschedule", disabled=not picked):
+                for i in picked:
+                    records.reschedule_follow_up(i, str(new_due))
+                st.rerun()
+            st.caption("Logging a new intervention for a student also closes their open follow-up.")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 4 — CHECK STUDENT RECORD
+    # Full profile lookup
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "🔍  Check Student Record":
+        st.markdown('<div class="topbar"><h1>🔍 Student Record Lookup</h1><p>View full academic record and risk profile for any student</p></div>', unsafe_allow_html=True)
+
+        index   = load_index(version)
+        query   = st.text_input("Search student ID", placeholder="e.g. GTC-0004 or 0042")
+        matches = pages.lookup_matches(df, index, query)
+        if not matches:
+            st.info(f"No student matches “{query}”.")
+            st.stop()
+        student_id = st.selectbox("Select Student", matches)
+        row = pages.student_record(df, index, student_id)
+
+        c1,c2,c3,c4 = st.columns(4)
+        status_c = "red" if row["status"]=="Dropped Out" else "green" if row["status"]=="Graduated" else "blue"
+        c1.markdown(kcard("blue",   row["program"],                "Program",          row["campus"]), unsafe_allow_html=True)
+        c2.markdown(kcard(status_c, row["status"],                 "Status",           f"Enrolled {row['year_enrolled']}"), unsafe_allow_html=True)
+        c3.markdown(kcard("orange", f"{row['attendance_rate_pct']:.0f}%","Attendance Rate",""), unsafe_allow_html=True)
+        c4.markdown(kcard("blue",   f"{row['grade_average_pct']:.0f}%",  "Grade Average", ""), unsafe_allow_html=True)
+
+        st.markdown("---")
+        col1,col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### 👤 Student Profile")
+            prof = [
+                ("Age",           row["age"]),
+                ("Gender",        row["gender"]),
+                ("Campus",        row["campus"]),
+                ("Program",       row["program"]),
+                ("Year Enrolled", row["year_enrolled"]),
+                ("Semester",      row["semester_enrolled"]),
+                ("Enrollment Source", row["enrollment_source"]),
+                ("Distance (km)", row["distance_from_campus_km"]),
+                ("Has Transport", "Yes" if row["has_transport"] else "No"),
+                ("Financial Aid", "Yes" if row["has_financial_aid"] else "No"),
+            ]
+            for label,val in prof:
+                st.markdown(f"""
+                <div style="display:flex;justify-content:space-between;padding:.5rem 0;border-bottom:1px solid #1e293b;">
+                  <span style="color:#94a3b8">{label}</span>
+                  <span style="font-weight:600;color:#ffffff">{val}</span>
+                </div>""", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("#### ⚡ Academic Performance")
+            acad = [
+                ("Attendance Rate", f"{row['attendance_rate_pct']:.0f}%"),
+                ("Grade Average",   f"{row['grade_average_pct']:.0f}%"),
+                ("Courses Failed",  row["courses_failed"]),
+                ("Warnings Issued", row["warnings_issued"]),
+                ("At-Risk Flag",    "Yes" if row.get("at_risk",0)==1 else "No"),
+            ]
+            for label,val in acad:
+                # Convert to string for processing
+                val_str = str(val)
             
-            # Determine color based on the label and value
-            if label in ["Attendance Rate", "Grade Average"]:
-                # Handle percentage values
-                num_val = int(val_str.replace("%", ""))
-                if num_val < 60:
-                    c = "#ef4444"  # Red for low
-                elif num_val > 80:
-                    c = "#22c55e"  # Green for high
+                # Determine color based on the label and value
+                if label in ["Attendance Rate", "Grade Average"]:
+                    # Handle percentage values
+                    num_val = int(val_str.replace("%", ""))
+                    if num_val < 60:
+                        c = "#ef4444"  # Red for low
+                    elif num_val > 80:
+                        c = "#22c55e"  # Green for high
+                    else:
+                        c = "#f59e0b"  # Orange for medium
+                elif label in ["Courses Failed", "Warnings Issued"]:
+                    # Handle numeric counts
+                    if val > 2:
+                        c = "#ef4444"  # Red for many issues
+                    elif val > 0:
+                        c = "#f97316"  # Orange for some issues
+                    else:
+                        c = "#22c55e"  # Green for no issues
+                elif label == "At-Risk Flag":
+                    # Handle yes/no
+                    c = "#ef4444" if val == "Yes" else "#22c55e"
                 else:
-                    c = "#f59e0b"  # Orange for medium
-            elif label in ["Courses Failed", "Warnings Issued"]:
-                # Handle numeric counts
-                if val > 2:
-                    c = "#ef4444"  # Red for many issues
-                elif val > 0:
-                    c = "#f97316"  # Orange for some issues
-                else:
-                    c = "#22c55e"  # Green for no issues
-            elif label == "At-Risk Flag":
-                # Handle yes/no
-                c = "#ef4444" if val == "Yes" else "#22c55e"
-            else:
-                c = "#94a3b8"  # Default gray
+                    c = "#94a3b8"  # Default gray
             
-            st.markdown(f"""
-            <div style="display:flex;justify-content:space-between;padding:.5rem 0;border-bottom:1px solid #1e293b;">
-              <span style="color:#94a3b8">{label}</span>
-              <span style="font-weight:600;color:{c}">{val}</span>
-            </div>""", unsafe_allow_html=True)
-
-    # Intervention history for this student
-    st.markdown("---")
-    st.markdown("### 📞 Intervention History")
-    student_int = [i for i in st.session_state.interventions if i["student_id"]==student_id]
-    if student_int:
-        st.dataframe(pd.DataFrame(student_int), use_container_width=True)
-    else:
-        st.info(f"No interventions logged for {student_id} yet.")
-
-# ════════════════════════════════════════════════════════════════
-# PAGE 5 — REGISTRATION QUEUE
-# ════════════════════════════════════════════════════════════════
-elif nav == "📋  Registration Queue":
-    st.markdown('<div class="topbar"><h1>📋 Registration Queue</h1><p>All new student registrations pending approval</p></div>', unsafe_allow_html=True)
-
-    regs = st.session_state.registrations
-    c1,c2,c3 = st.columns(3)
-    c1.markdown(kcard("blue",   f"{len(regs)}",     "Total Registrations", "Processed today"), unsafe_allow_html=True)
-    c2.markdown(kcard("orange", f"{len([r for r in regs if 'Pending' in r['status']])}","Pending Approval",""), unsafe_allow_html=True)
-    c3.markdown(kcard("green",  f"{len([r for r in regs if 'Approved' in r['status']])}","Approved",""), unsafe_allow_html=True)
-
-    st.markdown("---")
-    if not regs:
-        st.info("No registrations logged yet. Use **Register New Student** to add applications.")
-    else:
-        for i,reg in enumerate(regs):
-            risk_c = "#ef4444" if "HIGH" in reg["risk_level"] else "#f97316" if "MEDIUM" in reg["risk_level"] else "#22c55e"
-            c_left,c_right = st.columns([5,1])
-            with c_left:
                 st.markdown(f"""
-                <div style="background:#1e293b;border-radius:10px;padding:1rem;margin:.4rem 0;border-left:4px solid {risk_c}">
-                  <div style="display:flex;justify-content:space-between">
-                    <div><b>{reg['reg_id']}</b> &nbsp;·&nbsp; {reg['student_name']} &nbsp;·&nbsp; {reg['program']}</div>
-                    <div style="color:{risk_c};font-weight:700">{reg['risk_level']}</div>
-                  </div>
-                  <div style="color:#94a3b8;font-size:.82rem;margin-top:.3rem">
-                    Campus: {reg['campus']} &nbsp;·&nbsp; Risk: {reg['risk_score']} &nbsp;·&nbsp; Officer: {reg['officer']} &nbsp;·&nbsp; {reg['date']}
-                  </div>
-                </div>
-                """, unsafe_allow_html=True)
-            with c_right:
-                new_status = st.selectbox("Status",["Pending Approval","Approved","Declined"],
-                    index=0 if "Pending" in reg["status"] else 1 if "Approved" in reg["status"] else 2, key=f"reg_s_{i}")
-                if st.button("Update",key=f"upd_{i}"):
-                    st.session_state.registrations[i]["status"] = new_status; st.rerun()
-
-        csv = pd.DataFrame(regs).to_csv(index=False).encode()
-        st.download_button("📥 Export Registration Queue", csv, "registrations.csv", "text/csv")
+                <div style="display:flex;justify-content:space-between;padding:.5rem 0;border-bottom:1px solid #1e293b;">
+                  <span style="color:#94a3b8">{label}</span>
+                  <span style="font-weight:600;color:{c}">{val}</span>
+                </div>""", unsafe_allow_html=True)
+
+        # Intervention history for this student
+        st.markdown("---")
+        st.markdown("### 📞 Intervention History")
+        student_int = records.interventions(student_id)
+        if student_int:
+            st.dataframe(pd.DataFrame(student_int), use_container_width=True)
+        else:
+            st.info(f"No interventions logged for {student_id} yet.")
+
+    # ════════════════════════════════════════════════════════════════
+    # PAGE 5 — REGISTRATION QUEUE
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "📋  Registration Queue":
+        st.markdown('<div class="topbar"><h1>📋 Registration Queue</h1><p>All new student registrations pending approval</p></div>', unsafe_allow_html=True)
+
+        counts = records.registration_counts()
+        total  = sum(counts.values())
+        c1,c2,c3 = st.columns(3)
+        c1.markdown(kcard("blue",   f"{total}",     "Total Registrations", "All officers"), unsafe_allow_html=True)
+        c2.markdown(kcard("orange", f"{counts.get('Pending Approval',0)}","Pending Approval",""), unsafe_allow_html=True)
+        c3.markdown(kcard("green",  f"{counts.get('Approved',0)}","Approved",""), unsafe_allow_html=True)
+
+        st.markdown("---")
+        if not total:
+            st.info("No registrations logged yet. Use **Register New Student** to add applications.")
+        else:
+            reg_query = st.text_input("Search by name, Omang or registration ID")
+            # Keyset paging: the seq each visited page starts after, so Previous is one pop
+            starts = st.session_state.setdefault("reg_pages", [0])
+            keys, reg_index = load_reg_index(records.last_registration())
+            shown = pages.registration_queue(records, keys, reg_index, reg_query, after=starts[-1], k=REG_PAGE)
+            if not shown:
+                st.info(f"No registration matches “{reg_query}”." if reg_query else "No more registrations.")
+            for reg in shown:
+                risk_c = "#ef4444" if "HIGH" in reg["risk_level"] else "#f97316" if "MEDIUM" in reg["risk_level"] else "#22c55e"
+                c_left,c_right = st.columns([5,1])
+                with c_left:
+                    st.markdown(f"""
+                    <div style="background:#1e293b;border-radius:10px;padding:1rem;margin:.4rem 0;border-left:4px solid {risk_c}">
+                      <div style="display:flex;justify-content:space-between">
+                        <div><b>{reg['reg_id']}</b> &nbsp;·&nbsp; {reg['student_name']} &nbsp;·&nbsp; {reg['program']}</div>
+                        <div style="color:{risk_c};font-weight:700">{reg['risk_level']}</div>
+                      </div>
+                      <div style="color:#94a3b8;font-size:.82rem;margin-top:.3rem">
+                        Campus: {reg['campus']} &nbsp;·&nbsp; Risk: {reg['risk_score']} &nbsp;·&nbsp; Officer: {reg['officer']} &nbsp;·&nbsp; {reg['date']}
+                      </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with c_right:
+                    new_status = st.selectbox("Status",["Pending Approval","Approved","Declined"],
+                        index=0 if "Pending" in reg["status"] else 1 if "Approved" in reg["status"] else 2, key=f"reg_s_{reg['reg_id']}")
+                    if st.button("Update",key=f"upd_{reg['reg_id']}"):
+                        records.set_registration_status(reg["reg_id"], new_status); st.rerun()
+
+            if not reg_query:
+                p1,p2,p3 = st.columns([1,2,1])
+                if p1.button("⬅️  Previous", disabled=len(starts) == 1):
+                    starts.pop(); st.rerun()
+                p2.caption(f"Page {len(starts)} of {max(1, -(-total // REG_PAGE))}")
+                if p3.button("Next ➡️", disabled=len(shown) < REG_PAGE):
+                    starts.append(shown[-1]["seq"]); st.rerun()
+
+            export.download(st, "📥 Export Registration Queue", records.registration_frames, "registrations",
+                            version=counts)
+
+    # ════════════════════════════════════════════════════════════════
+    # OPS (hidden — ?ops=1)
+    # ════════════════════════════════════════════════════════════════
+    elif nav == "🛠  Ops":
+        st.markdown('<div class="topbar"><h1>🛠 Ops</h1><p>Render timings, cache hit rates and memory for this management-system process</p></div>', unsafe_allow_html=True)
+        ops.render(st)
+        st.markdown("#### 🔄 Change feed")
+        st.json(load_feed().stats)
+        drift.render(st, load_drift())
 
-st.markdown("---")
-st.markdown("<div style='text-align:center;color:#475569;font-size:.78rem'>Gaborone Technical College · Student Management System · Unaswi Leonard · 2026</div>", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown("---")
+    st.markdown("<div style='text-align:center;color:#475569;font-size:.78rem'>Gaborone Technical College · Student Management System · Unaswi Leonard · 2026</div>", unsafe_allow_html=True)
+finally:
+    run.finish()          # also when st.stop() ends the page early
+ops.render_profile(st, run)
@@ -0,0 +1,61 @@
+"""
+GABORONE TECHNICAL COLLEGE — SINGLE-APPLICANT LATENCY BENCHMARK
+p50 / p99 latency per applicant: the old registration-form path (five LabelEncoder.transform calls +
+predict_proba on a fresh array) vs ApplicantScorer.score (dict lookups into a preallocated row via
+FeaturePipeline.fill + flattened trees, no DataFrame).
+Run: python bench_applicant.py [--n 2000]
+"""
+
+import argparse, time, warnings
+
+import numpy as np
+
+from scoring import ApplicantScorer, load_encoders, load_model
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+def random_applicants(scorer, n, seed=0):
+    rng = np.random.default_rng(seed)
+    pick = lambda field: scorer.categories(field)[rng.integers(len(scorer.categories(field)))]
+    return [{"age": int(rng.integers(16, 66)), "gender": pick("gender"), "campus": pick("campus"),
+             "program": pick("program"), "year": int(rng.integers(2024, 2027)), "source": pick("source"),
+             "distance": float(rng.uniform(0.5, 150)), "transport": bool(rng.integers(2)),
+             "parent_ed": pick("parent_ed"), "fin_aid": bool(rng.integers(2)), "working": bool(rng.integers(2))}
+            for _ in range(n)]
+
+
+def legacy(model, le, a):
+    enc = [le[f].transform([np.nan if f == "parent_ed" and a[f] == "None" else a[f]])[0]
+           for f in ("campus", "program", "source", "parent_ed", "gender")]
+    row = np.array([[a["age"], a["distance"], int(a["transport"]), int(a["fin_aid"]), int(a["working"]),
+                     80.0, 55.0, 0, 0, 1 if "Certificate" in a["program"] else 2, a["year"], *enc,
+                     0, 0, 0, int(a["distance"] > 40), int(a["age"] > 30), int(a["parent_ed"] == "Primary")]])
+    return model.predict_proba(row)[0][1]
+
+
+def timed(fn, applicants):
+    lat = np.empty(len(applicants))
+    for i, a in enumerate(applicants):
+        t0 = time.perf_counter_ns()
+        fn(a)
+        lat[i] = (time.perf_counter_ns() - t0) / 1e3
+    return lat
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=2000)
+    args = ap.parse_args()
+
+    scorer = ApplicantScorer.load()
+    model, _ = load_model()
+    le = load_encoders()
+    applicants = random_applicants(scorer, args.n)
+    for a in applicants[:50]:   # parity + warm-up
+        assert abs(legacy(model, le, a) - scorer.score(a)["probability"]) < 1e-9
+
+    print(f"{'path':<16} {'p50 µs':>9} {'p99 µs':>9} {'mean µs':>9}")
+    for name, fn in [("legacy", lambda a: legacy(model, le, a)), ("ApplicantScorer", scorer.score)]:
+        lat = timed(fn, applicants)
+        print(f"{name:<16} {np.percentile(lat, 50):>9.0f} {np.percentile(lat, 99):>9.0f} {lat.mean():>9.0f}")
@@ -0,0 +1,74 @@
+"""
+GABORONE TECHNICAL COLLEGE — SHARED DATASET BENCHMARK
+Memory held for the student dataset as app replicas are added:
+  own    — every replica loads its own copy from the Parquet store (today's setup)
+  shared — one snapshot published by dataserver.py; every replica memory-maps it (zero-copy attach)
+All replicas of a run are alive at once (shared pages are split between them), each touches every
+column, and the summed proportional set size (PSS) growth is the machine-wide cost of the dataset.
+Run: python bench_dataserver.py [--rows 2500000] [--replicas 1 2 4 8]
+"""
+
+import argparse, multiprocessing as mp, os, shutil, tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa, pyarrow.compute as pc
+
+import dataserver
+import store
+import synthetic
+from perf import Timer, pss_mb
+
+
+def _replica(mode, path, directory, warm, barrier, q):
+    store.load(columns=["student_id"], path=path)              # warm library code paths
+    dataserver.attach(warm)
+    before = pss_mb()
+    with Timer() as t:
+        df = store.load(path=path) if mode == "own" else dataserver.DataClient(directory).frame()
+    for c in df.columns:                                        # page every column in, as a page render would
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s.cat.codes.sum()
+        elif c == "student_id":
+            pc.max(pa.array(s.array))
+        else:
+            s.to_numpy().sum()
+    barrier.wait()                                              # all replicas attached: PSS splits the shared pages
+    q.put((pss_mb() - before, t.seconds))
+    barrier.wait()
+
+
+def run(mode, n, path, directory, warm):
+    ctx = mp.get_context("spawn")
+    barrier, q = ctx.Barrier(n), ctx.Queue()
+    procs = [ctx.Process(target=_replica, args=(mode, path, directory, warm, barrier, q)) for _ in range(n)]
+    for p in procs: p.start()
+    res = [q.get() for _ in procs]
+    for p in procs: p.join()
+    return sum(r[0] for r in res), float(np.mean([r[1] for r in res]))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_500_000)
+    ap.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    shm = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    try:
+        path = os.path.join(tmp, "students.parquet")
+        store.apply_schema(synthetic.frame(args.rows, scored=True)).drop(columns=store.DERIVED_COLS).to_parquet(path, index=False)
+        m = dataserver.publish(store.load(path=path), shm)
+        warm = dataserver.publish(store.load(path=path).head(10), shm + "-warm")["path"]
+        print(f"{args.rows:,} rows, snapshot {m['bytes'] / 1e6:.1f} MB")
+        print(f"{'mode':<8} {'replicas':>9} {'total PSS +MB':>14} {'MB/replica':>11} {'attach s':>9}")
+        for mode in ["own", "shared"]:
+            for n in args.replicas:
+                total, secs = run(mode, n, path, shm, warm)
+                print(f"{mode:<8} {n:>9} {total:>14.1f} {total / n:>11.1f} {secs:>9.3f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(shm, ignore_errors=True)
+        shutil.rmtree(shm + "-warm", ignore_errors=True)
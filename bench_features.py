@@ -0,0 +1,46 @@
+"""
+GABORONE TECHNICAL COLLEGE — FEATURE PIPELINE BENCHMARK
+FeaturePipeline.transform throughput (rows/sec) on raw student frames of 1 / 1k / 1M rows, resampled
+from student_data_scored.csv, with text columns as plain strings and as categoricals. The 2,500 real
+rows are parity-checked against the scored dataset first.
+Run: python bench_features.py [--sizes 1 1000 1000000]
+"""
+
+import argparse, time
+
+import numpy as np
+import pandas as pd
+
+from features import RAW_COLUMNS, SCORED_CSV, ENCODED, FeaturePipeline
+
+
+def per_call(fn, df, budget=1.0):
+    # Repeat until ~budget seconds have passed; report the median call
+    times = []
+    t_end = time.perf_counter() + budget
+    while time.perf_counter() < t_end or len(times) < 3:
+        t0 = time.perf_counter()
+        fn(df)
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+    args = ap.parse_args()
+
+    base = pd.read_csv(SCORED_CSV)
+    pipe = FeaturePipeline.load()
+    assert (pipe.transform(base[RAW_COLUMNS]) == base[pipe.features].to_numpy(np.float64)).all()
+    raw = base[RAW_COLUMNS]
+    rng = np.random.default_rng(0)
+
+    print(f"{'rows':>10} {'str ms':>9} {'str rows/s':>12} {'cat ms':>9} {'cat rows/s':>12}")
+    for n in args.sizes:
+        df = raw.iloc[rng.integers(len(raw), size=n)].reset_index(drop=True)
+        cat = df.astype({r: "category" for r, _ in ENCODED.values()})
+        out = np.empty((n, len(pipe.features)))
+        t_str = per_call(lambda d: pipe.transform(d, out=out), df)
+        t_cat = per_call(lambda d: pipe.transform(d, out=out), cat)
+        print(f"{n:>10,} {t_str * 1e3:>9.2f} {n / t_str:>12,.0f} {t_cat * 1e3:>9.2f} {n / t_cat:>12,.0f}")
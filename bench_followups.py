@@ -0,0 +1,78 @@
+"""
+GABORONE TECHNICAL COLLEGE — FOLLOW-UP BOARD BENCHMARK
+"Due today / Overdue" board and one staff worklist against intervention-history size: a scan of the
+whole history (latest intervention per student, then filter by date) vs the open-follow-ups index in
+records.py. Also the cost of logging an intervention (closes + opens a follow-up) and closing one.
+Run: python bench_followups.py [--sizes 10000 100000 1000000] [--per-student 20]
+"""
+
+import argparse, os, tempfile
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from bench_lookup import latency_us
+from bench_pages import per_call
+from perf import Timer
+from records import RecordStore
+
+STAFF = [f"Officer {c}" for c in "ABCDEFGHIJKLMNOPQRST"]
+
+
+def history(n, per_student, rng, today):
+    # n interventions over n / per_student students, dates spread over the last year, follow-ups ±3 weeks
+    students = np.array([f"GTC-{i:07d}" for i in range(max(1, n // per_student))])
+    days = np.sort(rng.integers(-365, 1, n))
+    follow = days + rng.integers(-7, 21, n)
+    base = date.fromordinal(today.toordinal())
+    return [{"student_id": s, "date": str(base + timedelta(int(d))), "intervention": "Phone Call",
+             "outcome": "No response yet", "staff": STAFF[st], "follow_up": str(base + timedelta(int(f))), "notes": ""}
+            for s, d, f, st in zip(students[rng.integers(0, len(students), n)], days, follow,
+                                   rng.integers(0, len(STAFF), n))]
+
+
+def legacy(records, by, staff=None, k=50):
+    # Without the index: read the history, keep each student's latest intervention, filter, sort
+    df = pd.read_sql_query("SELECT id, student_id, staff, follow_up FROM interventions", records.conn())
+    latest = df.sort_values("id").drop_duplicates("student_id", keep="last")
+    due = latest[(latest["follow_up"] > "") & (latest["follow_up"] <= by)]
+    if staff is not None:
+        due = due[due["staff"] == staff]
+    return due.sort_values(["follow_up", "id"]).head(k)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--per-student", type=int, default=20, help="interventions per student in the history")
+    ap.add_argument("--k", type=int, default=50, help="rows shown on the board")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    today = str(date.today())
+    print(f"{'history':>10} {'open':>8} {'scan board ms':>14} {'index board ms':>15} {'worklist ms':>12} "
+          f"{'log µs p50/p99':>15} {'close µs p50/p99':>17}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            records = RecordStore(os.path.join(tmp, "bench.db"))
+            recs = history(n, args.per_student, rng, date.today())
+            with Timer() as t_load:
+                for i in range(0, n, 10_000):
+                    records.add_interventions(recs[i:i + 10_000])
+            board = records.due_follow_ups(today, limit=args.k)
+            old = legacy(records, today, k=args.k)
+            assert [r["id"] for r in board] == old["id"].tolist()
+            assert [r["id"] for r in records.due_follow_ups(today, STAFF[0], args.k)] == \
+                   legacy(records, today, STAFF[0], args.k)["id"].tolist()
+
+            scan = per_call(lambda: legacy(records, today, k=args.k), budget=1.0)
+            ix = per_call(lambda: (records.due_follow_ups(today, limit=args.k), records.follow_up_counts(today)), budget=1.0)
+            work = per_call(lambda: records.due_follow_ups(today, STAFF[0], args.k), budget=1.0)
+            log = latency_us(lambda r: records.add_intervention(r), history(200, 1, rng, date.today()))
+            ids = [r["id"] for r in records.due_follow_ups(today, limit=200)]
+            close = latency_us(lambda i: records.complete_follow_ups([i]), ids)
+            opened = records.follow_up_counts(today)["open"]
+            print(f"{n:>10,} {opened:>8,} {scan * 1e3:>14.1f} {ix * 1e3:>15.2f} {work * 1e3:>12.2f} "
+                  f"{log[0]:>7.0f}/{log[1]:<7.0f} {close[0]:>8.0f}/{close[1]:<8.0f}  (loaded in {t_load.seconds:.1f}s)")
+            records.conn().close()
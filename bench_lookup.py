@@ -0,0 +1,55 @@
+"""
+GABORONE TECHNICAL COLLEGE — STUDENT LOOKUP BENCHMARK
+Latency against table size: the old Check Student Record path (sorted unique IDs for the selectbox +
+full-scan row match on every rerun) vs StudentIndex (hash get + typeahead search).
+Run: python bench_lookup.py [--sizes 2500 250000 2500000]
+"""
+
+import argparse, time
+
+import numpy as np
+
+import store
+from bench_store import resample
+from lookup import StudentIndex
+from perf import Timer
+
+
+def latency_us(fn, args):
+    lat = np.empty(len(args))
+    for i, a in enumerate(args):
+        t0 = time.perf_counter_ns()
+        fn(a)
+        lat[i] = (time.perf_counter_ns() - t0) / 1e3
+    return np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def legacy(df, student_id):
+    ids = sorted(df["student_id"].unique())
+    return df[df["student_id"] == student_id].iloc[0], ids
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[2_500, 250_000, 2_500_000])
+    ap.add_argument("--n", type=int, default=500)
+    args = ap.parse_args()
+
+    base = store.load(columns=["student_id", "program"])
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'build s':>8} {'index MB':>9} {'legacy ms':>10} {'get µs p50/p99':>15} "
+          f"{'prefix µs p50/p99':>18} {'substring µs p50/p99':>21}")
+    for n in args.sizes:
+        df = resample(base, n)
+        with Timer() as t:
+            ix = StudentIndex(df)
+        ids = df["student_id"].to_numpy()[rng.integers(0, n, args.n)]
+        for sid in ids[:20]:
+            assert df["student_id"].iloc[ix.get(sid)] == sid and ix.search(sid, 1)[0] == ix.get(sid)
+        reps = max(3, min(args.n, int(2e6 // n)))
+        leg = latency_us(lambda s: legacy(df, s), ids[:reps])[0] / 1e3
+        get = latency_us(ix.get, ids)
+        prefix = latency_us(lambda s: ix.search(s[:-2]), ids)       # "GTC-00012" → typing in progress
+        sub = latency_us(lambda s: ix.search(s[-5:]), ids)          # trailing digits only
+        print(f"{n:>10,} {t.seconds:>8.2f} {ix.nbytes()/1e6:>9.1f} {leg:>10.1f} "
+              f"{get[0]:>7.1f}/{get[1]:<7.1f} {prefix[0]:>9.1f}/{prefix[1]:<8.1f} {sub[0]:>10.1f}/{sub[1]:<10.1f}")
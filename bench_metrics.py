@@ -0,0 +1,93 @@
+"""
+GABORONE TECHNICAL COLLEGE — GROUP-METRIC KERNEL BENCHMARK
+The dashboard's original per-group lambda aggregations (Chart 5 dropout by program, the program
+summary, Chart 9 source effectiveness, the campus table, the status breakdown) against the metrics
+kernel (cube.measures once + one cube.metrics groupby-sum per key) on the same rows, and against the
+same queries answered from the pre-aggregated cube. Results are checked equal before timing.
+Run: python bench_metrics.py [--rows 2500000]
+"""
+
+import argparse
+
+import numpy as np
+
+import cube
+import store
+import synthetic
+from bench_pages import per_call
+from perf import Timer
+
+
+# ── ORIGINAL LAMBDAS (03_dashboard.py before the cube) ────────────
+def legacy(dff):
+    pg = dff.groupby("program").agg(total=("student_id", "count"),
+                                    dropped=("status", lambda x: (x == "Dropped Out").sum())).reset_index()
+    pg["Dropout Rate %"] = (pg["dropped"] / pg["total"] * 100).round(1)
+    prog_summary = dff.groupby("program").agg(
+        Total=("student_id", "count"),
+        Graduated=("status", lambda x: (x == "Graduated").sum()),
+        Dropped=("status", lambda x: (x == "Dropped Out").sum()),
+        Avg_Attendance=("attendance_rate_pct", "mean"),
+        Avg_Grade=("grade_average_pct", "mean")).reset_index()
+    src_perf = dff.groupby("enrollment_source").agg(
+        Enrollments=("student_id", "count"),
+        Dropped=("status", lambda x: (x == "Dropped Out").sum()),
+        Graduated=("status", lambda x: (x == "Graduated").sum())).reset_index()
+    camp = dff.groupby("campus").agg(
+        Students=("student_id", "count"),
+        Dropout_Rate=("status", lambda x: (x == "Dropped Out").sum() / len(x) * 100),
+        Avg_Attendance=("attendance_rate_pct", "mean"),
+        Avg_Grade=("grade_average_pct", "mean")).reset_index()
+    status = dff["status"].value_counts()
+    grade = dff.groupby("status")["grade_average_pct"].mean()
+    return {"program": pg, "summary": prog_summary, "source": src_perf, "campus": camp, "status": status, "grade": grade}
+
+
+def kernel(m):
+    # Same answers from one groupby-sum per key over the measure columns
+    return {key: cube.metrics(m, key) for key in ["program", "enrollment_source", "campus", "status"]}
+
+
+def check(old, new):
+    # Compare group by group (text keys sort alphabetically, categoricals in category order)
+    def by_key(frame, key):
+        return frame.set_index(key)
+    new = {k: v.set_axis(v.index.astype(str)) for k, v in new.items()}
+    pairs = [(by_key(old["program"], "program")["dropped"],           new["program"]["n_dropped"]),
+             (by_key(old["summary"], "program")["Graduated"],         new["program"]["n_graduated"]),
+             (by_key(old["summary"], "program")["Avg_Grade"],         new["program"]["avg_grade"]),
+             (by_key(old["source"], "enrollment_source")["Dropped"],  new["enrollment_source"]["n_dropped"]),
+             (by_key(old["campus"], "campus")["Dropout_Rate"],        new["campus"]["drop_rate"]),
+             (by_key(old["campus"], "campus")["Avg_Attendance"],      new["campus"]["avg_attendance"]),
+             (old["status"],                                          new["status"]["n"]),
+             (old["grade"],                                           new["status"]["avg_grade"])]
+    for a, b in pairs:
+        b = b.reindex(a.index.astype(str))
+        assert np.allclose(a.to_numpy(np.float64), b.to_numpy(np.float64), rtol=1e-6), (a, b)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_500_000)
+    args = ap.parse_args()
+
+    df = store.apply_schema(synthetic.frame(args.rows, scored=True))[["student_id", *cube.SOURCE_COLUMNS]]
+    raw = df.astype({c: object for c in ["program", "campus", "enrollment_source", "status"]})   # text columns, as read_csv gave
+    m = cube.measures(df)
+    cb = cube.build(df)
+    check(legacy(raw), kernel(m))
+
+    with Timer() as t_m:
+        cube.measures(df)
+    with Timer() as t_b:
+        cube.build(df)
+    print(f"{args.rows:,} rows · once per dataset: measures() {t_m.seconds * 1e3:,.0f} ms, "
+          f"build() {t_b.seconds * 1e3:,.0f} ms → {len(cb):,} cube cells")
+    print(f"{'path':<34} {'ms':>10} {'speed-up':>9}")
+    base = per_call(lambda: legacy(raw), budget=2.0)
+    for name, fn in [("lambdas, text columns (original)", lambda: legacy(raw)),
+                     ("lambdas, categorical columns", lambda: legacy(df)),
+                     ("kernel on measures (rows)", lambda: kernel(m)),
+                     ("kernel on cube", lambda: kernel(cb))]:
+        s = base if name.endswith("(original)") else per_call(fn, budget=2.0)
+        print(f"{name:<34} {s * 1e3:>10.2f} {base / s:>8.0f}x")
@@ -0,0 +1,139 @@
+"""
+GABORONE TECHNICAL COLLEGE — PAGE COMPUTATION BENCHMARK
+Wall time + peak memory of every computation in pages.py (the 11 dashboard charts, KPI / summary
+tables and urgent list; the alert board, lookup and registration queue of the management system),
+on synthetic.py datasets with the student_data_scored.csv schema. Results are compared against a stored
+baseline and anything slower / hungrier than the tolerance is flagged (exit code 1).
+Run: python bench_pages.py [--sizes 2500 250000 2500000] [--save-baseline] [--tolerance 0.25]
+"""
+
+import argparse, json, os, sys, tempfile, time, tracemalloc
+
+import numpy as np
+
+import cube
+import pages
+import store
+import synthetic
+from dataset import Dataset
+from lookup import StudentIndex
+from records import RecordStore
+
+BASELINE_PATH = "bench_pages_baseline.json"
+
+# Differences below these floors are timer / allocator noise, never a regression
+MIN_DELTA_S  = 0.001
+MIN_DELTA_MB = 1.0
+
+
+def per_call(fn, budget=0.5):
+    # Repeat until ~budget seconds have passed; report the median call
+    times = []
+    t_end = time.perf_counter() + budget
+    while time.perf_counter() < t_end or len(times) < 3:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+def peak_mb(fn):
+    # Peak traced allocation (Python + NumPy buffers) during one call, in its own traced run
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def registrations(n, seed=0):
+    rng = np.random.default_rng(seed)
+    levels = np.array(["LOW RISK", "MEDIUM RISK", "HIGH RISK"])[rng.integers(0, 3, n)]
+    return [{"reg_id": f"REG-{i:06d}", "student_name": f"Applicant {i}", "omang": f"{rng.integers(1e8, 1e9)}",
+             "program": "Diploma in IT", "campus": "Gaborone Main", "risk_level": lvl, "risk_score": "40%",
+             "officer": "Admissions", "date": "2026-01-15", "status": "Pending Approval"}
+            for i, lvl in enumerate(levels, 1)]
+
+
+def computations(df):
+    # name → zero-argument callable, with the prebuilt structures each page keeps in its caches
+    cb = cube.build(df)
+    program, campus = df["program"].iloc[0], df["campus"].iloc[0]
+    cf = cube.select(cb, program, campus)
+    ds = Dataset(df)
+    ix = StudentIndex(df[["student_id"]])
+    records = RecordStore(os.path.join(tempfile.mkdtemp(), "bench_records.db"))
+    records.add_registrations(registrations(max(100, len(df) // 100)))
+    keys = records.registration_keys()
+    regs, rx = keys["reg_id"].to_numpy(), StudentIndex(keys, key="reg_id")
+    deep = records.last_registration() // 2
+    sid = df["student_id"].iloc[len(df) // 2]
+
+    jobs = {"cube_build": lambda: cube.build(df), "cube_select": lambda: cube.select(cb, program, campus)}
+    jobs.update({name: (lambda fn=fn: fn(cb)) for name, fn in pages.DASHBOARD_CHARTS.items()})
+    jobs.update({
+        "kpi_overview":      lambda: cube.overview(cb),
+        "kpi_completion":    lambda: cube.completion_rates(cb),
+        "program_table":     lambda: pages.program_table(cb),
+        "campus_table":      lambda: pages.campus_table(pages.campus_size(cb)),
+        "chart05_filtered":  lambda: pages.program_dropout(cf),
+        "urgent_students":   lambda: pages.urgent_students(ds.view()),
+        "urgent_filtered":   lambda: pages.urgent_students(ds.view(program, campus)),
+        "sidebar_counts":    lambda: pages.sidebar_counts(df),
+        "alert_counts":      lambda: pages.alert_counts(df),
+        "priority_list":     lambda: pages.priority_list(df),
+        "lookup_search":     lambda: pages.lookup_matches(df, ix, sid[:-2]),
+        "lookup_record":     lambda: pages.student_record(df, ix, sid),
+        "queue_page":        lambda: pages.registration_queue(records, regs, rx, ""),
+        "queue_page_deep":   lambda: pages.registration_queue(records, regs, rx, "", after=deep),
+        "queue_search":      lambda: pages.registration_queue(records, regs, rx, "REG-0001"),
+    })
+    return jobs
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f: return json.load(f)
+
+
+def regressed(res, base, tolerance):
+    if base is None:
+        return False
+    slow = res["seconds"] > base["seconds"] * (1 + tolerance) and res["seconds"] - base["seconds"] > MIN_DELTA_S
+    hungry = res["peak_mb"] > base["peak_mb"] * (1 + tolerance) and res["peak_mb"] - base["peak_mb"] > MIN_DELTA_MB
+    return slow or hungry
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[2_500, 250_000, 2_500_000])
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slow-down / growth before flagging")
+    args = ap.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results, flagged = {}, []
+    print(f"{'rows':>10} {'computation':<22} {'ms':>10} {'peak MB':>9} {'base ms':>10} {'Δ time':>8}")
+    for n in args.sizes:
+        df = store.apply_schema(synthetic.frame(n, scored=True))
+        for name, fn in computations(df).items():
+            key = f"{n}/{name}"
+            res = results[key] = {"seconds": per_call(fn), "peak_mb": peak_mb(fn)}
+            ref = baseline.get(key)
+            bad = not args.save_baseline and regressed(res, ref, args.tolerance)
+            if bad:
+                flagged.append(key)
+            delta = f"{res['seconds'] / ref['seconds'] - 1:+.0%}" if ref else "—"
+            print(f"{n:>10,} {name:<22} {res['seconds'] * 1e3:>10.2f} {res['peak_mb']:>9.1f} "
+                  f"{ref['seconds'] * 1e3 if ref else float('nan'):>10.2f} {delta:>8}{'  REGRESSION' if bad else ''}")
+        del df
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f: json.dump({**baseline, **results}, f, indent=1, sort_keys=True)
+        print(f"baseline → {args.baseline} ({len(results)} entries)")
+    elif flagged:
+        print(f"{len(flagged)} regression(s) beyond {args.tolerance:.0%}: {', '.join(flagged)}")
+        sys.exit(1)
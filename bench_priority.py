@@ -0,0 +1,74 @@
+"""
+GABORONE TECHNICAL COLLEGE — ALERT BOARD PRIORITY BENCHMARK
+The At-Risk Alert Board's first page against dataset size: the old path (filter every active at-risk
+student, sort the whole list) vs the priority index (priority.py) — first page, a deep page, one
+campus + program — plus the one-off build, the cost of moving rescored students in place and of
+students joining / leaving the board when their at_risk flag flips.
+Results are checked against a full sort before timing.
+Run: python bench_priority.py [--sizes 25000 250000 2500000] [--k 200]
+"""
+
+import argparse
+
+import numpy as np
+
+import pages
+import store
+import synthetic
+from bench_pages import per_call
+from perf import Timer
+from priority import KEY_COLUMNS, PriorityBoard
+
+COLUMNS = [*KEY_COLUMNS, "grade_average_pct", "courses_failed", "warnings_issued", "risk_level"]
+
+
+def on_board(df):
+    return ((df["status"] == "Active") & (df["at_risk"] == 1)).to_numpy(copy=True)
+
+
+def full_sort(board, on):
+    pos = np.flatnonzero(on)
+    return pos[np.lexsort((pos, board.att[pos], -board.prob[pos]))]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[25_000, 250_000, 2_500_000])
+    ap.add_argument("--k", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'on board':>9} {'build ms':>9} {'sort all ms':>12} {'page 1 ms':>10} {'page 25 ms':>11} "
+          f"{'1 group ms':>11} {'move 1 ms':>10} {'move 100 ms':>12} {'move 10k ms':>12} {'flip 1k ms':>11}")
+    for n in args.sizes:
+        df = store.apply_schema(synthetic.frame(n, scored=True))[COLUMNS]
+        with Timer() as t_build:
+            board = PriorityBoard(df)
+        campus, program = board.campuses()[0], board.programs(board.campuses()[0])[0]
+        on = on_board(df)
+        ref = full_sort(board, on)
+        assert (board.page(0, args.k) == ref[:args.k]).all() and (board.ordered() == ref).all()
+        old = pages.priority_list(df)        # same top-k probabilities as the old full sort (its ties are unordered)
+        assert np.allclose(np.sort(df["dropout_probability"].to_numpy()[ref[:args.k]])[::-1],
+                           np.sort(df.set_index("student_id").loc[old["Student ID"].head(args.k), "dropout_probability"])[::-1])
+
+        sort_all = per_call(lambda: pages.priority_list(df), budget=1.0)
+        first = per_call(lambda: pages.priority_page(df, board, 0, args.k), budget=1.0)
+        deep = per_call(lambda: pages.priority_page(df, board, 24 * args.k, args.k), budget=1.0)
+        group = per_call(lambda: pages.priority_page(df, board, 0, args.k, campus, program), budget=1.0)
+        moves = []
+        for m in [1, 100, 10_000]:
+            pos = rng.choice(ref, min(m, len(ref)), replace=False)
+            with Timer() as t:
+                board.update(pos, rng.random(len(pos)).round(4), rng.uniform(0, 100, len(pos)).round(1))
+            moves.append(t.seconds)
+        active = (df["status"] == "Active").to_numpy()
+        flip = rng.choice(np.flatnonzero(active), min(1_000, int(active.sum())), replace=False)
+        on[flip] = ~on[flip]
+        with Timer() as t_flip:
+            board.update(flip, board.prob[flip], board.att[flip], on[flip].astype(int))
+        ref = full_sort(board, on)
+        assert (board.ordered() == ref).all() and (board.page(0, args.k) == ref[:args.k]).all() and board.n == len(ref)
+        print(f"{n:>10,} {board.n:>9,} {t_build.seconds * 1e3:>9.0f} {sort_all * 1e3:>12.1f} {first * 1e3:>10.2f} "
+              f"{deep * 1e3:>11.2f} {group * 1e3:>11.2f} {moves[0] * 1e3:>10.2f} {moves[1] * 1e3:>12.1f} {moves[2] * 1e3:>12.0f} "
+              f"{t_flip.seconds * 1e3:>11.1f}")
@@ -0,0 +1,58 @@
+"""
+GABORONE TECHNICAL COLLEGE — PER-SESSION MEMORY BENCHMARK
+Simulates N concurrent dashboard viewers, each with a program + campus filter selected:
+  copy   — old path: @st.cache_data hands each rerun a pickled copy, then dff = df.copy() + boolean masks
+  shared — new path: one Dataset per process, each session holds a take of its (program, campus) rows
+Each (mode, N) runs in a fresh process; reports heap memory (tracemalloc) held per session.
+Run: python bench_sessions.py [--rows 250000] [--sessions 1 10 50 100]
+"""
+
+import argparse, multiprocessing as mp, pickle, tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import store
+from bench_store import resample
+from dataset import Dataset
+
+COLUMNS = ["student_id", "program", "campus", "status", "risk_level", "dropout_probability", "at_risk",
+           "attendance_rate_pct", "grade_average_pct", "courses_failed", "warnings_issued"]
+
+
+def _run(mode, df, n_sessions, q):
+    rng = np.random.default_rng(n_sessions)
+    keys = list(df.groupby(["program", "campus"], observed=True).groups)
+    if mode == "shared":
+        ds = Dataset(df)
+    tracemalloc.start()
+    sessions = []
+    for _ in range(n_sessions):
+        p, c = keys[rng.integers(len(keys))]
+        if mode == "copy":
+            cached = pickle.loads(pickle.dumps(df))
+            dff = cached.copy()
+            dff = dff[dff["program"] == p]
+            dff = dff[dff["campus"] == c]
+            sessions.append((cached, dff))
+        else:
+            sessions.append(ds.view(p, c))
+    q.put(tracemalloc.get_traced_memory()[0] / 1e6 / n_sessions)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=250_000)
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50, 100])
+    args = ap.parse_args()
+
+    df = store.apply_schema(resample(pd.read_csv(store.SCORED_CSV), args.rows))[COLUMNS]
+    print(f"{args.rows:,} rows, {df.memory_usage(deep=True).sum()/1e6:.1f} MB per full frame")
+    print(f"{'mode':<8} {'sessions':>9} {'MB/session':>11}")
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    for mode in ["copy", "shared"]:
+        for n in args.sessions:
+            q = ctx.Queue()
+            p = ctx.Process(target=_run, args=(mode, df, n, q))
+            p.start(); per = q.get(); p.join()
+            print(f"{mode:<8} {n:>9} {per:>11.2f}")
@@ -0,0 +1,67 @@
+"""
+GABORONE TECHNICAL COLLEGE — STORE BENCHMARK
+Load time + resident memory: raw CSV vs typed Parquet store vs Parquet with column projection.
+Each load runs in a fresh process (library code paths warmed on a tiny file first) so the resident-
+memory delta is the data alone; the last column is the resident-memory cut against the raw CSV load.
+Run: python bench_store.py [--sizes 2500 250000 2500000]
+"""
+
+import argparse, multiprocessing as mp, os, tempfile
+
+import numpy as np
+import pandas as pd
+
+import store
+from perf import Timer, rss_mb
+
+# Columns the dashboard's Enrollment Overview page reads
+PROJECTION = ["program", "campus", "status", "attendance_rate_pct", "grade_average_pct"]
+
+
+def resample(base, n, seed=0):
+    rng = np.random.default_rng(seed)
+    out = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    out["student_id"] = [f"GTC-{i:07d}" for i in range(1, n + 1)]
+    return out
+
+
+def _measure(kind, path, q):
+    # Keep library import / first-call cost out of the RSS delta
+    pd.read_csv(store.SCORED_CSV, nrows=10)
+    store.load(columns=["student_id"])
+    before = rss_mb()
+    with Timer() as t:
+        if kind == "csv":
+            df = pd.read_csv(path)
+        elif kind == "store":
+            df = store.load(path=path)
+        else:
+            df = store.load(columns=PROJECTION, path=path)
+    q.put((t.seconds, df.memory_usage(deep=True).sum() / 1e6, rss_mb() - before))
+
+
+def measure(kind, path):
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_measure, args=(kind, path, q))
+    p.start(); res = q.get(); p.join()
+    return res
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[2_500, 250_000, 2_500_000])
+    args = ap.parse_args()
+
+    base = pd.read_csv(store.SCORED_CSV)
+    print(f"{'rows':>10} {'format':<18} {'load s':>8} {'frame MB':>9} {'RSS +MB':>8} {'B/student':>10} {'RSS cut':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            csv_path, pq_path = os.path.join(tmp, f"s{n}.csv"), os.path.join(tmp, f"s{n}.parquet")
+            resample(base, n).to_csv(csv_path, index=False)
+            store.convert(csv_path, pq_path)
+            for kind, path in [("csv", csv_path), ("store", pq_path), ("store+projection", pq_path)]:
+                secs, frame_mb, rss = measure(kind, path)
+                csv_rss = rss if kind == "csv" else csv_rss
+                print(f"{n:>10,} {kind:<18} {secs:>8.3f} {frame_mb:>9.1f} {rss:>8.1f} {frame_mb*1e6/n:>10.0f} "
+                      f"{csv_rss / max(rss, 0.1):>7.1f}x")
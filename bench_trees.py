@@ -0,0 +1,45 @@
+"""
+GABORONE TECHNICAL COLLEGE — NATIVE TREE BENCHMARK
+sklearn predict_proba vs TreeEnsemble.predict_proba at batch sizes 1, 1k and 1M (parity-checked).
+Run: python bench_trees.py [--sizes 1 1000 1000000]
+"""
+
+import argparse, json, time, warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from trees import TreeEnsemble
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+def per_call(fn, X, budget=1.0):
+    # Repeat small batches until ~budget seconds have passed; report the median call
+    times = []
+    t_end = time.perf_counter() + budget
+    while time.perf_counter() < t_end or len(times) < 3:
+        t0 = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+    args = ap.parse_args()
+
+    model = joblib.load("model.pkl")
+    ens = TreeEnsemble.from_model(model)
+    with open("features.json") as f: features = json.load(f)
+    base = pd.read_csv("student_data_scored.csv")[features].to_numpy(np.float64)
+    rng = np.random.default_rng(0)
+
+    print(f"{'batch':>10} {'sklearn ms':>11} {'native ms':>10} {'speed-up':>9} {'max |Δp|':>10}")
+    for n in args.sizes:
+        X = base[rng.integers(0, len(base), n)]
+        diff = np.abs(ens.predict_proba(X) - model.predict_proba(X)).max()
+        sk, nat = per_call(model.predict_proba, X), per_call(ens.predict_proba, X)
+        print(f"{n:>10,} {sk*1e3:>11.3f} {nat*1e3:>10.3f} {sk/nat:>8.1f}x {diff:>10.1e}")
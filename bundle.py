@@ -0,0 +1,176 @@
+"""
+GABORONE TECHNICAL COLLEGE — MODEL BUNDLE
+One versioned file holding everything the scorer needs: the flattened trees (trees.py), the
+feature order and the encoder classes, plus a manifest with a content hash and the hashes of the
+training artifacts it was built from (model.pkl, le_*.pkl, features.json).
+
+Layout:  b"GTCBND01" | uint64 manifest length | manifest JSON | pad to 64 | raw arrays (64-aligned)
+Arrays are memory-mapped on load and used in place (feature indices are stored as intp), so a cold
+start reads only the manifest and worker processes share the same pages. A load checks shapes and
+stats the source artifacts (a source is hashed only when its size / mtime changed); the content and
+source hashes are all checked with verify=True. Loading raises ValueError when the bundle is corrupt
+or out of date.
+Run: python bundle.py [--verify]   (builds model.bundle; --verify hash-checks the existing one)
+"""
+
+import argparse, hashlib, json, os, struct
+from datetime import date
+
+import numpy as np
+
+from trees import ARRAYS, TreeEnsemble
+
+BUNDLE_PATH = "model.bundle"
+MAGIC       = b"GTCBND01"
+FORMAT      = 2           # 2: feature indices stored as intp, sources carry size + mtime
+ALIGN       = 64
+SOURCES     = ["model.pkl", "features.json", "le_campus.pkl", "le_program.pkl",
+               "le_source.pkl", "le_parent.pkl", "le_gender.pkl"]
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source(path):
+    st = os.stat(path)
+    return {"sha256": _sha256(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _changed(path, recorded, verify):
+    # Stat first: a source whose size and mtime are unchanged is not read (unless verify)
+    st = os.stat(path)
+    if not verify and (st.st_size, st.st_mtime_ns) == (recorded["size"], recorded["mtime_ns"]):
+        return False
+    return _sha256(path) != recorded["sha256"]
+
+
+def _content_hash(manifest, arrays):
+    h = hashlib.sha256(json.dumps({k: v for k, v in manifest.items() if k != "content_hash"},
+                                  sort_keys=True).encode())
+    for name in sorted(arrays):
+        h.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return h.hexdigest()
+
+
+def _pad(n):
+    return -n % ALIGN
+
+
+class Bundle:
+    def __init__(self, manifest, ensemble):
+        self.manifest = manifest
+        self.features = manifest["features"]
+        self.encoders = manifest["encoders"]
+        self.ensemble = ensemble
+
+
+# ── BUILD ─────────────────────────────────────────────────────────
+def build(path=BUNDLE_PATH):
+    from scoring import load_encoders, load_model
+
+    model, features = load_model()
+    ens = TreeEnsemble.from_model(model)
+    arrays = {k: np.ascontiguousarray(getattr(ens, k)) for k in ARRAYS}
+    layout, offset = {}, 0
+    for name, a in arrays.items():
+        layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset += a.nbytes + _pad(a.nbytes)
+
+    manifest = {
+        "format":   FORMAT,
+        "model":    type(model).__name__,
+        "built":    str(date.today()),
+        "features": features,
+        # NaN classes (parent education "None" read as NaN in training) are stored as null
+        "encoders": {field: [None if isinstance(c, float) and c != c else c for c in le.classes_.tolist()]
+                     for field, le in load_encoders().items()},
+        "init":     ens.init,
+        "arrays":   layout,
+        "sources":  {src: _source(src) for src in SOURCES if os.path.exists(src)},
+    }
+    manifest["content_hash"] = _content_hash(manifest, arrays)
+
+    header = json.dumps(manifest, indent=1).encode()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        f.write(b"\0" * _pad(f.tell()))
+        for a in arrays.values():
+            f.write(a.tobytes())
+            f.write(b"\0" * _pad(a.nbytes))
+    os.replace(tmp_path, path)
+    return manifest
+
+
+# ── LOAD ──────────────────────────────────────────────────────────
+def read_manifest(path=BUNDLE_PATH):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a model bundle (bad magic)")
+        (n,) = struct.unpack("<Q", f.read(8))
+        manifest = json.loads(f.read(n))
+    data_start = len(MAGIC) + 8 + n
+    return manifest, data_start + _pad(data_start)
+
+
+def load(path=BUNDLE_PATH, verify=False, check_sources=True):
+    manifest, data_start = read_manifest(path)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"{path}: bundle format {manifest.get('format')}, expected {FORMAT} — "
+                         f"rebuild with: python bundle.py")
+    size = os.path.getsize(path)
+    arrays = {}
+    for name in ARRAYS:
+        spec = manifest["arrays"].get(name)
+        if spec is None:
+            raise ValueError(f"{path}: missing array {name!r}")
+        dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+        end = data_start + spec["offset"] + dtype.itemsize * int(np.prod(shape))
+        if end > size:
+            raise ValueError(f"{path}: array {name!r} runs past the end of the file (truncated bundle?)")
+        arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + spec["offset"], shape=shape)
+
+    # Fail fast on anything that does not hang together
+    n_trees, n_inner = arrays["feature"].shape
+    if arrays["threshold"].shape != (n_trees, n_inner) or arrays["value"].shape != (n_trees, n_inner + 1):
+        raise ValueError(f"{path}: tree array shapes disagree")
+    if arrays["feature"].max(initial=0) >= len(manifest["features"]):
+        raise ValueError(f"{path}: trees reference features beyond the {len(manifest['features'])}-column feature list")
+    for field in manifest["encoders"]:
+        if not manifest["encoders"][field]:
+            raise ValueError(f"{path}: encoder {field!r} has no classes")
+    if verify and _content_hash(manifest, arrays) != manifest.get("content_hash"):
+        raise ValueError(f"{path}: content hash mismatch — bundle is corrupt")
+    if check_sources:
+        stale = [src for src, recorded in manifest["sources"].items()
+                 if os.path.exists(src) and _changed(src, recorded, verify)]
+        if stale:
+            raise ValueError(f"{path} was built from different artifacts ({', '.join(stale)} changed) — "
+                             f"rebuild with: python bundle.py")
+
+    return Bundle(manifest, TreeEnsemble(arrays["feature"], arrays["threshold"], arrays["value"], manifest["init"]))
+
+
+def load_or_build(path=BUNDLE_PATH):
+    if not os.path.exists(path):
+        build(path)
+    return load(path)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--verify", action="store_true", help="hash-check the existing bundle instead of building")
+    args = ap.parse_args()
+    if args.verify:
+        load(verify=True)
+        print(f"{BUNDLE_PATH}: content and source hashes OK")
+        raise SystemExit
+    m = build()
+    print(f"{BUNDLE_PATH}: {m['model']}, {len(m['features'])} features, "
+          f"{m['arrays']['feature']['shape'][0]} trees, content hash {m['content_hash'][:12]}…, "
+          f"{os.path.getsize(BUNDLE_PATH)/1e3:.0f} KB")
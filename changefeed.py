@@ -0,0 +1,332 @@
+"""
+GABORONE TECHNICAL COLLEGE — CHANGE FEED + INCREMENTAL SCORING
+Attendance / grade / failed-course / warning updates are appended to a change feed (SQLite, WAL).
+The incremental scorer reads the feed past its cursor, recomputes attendance_low / grade_low /
+failed_multiple / at_risk and the dropout probability for the changed students only, and upserts them
+into a small score overlay. Boards lay the overlay over the scored snapshot, so a new figure shows up
+on the next rerun instead of after a full batch rescore.
+Each app process runs one FeedWorker thread: it catches the scorer up (taking the write lock only
+when the feed has a backlog) and keeps the process's copy of the overlay, reading only rows scored
+since its last read, so page renders never touch the database.
+The feed is folded into the dataset by the batch run: scoring.py writes each student's latest feed figures
+into student_data_scored.csv and records the last entry it folded (store.feed_seq, carried into the
+snapshot). When the dataset is republished, the scorer is rebuilt on the new snapshot, overlay rows for
+entries up to that seq are dropped (the snapshot holds their figures) and the cursor is rewound to it,
+so every later entry is rescored against the new snapshot: no update is lost to a republish.
+Run: python changefeed.py --watch [--interval 2]                (keep the overlay current)
+     python changefeed.py --simulate 0.03                       (feed updates for 3% of students + score them)
+"""
+
+import argparse, json, sqlite3, threading, time
+
+import numpy as np
+import pandas as pd
+
+import bundle
+import store
+from features import RAW_COLUMNS, FeaturePipeline, derive_flags
+from perf import Timer
+from scoring import risk_level
+
+FEED_PATH    = "student_changes.db"
+POLL_SECONDS = 2.0
+
+# Fields the feed accepts, with their valid range
+UPDATE_FIELDS = {"attendance_rate_pct": (0.0, 100.0), "grade_average_pct": (0.0, 100.0),
+                 "courses_failed": (0, 20), "warnings_issued": (0, 20)}
+FLAG_COLUMNS    = ["attendance_low", "grade_low", "failed_multiple", "at_risk"]
+OVERLAY_COLUMNS = [*UPDATE_FIELDS, *FLAG_COLUMNS, "dropout_probability", "risk_level"]
+BASE_COLUMNS    = ["student_id", "status", *RAW_COLUMNS]      # what the scorer reads from the snapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS updates (
+    seq                 INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id          TEXT NOT NULL,
+    attendance_rate_pct REAL,
+    grade_average_pct   REAL,
+    courses_failed      INTEGER,
+    warnings_issued     INTEGER,
+    recorded_at         REAL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    student_id          TEXT PRIMARY KEY,
+    attendance_rate_pct REAL,
+    grade_average_pct   REAL,
+    courses_failed      INTEGER,
+    warnings_issued     INTEGER,
+    attendance_low      INTEGER,
+    grade_low           INTEGER,
+    failed_multiple     INTEGER,
+    at_risk             INTEGER,
+    dropout_probability REAL,
+    risk_level          TEXT,
+    seq                 INTEGER,
+    scored_at           REAL
+);
+CREATE INDEX IF NOT EXISTS ix_scores_scored_at ON scores (scored_at);
+CREATE TABLE IF NOT EXISTS cursor (name TEXT PRIMARY KEY, seq INTEGER NOT NULL);
+"""
+
+
+class ChangeFeed:
+    def __init__(self, path=FEED_PATH, timeout=10.0):
+        self.path, self.timeout = path, timeout
+        self._local = threading.local()
+        c = self.conn()
+        cols = {r[1] for r in c.execute("PRAGMA table_info(scores)")}
+        if cols and "at_risk" not in cols:
+            # Overlay written before at_risk was scored: drop it and rescore from the feed
+            c.executescript("BEGIN IMMEDIATE; DROP TABLE scores; DELETE FROM cursor WHERE name = 'scorer'; COMMIT;")
+        with c:
+            c.executescript(SCHEMA)
+
+    def conn(self):
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+        return c
+
+    # ── PRODUCE ───────────────────────────────────────────────────
+    def record(self, student_id, **values):
+        self.record_many([{"student_id": student_id, **values}])
+
+    def record_many(self, rows):
+        for r in rows:
+            unknown = set(r) - {"student_id", *UPDATE_FIELDS}
+            if unknown:
+                raise ValueError(f"Not a feed field: {', '.join(sorted(unknown))}")
+            for f, (lo, hi) in UPDATE_FIELDS.items():
+                if r.get(f) is not None and not lo <= r[f] <= hi:
+                    raise ValueError(f"{f} must be between {lo} and {hi} (got {r[f]!r})")
+        now = time.time()
+        c = self.conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            c.executemany(f"INSERT INTO updates (student_id, {', '.join(UPDATE_FIELDS)}, recorded_at) "
+                          f"VALUES (?, {', '.join('?' * len(UPDATE_FIELDS))}, ?)",
+                          [(str(r["student_id"]), *(r.get(f) for f in UPDATE_FIELDS), now) for r in rows])
+            c.execute("COMMIT")
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+
+    # ── CONSUME ───────────────────────────────────────────────────
+    def overlay(self, after=0.0, folded=0):
+        # Overlay rows scored after `after` (epoch seconds; ix_scores_scored_at) for entries past `folded`
+        return pd.read_sql_query(f"SELECT student_id, {', '.join(OVERLAY_COLUMNS)}, scored_at FROM scores "
+                                 f"WHERE scored_at > ? AND seq > ?", self.conn(), params=(after, folded))
+
+    def head(self):
+        return self.conn().execute("SELECT COALESCE(MAX(seq), 0) FROM updates").fetchone()[0]
+
+    def latest(self, after=0, upto=None):
+        # Each student's latest figures from entries after..upto (last non-null per field), for folding
+        upd = pd.read_sql_query(f"SELECT student_id, {', '.join(UPDATE_FIELDS)} FROM updates WHERE seq > ? AND seq <= ? "
+                                f"ORDER BY seq", self.conn(), params=(after, self.head() if upto is None else upto))
+        return upd.groupby("student_id", sort=False)[list(UPDATE_FIELDS)].last()
+
+    def rebase(self, version, folded):
+        # A new snapshot holding entries up to `folded`: drop their overlay rows and rewind the scorer so
+        # every later entry is rescored against it. Once per version, whichever process gets there first.
+        c = self.conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            first = c.execute("INSERT OR IGNORE INTO cursor (name, seq) VALUES (?, ?)",
+                              (f"rebase:{version}", folded)).rowcount
+            if first:
+                c.execute("DELETE FROM cursor WHERE name LIKE 'rebase:%' AND name != ?", (f"rebase:{version}",))
+                c.execute("DELETE FROM scores WHERE seq <= ?", (folded,))
+                c.execute("INSERT OR REPLACE INTO cursor (name, seq) VALUES ('scorer', ?)", (folded,))
+            c.execute("COMMIT")
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        return bool(first)
+
+    def lag(self):
+        c = self.conn()
+        head = c.execute("SELECT COALESCE(MAX(seq), 0) FROM updates").fetchone()[0]
+        done = c.execute("SELECT COALESCE(MAX(seq), 0) FROM cursor WHERE name = 'scorer'").fetchone()[0]
+        return head - done
+
+
+class IncrementalScorer:
+    def __init__(self, feed, base=None, model_bundle=None):
+        # base: the snapshot's BASE_COLUMNS; a dataserver frame is used in place (no copy per process)
+        b = model_bundle or bundle.load_or_build()
+        self.feed, self.model, self.features = feed, b.ensemble, b.features
+        self.pipeline = FeaturePipeline(b.features, b.encoders)
+        self.base = base if base is not None else store.load(columns=BASE_COLUMNS)
+        self.ids = pd.Index(self.base["student_id"])
+        self.ids.get_indexer(self.ids[:1])            # build the id hash table now, not on the first catch-up
+
+    def catch_up(self, limit=50_000):
+        # Score every feed entry past the cursor (at most `limit`); safe to call from many processes
+        empty = {"updates": 0, "students": 0, "seconds": 0.0}
+        if self.feed.lag() <= 0:                      # plain read: no write lock while there is nothing to do
+            return empty
+        c = self.feed.conn()
+        with Timer() as t:
+            c.execute("BEGIN IMMEDIATE")              # one scorer at a time; others see an empty backlog
+            try:
+                done = c.execute("SELECT COALESCE(MAX(seq), 0) FROM cursor WHERE name = 'scorer'").fetchone()[0]
+                upd = pd.read_sql_query(f"SELECT seq, student_id, {', '.join(UPDATE_FIELDS)} FROM updates "
+                                        f"WHERE seq > ? ORDER BY seq LIMIT ?", c, params=(done, limit))
+                known = self.ids.get_indexer(upd["student_id"]) >= 0     # unknown students are skipped
+                n_rows = self._score(c, upd[known]) if len(upd) else 0
+                if len(upd):
+                    c.execute("INSERT OR REPLACE INTO cursor (name, seq) VALUES ('scorer', ?)",
+                              (int(upd["seq"].max()),))
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+        return {"updates": len(upd), "students": n_rows, "seconds": round(t.seconds, 4)}
+
+    def _score(self, c, upd):
+        if not len(upd):
+            return 0
+        ids = upd["student_id"].unique()
+        # Current values: last overlay score, else the snapshot; then the feed in order (last non-null wins)
+        cur = self.base.take(self.ids.get_indexer(ids)).set_index("student_id")
+        cur = cur.astype({f: np.float64 for f in UPDATE_FIELDS})
+        prev = pd.read_sql_query(f"SELECT student_id, {', '.join(UPDATE_FIELDS)} FROM scores "
+                                 f"WHERE student_id IN (SELECT value FROM json_each(?))", c,
+                                 params=(json.dumps(ids.tolist()),)).set_index("student_id")
+        for f in UPDATE_FIELDS:
+            cur.loc[prev.index, f] = prev[f].to_numpy()
+        latest = upd.groupby("student_id", sort=False)[list(UPDATE_FIELDS)].last()   # last non-null per field
+        for f in UPDATE_FIELDS:
+            v = latest[f].dropna()
+            cur.loc[v.index, f] = v.to_numpy()
+        derive_flags(cur)
+
+        prob = self.model.predict_proba(self.pipeline.transform(cur))[:, 1].round(4)
+        seq = upd.groupby("student_id", sort=False)["seq"].max().reindex(cur.index)
+        now = time.time()
+        c.executemany(f"INSERT OR REPLACE INTO scores (student_id, {', '.join(OVERLAY_COLUMNS)}, seq, scored_at) "
+                      f"VALUES ({', '.join('?' * (len(OVERLAY_COLUMNS) + 3))})",
+                      zip(cur.index, *(cur[f].astype(float if f.endswith("_pct") else int).tolist()
+                                       for f in [*UPDATE_FIELDS, *FLAG_COLUMNS]),
+                          prob.tolist(), risk_level(prob).tolist(), seq.astype(int).tolist(), [now] * len(cur)))
+        return len(cur)
+
+
+class FeedWorker:
+    # One per app process (hand it out with st.cache_resource): a daemon thread that keeps the scorer
+    # caught up and this process's overlay current. source: dataserver.connect() (version / feed_seq / frame).
+    # score=False only follows the overlay (the dashboard).
+    def __init__(self, feed, source, score=True, interval=POLL_SECONDS, model_bundle=None):
+        self.feed, self.source, self.score, self.interval = feed, source, score, interval
+        self.model_bundle = model_bundle
+        self.scorer, self.version, self.folded = None, None, 0
+        self._overlay = pd.DataFrame(columns=["student_id", *OVERLAY_COLUMNS, "scored_at"])
+        self.stats = {"steps": 0, "scored": 0, "errors": 0, "last_error": None}
+        self.step()                                   # first overlay before the first page renders
+        self._thread = threading.Thread(target=self._run, name="changefeed", daemon=True)
+        self._thread.start()
+
+    def overlay(self):
+        return self._overlay
+
+    def step(self):
+        version = self.source.version()
+        if version != self.version:
+            # New snapshot: entries it folded in are dropped, later ones rescored against it
+            self.folded = self.source.feed_seq()
+            if self.score:
+                self.scorer = IncrementalScorer(self.feed, self.source.frame(BASE_COLUMNS), self.model_bundle)
+                self.feed.rebase(version, self.folded)
+            self.version, self._overlay = version, self.feed.overlay(folded=self.folded)
+        if self.score:
+            self.stats["scored"] += self.scorer.catch_up()["students"]
+        watermark = self._overlay["scored_at"].max() if len(self._overlay) else 0.0
+        fresh = self.feed.overlay(watermark, self.folded)
+        if len(fresh):                                # swap in a new frame: readers never see a half update
+            merged = pd.concat([self._overlay, fresh], ignore_index=True) if len(self._overlay) else fresh
+            self._overlay = merged.drop_duplicates("student_id", keep="last").reset_index(drop=True)
+        self.stats["steps"] += 1
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.step()
+            except Exception as e:                    # keep following the feed; the Ops page shows the error
+                self.stats["errors"] += 1
+                self.stats["last_error"] = repr(e)
+
+
+def fold(chunk, latest):
+    # Batch run (scoring.py): lay ChangeFeed.latest figures over a chunk of the scored CSV, flags rederived
+    pos = latest.index.get_indexer(chunk["student_id"])
+    hit = pos >= 0
+    if not hit.any():
+        return chunk
+    rows = chunk.index[hit]
+    for f in UPDATE_FIELDS:
+        v = latest[f].to_numpy()[pos[hit]]
+        known = ~pd.isna(v)
+        chunk.loc[rows[known], f] = v[known].astype(chunk[f].dtype)
+    return derive_flags(chunk)
+
+
+def apply(df, overlay, ids=None):
+    # Lay fresh scores over a snapshot frame (returns df itself when nothing has changed). ids: a cached
+    # key → row index over df (lookup.StudentIndex / pd.Index), so only the overlay's k rows are looked up;
+    # without it one is built over df. Categorical columns get their new codes written in place.
+    if not len(overlay) or "student_id" not in df.columns:
+        return df
+    pos = (pd.Index(df["student_id"]) if ids is None else ids).get_indexer(overlay["student_id"])
+    hit = pos >= 0
+    if not hit.any():
+        return df
+    pos, overlay = pos[hit], overlay[hit]
+    out = df.copy(deep=False)                         # copy-on-write: only the columns touched get copied
+    for col in OVERLAY_COLUMNS:
+        if col not in out.columns:
+            continue
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            dtype = out[col].dtype
+            new = pd.Index(overlay[col].dropna().unique()).difference(dtype.categories)
+            if len(new):                              # a level the snapshot never had
+                dtype = pd.CategoricalDtype(dtype.categories.append(new), ordered=dtype.ordered)
+            codes = out[col].cat.codes.to_numpy().astype(np.int32)
+            codes[pos] = dtype.categories.get_indexer(overlay[col])
+            out[col] = pd.Categorical.from_codes(codes, dtype=dtype)
+        else:
+            values = out[col].to_numpy(copy=True)
+            values[pos] = overlay[col].to_numpy().astype(values.dtype)
+            out[col] = values
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Change feed + incremental scorer")
+    ap.add_argument("--watch",    action="store_true", help="keep scoring new feed entries")
+    ap.add_argument("--interval", type=float, default=2.0)
+    ap.add_argument("--simulate", type=float, default=0.0, help="feed new figures for this fraction of students")
+    args = ap.parse_args()
+
+    feed = ChangeFeed()
+    scorer = IncrementalScorer(feed)
+    if args.simulate:
+        rng = np.random.default_rng()
+        pick = rng.choice(len(scorer.base), int(len(scorer.base) * args.simulate), replace=False)
+        cur = scorer.base.take(pick)
+        ids = cur["student_id"].to_numpy()
+        feed.record_many([{"student_id": sid,
+                           "attendance_rate_pct": float(np.clip(a + rng.normal(0, 8), 0, 100).round(1)),
+                           "grade_average_pct":   float(np.clip(g + rng.normal(0, 6), 0, 100).round(1))}
+                          for sid, a, g in zip(ids, cur["attendance_rate_pct"], cur["grade_average_pct"])])
+        print(f"Recorded {len(ids):,} updates ({args.simulate:.1%} of {len(scorer.base):,} students)")
+    while True:
+        stats = scorer.catch_up()
+        if stats["updates"] or not args.watch:
+            print(json.dumps(stats))
+        if not args.watch:
+            break
+        time.sleep(args.interval)
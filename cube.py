@@ -0,0 +1,219 @@
+"""
+GABORONE TECHNICAL COLLEGE — METRICS CUBE
+Pre-aggregated counts and sums keyed by (program, campus, year_enrolled, semester_enrolled,
+enrollment_source, status). Every dashboard chart and KPI card is answered from the cube, so a
+rerun costs the same whether we hold 2,500 or 2.5 million students.
+One kernel does all the grouping: measures() turns rows into additive columns (status, risk level,
+attendance band and at-risk flag one-hot encoded once), metrics() groups any of them by any key with
+a single groupby-sum and derives every rate and mean from the sums.
+Run: python cube.py   (rebuilds student_data_cube.parquet from the store)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import store
+
+CUBE_PATH = "student_data_cube.parquet"
+
+KEYS = ["program", "campus", "year_enrolled", "semester_enrolled", "enrollment_source", "status"]
+SOURCE_COLUMNS = KEYS + ["attendance_rate_pct", "grade_average_pct", "courses_failed",
+                         "distance_from_campus_km", "at_risk", "risk_level"]
+
+SUMS = {"sum_attendance": "attendance_rate_pct",
+        "sum_grade":      "grade_average_pct",
+        "sum_failed":     "courses_failed",
+        "sum_distance":   "distance_from_campus_km"}
+
+# Attendance bands used by Chart 6 (same edges as pd.cut(bins=[0,60,75,85,100]))
+BAND_EDGES  = [60, 75, 85]
+BAND_LABELS = ["<60%", "60-74%", "75-84%", "85%+"]
+BAND_COLS   = ["n_att_lt60", "n_att_60_74", "n_att_75_84", "n_att_85plus"]
+
+RISK_LEVELS = ["Critical", "High Risk", "Medium Risk", "Low Risk"]
+RISK_COLS   = ["n_critical", "n_high", "n_medium", "n_low"]
+
+# Status one-hot: every outcome count / rate is then a plain sum, for any grouping key
+STATUSES    = ["Active", "Graduated", "Dropped Out", "On Leave"]
+STATUS_COLS = ["n_active", "n_graduated", "n_dropped", "n_on_leave"]
+
+MEASURES = ["n", *SUMS, "n_at_risk", *BAND_COLS, *RISK_COLS, *STATUS_COLS]
+
+# Means derived by metrics(): avg_<x> = sum_<x> / n
+AVGS = {"avg_attendance": "sum_attendance",
+        "avg_grade":      "sum_grade",
+        "avg_failed":     "sum_failed",
+        "avg_distance":   "sum_distance"}
+
+
+# ── KERNEL ────────────────────────────────────────────────────────
+def _one_hot(values, labels, n):
+    # One int8 column per label; compares integer codes, so text is looked at once per distinct value
+    if values is None:
+        return [np.zeros(n, np.int8) for _ in labels]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    return [(codes == i).astype(np.int8) if i >= 0 else np.zeros(n, np.int8)
+            for i in pd.Index(uniques).get_indexer(labels)]
+
+
+def measures(df):
+    # Row-level additive measures: n, metric sums and one-hot counts (status, at-risk flag, attendance
+    # band, risk level) next to whichever KEYS the frame has. Any grouping is then one groupby-sum.
+    n = len(df)
+    m = {k: df[k] for k in KEYS if k in df.columns}
+    m["n"] = np.ones(n, np.int8)
+    for name, col in SUMS.items():
+        if col in df.columns:
+            m[name] = df[col].to_numpy(np.float64)
+    m["n_at_risk"] = (df["at_risk"].to_numpy() == 1).astype(np.int8) if "at_risk" in df.columns else np.zeros(n, np.int8)
+    if "attendance_rate_pct" in df.columns:
+        band = np.searchsorted(BAND_EDGES, df["attendance_rate_pct"].to_numpy(), side="left")
+        for i, col in enumerate(BAND_COLS):
+            m[col] = (band == i).astype(np.int8)
+    for field, labels, cols in [("risk_level", RISK_LEVELS, RISK_COLS), ("status", STATUSES, STATUS_COLS)]:
+        m.update(zip(cols, _one_hot(df[field] if field in df.columns else None, labels, n)))
+    return pd.DataFrame(m, copy=False)
+
+
+def metrics(frame, key=None):
+    # Every count, sum, rate and mean per group of `key` (None → one overall row, index 0) in a single
+    # groupby-sum. `frame` is the cube, a select() of it, or measures(rows) for a row-level frame.
+    cols = [c for c in MEASURES if c in frame.columns]
+    if key is None:
+        g = frame.groupby(np.zeros(len(frame), np.int8))[cols].sum().reindex([0], fill_value=0)
+    else:
+        g = frame.groupby(key, observed=True)[cols].sum()
+        g = g[g["n"] > 0]
+    n, done = g["n"], g["n_graduated"] + g["n_dropped"]
+    return g.assign(completed=done,
+                    grad_rate=g["n_graduated"] / n * 100,
+                    drop_rate=g["n_dropped"] / n * 100,
+                    completion_grad_rate=g["n_graduated"] / done * 100,
+                    **{avg: g[s] / n for avg, s in AVGS.items() if s in g.columns})
+
+
+# ── BUILD ─────────────────────────────────────────────────────────
+def build(df):
+    return measures(df).groupby(KEYS, observed=True, sort=False).sum().reset_index()
+
+
+def load_cube(path=CUBE_PATH):
+    # Rebuild when the underlying dataset has been regenerated (or the cube predates a measure)
+    if not os.path.exists(path) or store.is_stale(path) or _missing_measures(path):
+        cube = build(store.load(columns=SOURCE_COLUMNS))
+        cube.to_parquet(path, index=False)
+        return cube
+    return pd.read_parquet(path)
+
+
+def _missing_measures(path):
+    import pyarrow.parquet as pq
+    return bool(set(MEASURES) - set(pq.read_schema(path).names))
+
+
+def select(cube, program=None, campus=None):
+    if program is not None: cube = cube[cube["program"] == program]
+    if campus is not None:  cube = cube[cube["campus"] == campus]
+    return cube
+
+
+# ── QUERIES ───────────────────────────────────────────────────────
+def _overall(cube):
+    return metrics(cube).iloc[0]
+
+def status_counts(cube):
+    return metrics(cube, "status")["n"].sort_values(ascending=False)
+
+def overview(cube):
+    t = _overall(cube)
+    return {"total":          int(t["n"]),
+            "active":         int(t["n_active"]),
+            "graduated":      int(t["n_graduated"]),
+            "dropped":        int(t["n_dropped"]),
+            "avg_attendance": t["avg_attendance"],
+            "avg_grade":      t["avg_grade"]}
+
+def grade_by_status(cube):
+    return metrics(cube, "status")["avg_grade"].rename("grade_average_pct").reset_index()
+
+def risk_counts(cube):
+    t = _overall(cube[cube["status"] == "Active"])
+    rc = pd.Series(t[RISK_COLS].to_numpy(np.int64), index=RISK_LEVELS)
+    return rc[rc > 0]
+
+def at_risk_count(cube):
+    return int(_overall(cube[cube["status"] == "Active"])["n_at_risk"])
+
+def warning_signs(cube):
+    # Chart 4: mean attendance / grade / failed courses / distance for graduates vs dropouts
+    g = metrics(cube, "status")
+    def means(status):
+        return g.loc[status, list(AVGS)].tolist() if status in g.index else [np.nan] * len(AVGS)
+    return pd.DataFrame({
+        "Factor":    ["Attendance Rate (%)", "Average Grade (%)", "Courses Failed", "Distance (km)"],
+        "Graduates": means("Graduated"),
+        "Dropouts":  means("Dropped Out"),
+    })
+
+def completion_rates(cube):
+    t = _overall(cube[cube["status"].isin(["Graduated", "Dropped Out"])])
+    return {"grad_rate":      t["grad_rate"],
+            "drop_rate":      t["drop_rate"],
+            "avg_attendance": t["avg_attendance"]}
+
+def program_dropout(cube):
+    g = metrics(cube, "program")
+    return pd.DataFrame({"program":        g.index,
+                         "total":          g["n"].to_numpy(),
+                         "dropped":        g["n_dropped"].to_numpy(),
+                         "Dropout Rate %": g["drop_rate"].round(1).to_numpy()})
+
+def attendance_outcome(cube):
+    t = metrics(cube[cube["status"].isin(["Graduated", "Dropped Out"])], "status")[BAND_COLS]
+    out = t.T.set_axis(BAND_LABELS).rename_axis("Attendance Band").stack().rename("Count").reset_index()
+    return out[out["Count"] > 0]
+
+def program_summary(cube):
+    g = metrics(cube, "program")
+    return pd.DataFrame({"program":        g.index,
+                         "Total":          g["n"].to_numpy(),
+                         "Graduated":      g["n_graduated"].to_numpy(),
+                         "Dropped":        g["n_dropped"].to_numpy(),
+                         "Avg_Attendance": g["avg_attendance"].to_numpy(),
+                         "Avg_Grade":      g["avg_grade"].to_numpy(),
+                         "Grad Rate %":    g["grad_rate"].round(1).to_numpy(),
+                         "Drop Rate %":    g["drop_rate"].round(1).to_numpy()})
+
+def enrollment_by_year(cube):
+    return metrics(cube, "year_enrolled")["n"].rename("Enrollments").reset_index()
+
+def source_counts(cube):
+    s = metrics(cube, "enrollment_source")["n"].sort_values(ascending=False)
+    return pd.DataFrame({"Source": s.index.astype(str), "Count": s.to_numpy()})
+
+def source_performance(cube):
+    g = metrics(cube, "enrollment_source")
+    return pd.DataFrame({"enrollment_source": g.index,
+                         "Enrollments":       g["n"].to_numpy(),
+                         "Dropped":           g["n_dropped"].to_numpy(),
+                         "Graduated":         g["n_graduated"].to_numpy(),
+                         "Dropout Rate %":    g["drop_rate"].round(1).to_numpy()})
+
+def campus_performance(cube):
+    g = metrics(cube, "campus")
+    return pd.DataFrame({"campus":         g.index,
+                         "Students":       g["n"].to_numpy(),
+                         "Dropout_Rate":   g["drop_rate"].round(1).to_numpy(),
+                         "Avg_Attendance": g["avg_attendance"].to_numpy(),
+                         "Avg_Grade":      g["avg_grade"].to_numpy()})
+
+
+if __name__ == "__main__":
+    if os.path.exists(CUBE_PATH): os.remove(CUBE_PATH)
+    cube = load_cube()
+    print(f"{int(cube['n'].sum()):,} students → {len(cube):,} cube cells → {CUBE_PATH}")
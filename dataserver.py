@@ -0,0 +1,183 @@
+"""
+GABORONE TECHNICAL COLLEGE — SHARED DATASET SERVER
+Loads the compact student frame (store.py) once and publishes it as an uncompressed Arrow IPC file in
+shared memory (/dev/shm). Every app process memory-maps that file and builds its frame over the mapped
+buffers without copying: numeric columns are NumPy views, categoricals are views of their int codes
+(categories travel in the schema metadata), student_id is an Arrow string array. The dataset is then
+resident once per machine however many app replicas run.
+The server polls the source files and publishes a new snapshot when they change; clients see the new
+version in the manifest on their next rerun and re-attach (a replaced snapshot stays valid for as long
+as a process still has it mapped).
+Apps attach when DATASET_DIR is set (e.g. DATASET_DIR=/dev/shm/gtc); otherwise each loads its own copy.
+Run: python dataserver.py [--dir /dev/shm/gtc] [--interval 2]
+"""
+
+import argparse, glob, hashlib, json, os, time
+
+import numpy as np
+import pandas as pd
+
+import store
+
+DATA_DIR      = "/dev/shm/gtc"
+MANIFEST      = "students.json"
+POLL_SECONDS  = 2.0
+KEEP          = 2        # snapshots kept on disk: the current one + the one a client may be about to map
+WATCHED       = [store.SCORED_CSV, store.STORE_PATH, store.SCORED_CSV + ".feed_seq"]
+
+
+# ── SNAPSHOT FORMAT ───────────────────────────────────────────────
+def to_table(df):
+    # Frame → Arrow table whose buffers a client can view as-is: categoricals as plain code columns
+    import pyarrow as pa
+    arrays, categories = [], {}
+    for c in df.columns:
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            categories[c] = [str(v) for v in s.cat.categories]
+            arrays.append(pa.array(s.cat.codes.to_numpy()))
+        elif isinstance(s.dtype, np.dtype) and s.dtype.kind in "iufb":
+            arrays.append(pa.array(s.to_numpy()))
+        else:
+            arrays.append(pa.array(s.to_numpy(dtype=object), type=pa.string()))
+    table = pa.table(arrays, names=list(df.columns))
+    return table.replace_schema_metadata({b"gtc": json.dumps({"categories": categories}).encode()})
+
+
+def attach(path):
+    # Memory-map a snapshot and build the frame over its buffers (zero-copy, read-only)
+    import pyarrow as pa
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    categories = json.loads(table.schema.metadata[b"gtc"])["categories"]
+    cols = {}
+    for name, col in zip(table.column_names, table.columns):
+        arr = col.chunk(0) if col.num_chunks else pa.array([], type=col.type)
+        if name in categories:
+            cols[name] = pd.Categorical.from_codes(arr.to_numpy(zero_copy_only=True),
+                                                   dtype=pd.CategoricalDtype(categories[name]), validate=False)
+        elif pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type):
+            cols[name] = pd.arrays.ArrowStringArray(pa.chunked_array([arr]))
+        else:
+            cols[name] = arr.to_numpy(zero_copy_only=True)
+    return pd.DataFrame(cols, copy=False)
+
+
+def publish(df, directory=DATA_DIR, version=None, feed_seq=None):
+    import pyarrow as pa
+    os.makedirs(directory, exist_ok=True)
+    version = version or str(time.time_ns())
+    table = to_table(df).combine_chunks()
+    path = os.path.join(directory, f"students-{version}.arrow")
+    with pa.OSFile(path + ".tmp", "wb") as f:
+        with pa.ipc.new_file(f, table.schema) as w:
+            w.write_table(table)
+    os.replace(path + ".tmp", path)
+    manifest = {"version": version, "path": path, "rows": len(df), "bytes": os.path.getsize(path),
+                "feed_seq": store.feed_seq() if feed_seq is None else feed_seq,
+                "published_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    tmp = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp, "w") as f: json.dump(manifest, f)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+    # Unlinking only drops the name; processes that still map an old snapshot keep reading it
+    for old in sorted(glob.glob(os.path.join(directory, "students-*.arrow")), key=os.path.getmtime)[:-KEEP]:
+        os.remove(old)
+    return manifest
+
+
+# ── SERVER ────────────────────────────────────────────────────────
+def _source_state(paths=WATCHED):
+    return tuple((p, s.st_mtime_ns, s.st_size) for p in paths if (s := _stat(p)) is not None)
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+class DataServer:
+    def __init__(self, directory=DATA_DIR, interval=POLL_SECONDS):
+        self.directory, self.interval = directory, interval
+        self.state, self.manifest = None, None
+
+    def refresh(self):
+        # Publish a new snapshot when the source files have changed since the last one
+        state = _source_state()
+        if state == self.state:
+            return False
+        folded = store.feed_seq()               # read before the data: an older seq only keeps extra feed scores
+        df = store.load()                       # rebuilds the Parquet store first when the CSV is newer
+        self.state = _source_state()            # after the rebuild, so it does not count as a change
+        self.manifest = publish(df, self.directory, feed_seq=folded)
+        return True
+
+    def serve_forever(self):
+        while True:
+            if self.refresh():
+                m = self.manifest
+                print(f"published {m['rows']:,} rows ({m['bytes'] / 1e6:.1f} MB) → {m['path']}", flush=True)
+            time.sleep(self.interval)
+
+
+# ── CLIENTS ───────────────────────────────────────────────────────
+class DataClient:
+    # Attaches to the server's current snapshot; version() is a stat (plus a small read on change)
+    def __init__(self, directory=DATA_DIR):
+        self.manifest_path = os.path.join(directory, MANIFEST)
+        self._mtime, self._manifest = None, None
+        self._frame = (None, None)
+
+    def version(self):
+        st = _stat(self.manifest_path)
+        if st is None:
+            raise RuntimeError(f"No dataset published in {os.path.dirname(self.manifest_path)} "
+                               f"(start it with: python dataserver.py)")
+        if st.st_mtime_ns != self._mtime:
+            with open(self.manifest_path) as f: self._manifest = json.load(f)
+            self._mtime = st.st_mtime_ns
+        return self._manifest["version"]
+
+    def feed_seq(self):
+        # Last change-feed entry folded into the snapshot (changefeed.py rescores every entry after it)
+        self.version()
+        return self._manifest.get("feed_seq", 0)
+
+    def frame(self, columns=None):
+        version = self.version()
+        if self._frame[0] != version:
+            try:
+                df = attach(self._manifest["path"])
+            except FileNotFoundError:           # superseded twice since the manifest was read
+                self._mtime = None
+                return self.frame(columns)
+            self._frame = (version, df)
+        df = self._frame[1]
+        return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+
+class LocalSource:
+    # Same interface without a server: this process loads its own copy from the store
+    def version(self):
+        # The same string in every process (the change feed rebases once per version)
+        return hashlib.sha1(repr(_source_state()).encode()).hexdigest()[:16]
+
+    def feed_seq(self):
+        return store.feed_seq()
+
+    def frame(self, columns=None):
+        return store.load(columns=columns)
+
+
+def connect():
+    directory = os.environ.get("DATASET_DIR")
+    return DataClient(directory) if directory else LocalSource()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Publish the student dataset in shared memory for the apps")
+    ap.add_argument("--dir", default=DATA_DIR)
+    ap.add_argument("--interval", type=float, default=POLL_SECONDS, help="seconds between source-file checks")
+    args = ap.parse_args()
+    print(f"serving {store.STORE_PATH} from {args.dir} (apps: DATASET_DIR={args.dir})", flush=True)
+    DataServer(args.dir, args.interval).serve_forever()
@@ -0,0 +1,47 @@
+"""
+GABORONE TECHNICAL COLLEGE — SHARED DATASET HANDLE
+One read-only student frame per server process (hand it out with @st.cache_resource, not
+@st.cache_data, so sessions share it instead of each getting a pickled copy), plus a prebuilt
+row index per (program, campus) pair, program and campus so a sidebar filter is a take of the
+matching rows only.
+"""
+
+import numpy as np
+
+import store
+
+_NONE = np.empty(0, dtype=np.int64)
+_NONE.setflags(write=False)
+
+
+class Dataset:
+    def __init__(self, df):
+        # Every filter's rows built up front: (program, campus), (program, None) and (None, campus).
+        # The dict is never written after this, so sessions on any thread can read it.
+        self.df = df
+        self._rows = {}
+        for by, key in [(["program", "campus"], lambda k: k), ("program", lambda k: (k, None)),
+                        ("campus", lambda k: (None, k))]:
+            for k, pos in df.groupby(by, observed=True, sort=False).indices.items():
+                pos = np.asarray(pos, dtype=np.int64)
+                pos.setflags(write=False)
+                self._rows[key(k)] = pos
+
+    @classmethod
+    def load(cls, columns=None):
+        return cls(store.load(columns=columns))
+
+    def __len__(self):
+        return len(self.df)
+
+    def rows(self, program=None, campus=None):
+        # Row positions for a filter; None means "all" for that dimension
+        if program is None and campus is None:
+            return None
+        return self._rows.get((program, campus), _NONE)
+
+    def view(self, program=None, campus=None, columns=None):
+        # Unfiltered → the shared frame itself (no copy); filtered → take of the matching rows only
+        pos = self.rows(program, campus)
+        df = self.df if columns is None else self.df[columns]
+        return df if pos is None else df.take(pos)
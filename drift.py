@@ -0,0 +1,392 @@
+"""
+GABORONE TECHNICAL COLLEGE — APPLICANT FEATURE DRIFT MONITOR
+Watches whether new registrations still look like the 2023–2025 cohorts the model was trained on.
+Every scored applicant is counted into one fixed-size int64 vector (O(1) per applicant, no growth
+with traffic):
+  - numeric fields (age, distance): a BINS-bin histogram over the form's validated range. Counts
+    add, so sketches merge by addition; quantiles are good to one bin width.
+  - categorical fields (campus, program, source, parent_ed, gender, transport / aid / working flags):
+    one counter per training category plus "other".
+Every SNAPSHOT_SECONDS the vector is copied into a ring of KEEP snapshots, so "the last 24 hours" is
+the current counts minus the snapshot a day old. Snapshots and saves happen on a background thread
+(every SAVE_SECONDS); scoring only adds to the counters. Each process saves its state under DRIFT_DIR
+as <role>-<host>-<pid>.npz (DRIFT_NAME overrides, e.g. to carry one replica's history across restarts);
+the Ops view adds up every process's window and compares it with the training baseline (PSI for every
+field, KS for the numeric ones).
+The baseline is frozen to the training cohort (TRAINING_CSV) and only rebuilt by --rebuild; saved counts
+are carried over to a rebuilt baseline's categories. Files of processes that stopped saving longer ago
+than the longest window are folded into one archive.npz (counts only, for "Since start") and removed.
+year is not monitored: a new intake year is expected, not drift.
+Run: python drift.py [--rebuild] [--compact]              (build drift_baseline.npz, print the current report)
+"""
+
+import argparse, glob, hashlib, json, os, socket, threading, time
+
+import numpy as np
+import pandas as pd
+
+from scoring import APPLICANT_COLUMNS, ENCODER_PATHS, FLAG_FIELDS, RANGES
+
+DRIFT_DIR        = "drift"
+BASELINE_PATH    = "drift_baseline.npz"
+TRAINING_CSV     = "student_data.csv"      # the 2023–2025 cohorts the model was trained on
+ARCHIVE          = "archive.npz"
+BINS             = 128
+NUMERIC          = {f: RANGES[f] for f in ["age", "distance"]}
+CATEGORICAL      = [*ENCODER_PATHS, *FLAG_FIELDS]
+SNAPSHOT_SECONDS = 3600.0
+KEEP             = 24 * 7      # hourly snapshots: windows up to a week
+SAVE_SECONDS     = 60.0
+PSI_WATCH, PSI_DRIFT = 0.10, 0.25
+MIN_COUNT        = 200         # applicants in the window before a field gets a status
+PSI_BUCKETS      = 10          # numeric PSI over baseline deciles
+WINDOWS          = {"Last 24 hours": 86_400, "Last 7 days": 7 * 86_400, "Since start": None}
+PRUNE_AFTER      = KEEP * SNAPSHOT_SECONDS      # no save for this long → only counts toward "Since start"
+LOCK_STALE       = 600.0                         # a compaction lock older than this was left by a crash
+
+
+# ── LAYOUT ────────────────────────────────────────────────────────
+def labels(values, field):
+    # Category labels as counted: flags "0" / "1" (form checkboxes send booleans), missing as "None"
+    if field in FLAG_FIELDS:
+        return pd.to_numeric(values, errors="coerce").fillna(-1).astype(int).astype(str)
+    return values.astype(object).where(values.notna(), "None").astype(str)
+
+
+class Layout:
+    # Where each field's counters sit in the flat vector
+    def __init__(self, categories):
+        self.categories = {f: [str(c) for c in categories[f]] for f in CATEGORICAL}
+        self.slices, width = {}, 0
+        for f in NUMERIC:
+            self.slices[f] = slice(width, width + BINS); width += BINS
+        for f in CATEGORICAL:
+            n = len(self.categories[f]) + 1                 # + "other"
+            self.slices[f] = slice(width, width + n); width += n
+        self.width = width
+        self._lookup = {f: {c: i for i, c in enumerate(cats)} for f, cats in self.categories.items()}
+        self._scale = {f: BINS / (hi - lo) for f, (lo, hi) in NUMERIC.items()}
+        self.spec = json.dumps([BINS, NUMERIC, self.categories])
+        self.key = hashlib.sha256(self.spec.encode()).hexdigest()[:16]
+
+    def observe(self, counts, a):
+        # One applicant (form-field dict) → += 1 in each field's slot
+        for f, (lo, _) in NUMERIC.items():
+            counts[self.slices[f].start + min(BINS - 1, max(0, int((a[f] - lo) * self._scale[f])))] += 1
+        for f in CATEGORICAL:
+            lookup, v = self._lookup[f], a[f]
+            counts[self.slices[f].start + lookup.get(str(int(v)) if f in FLAG_FIELDS else str(v), len(lookup))] += 1
+
+    def positions(self, frame):
+        # Vectorized observe: slot index per row per field
+        out = []
+        for f, (lo, _) in NUMERIC.items():
+            v = pd.to_numeric(frame[f], errors="coerce").to_numpy(np.float64)
+            out.append(self.slices[f].start + np.clip(((v - lo) * self._scale[f]).astype(np.int64), 0, BINS - 1))
+        for f in CATEGORICAL:
+            codes = pd.Index(self.categories[f]).get_indexer(labels(frame[f], f))
+            out.append(self.slices[f].start + np.where(codes < 0, len(self.categories[f]), codes))
+        return np.concatenate(out)
+
+    def count(self, frame):
+        return np.bincount(self.positions(frame), minlength=self.width).astype(np.int64)
+
+    def remap(self, arrays, spec):
+        # Counters saved under another layout (spec) → this one: categories matched by label, unknown
+        # ones to "other". None if the numeric bins differ (nothing to match them by).
+        bins, numeric, categories = json.loads(spec)
+        if bins != BINS or numeric != {f: list(r) for f, r in NUMERIC.items()}:
+            return None
+        old = Layout(categories)
+        to = np.empty(old.width, dtype=np.int64)
+        for f in NUMERIC:
+            to[old.slices[f]] = np.arange(self.slices[f].start, self.slices[f].stop)
+        for f in CATEGORICAL:
+            other = len(self.categories[f])
+            to[old.slices[f]] = self.slices[f].start + np.array(
+                [self._lookup[f].get(c, other) for c in old.categories[f]] + [other])
+        out = []
+        for a in arrays:
+            m = np.zeros(a.shape[:-1] + (self.width,), dtype=np.int64)
+            np.add.at(m.T, to, a.T)
+            out.append(m)
+        return out
+
+
+# ── BASELINE ──────────────────────────────────────────────────────
+def training_frame(path=TRAINING_CSV):
+    # The training cohort with applicant form-field names (parent_education's "None" reads as missing)
+    df = pd.read_csv(path, usecols=list(APPLICANT_COLUMNS.values()))
+    return df.rename(columns={col: field for field, col in APPLICANT_COLUMNS.items()})
+
+
+def build_baseline(path=BASELINE_PATH, frame=None):
+    frame = training_frame() if frame is None else frame
+    cats = {f: sorted(labels(frame[f], f).unique()) for f in CATEGORICAL}
+    layout = Layout(cats)
+    np.savez(path, counts=layout.count(frame), categories=json.dumps(layout.categories), rows=len(frame),
+             built_at=time.time())
+    return layout, layout.count(frame)
+
+
+def load_baseline(path=BASELINE_PATH):
+    # (layout, counts); built once if missing, otherwise fixed until `python drift.py --rebuild`
+    if not os.path.exists(path):
+        return build_baseline(path)
+    with np.load(path) as z:
+        return Layout(json.loads(str(z["categories"]))), z["counts"]
+
+
+# ── MONITOR ───────────────────────────────────────────────────────
+class DriftMonitor:
+    def __init__(self, layout, baseline, name="app", directory=DRIFT_DIR,
+                 interval=SNAPSHOT_SECONDS, keep=KEEP, save_every=SAVE_SECONDS):
+        self.layout, self.baseline = layout, baseline
+        self.interval, self.save_every = interval, save_every
+        self.path = os.path.join(directory, f"{name}.npz") if directory else None
+        self.counts = np.zeros(layout.width, dtype=np.int64)
+        self.ring = np.zeros((keep, layout.width), dtype=np.int64)      # cumulative counts at each snapshot
+        self.ring_t = np.zeros(keep)                                     # 0 = empty slot
+        self.started, self._next_snap = time.time(), 0.0
+        self._lock = threading.Lock()
+        self._restore()
+        self._thread = threading.Thread(target=self._run, name="drift", daemon=True)
+        self._thread.start()
+
+    def _restore(self):
+        if not (self.path and os.path.exists(self.path)):
+            return
+        with np.load(self.path) as z:
+            state = saved_counts(z, self.layout, "counts", "ring")
+            if state is not None and z["ring"].shape[0] == len(self.ring_t):
+                (self.counts, self.ring), self.ring_t = state, z["ring_t"].copy()
+                self.started = float(z["started"])
+
+    # ── UPDATE (scoring path) ─────────────────────────────────────
+    def observe(self, applicants):
+        with self._lock:
+            for a in applicants:
+                self.layout.observe(self.counts, a)
+
+    def observe_table(self, frame):
+        counts = self.layout.count(frame)
+        with self._lock:
+            self.counts += counts
+
+    # ── SNAPSHOT + SAVE (background thread) ───────────────────────
+    def _run(self):
+        next_compact = 0.0
+        while True:
+            try:
+                self._tick()
+                if self.path and time.time() >= next_compact:
+                    compact(self.layout, os.path.dirname(self.path))
+                    next_compact = time.time() + self.interval
+            except OSError:                           # disk full / DRIFT_DIR gone: try again next round
+                pass
+            time.sleep(self.save_every)
+
+    def _tick(self, now=None):
+        now = time.time() if now is None else now
+        if now >= self._next_snap:
+            with self._lock:
+                slot = int(np.argmin(self.ring_t))                       # empty, else the oldest
+                self.ring[slot], self.ring_t[slot] = self.counts, now
+            self._next_snap = now + self.interval
+        if self.path:
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        with self._lock:                              # copy under the lock, write outside it
+            state = dict(counts=self.counts.copy(), ring=self.ring.copy(), ring_t=self.ring_t.copy())
+        np.savez(tmp, **state, started=self.started, saved_at=time.time(), layout=self.layout.key, spec=self.layout.spec)
+        os.replace(tmp, self.path)
+
+    # ── READ ──────────────────────────────────────────────────────
+    def window(self, seconds=None, now=None):
+        with self._lock:
+            return window_counts(self.counts, self.ring, self.ring_t, seconds, now)
+
+    def nbytes(self):
+        return self.counts.nbytes + self.ring.nbytes + self.ring_t.nbytes
+
+
+def window_counts(counts, ring, ring_t, seconds=None, now=None):
+    # Counts in the last `seconds`: current minus the newest snapshot at least that old (else everything)
+    if seconds is None:
+        return counts.copy()
+    now = time.time() if now is None else now
+    old = np.flatnonzero((ring_t > 0) & (ring_t <= now - seconds))
+    return counts - ring[old[np.argmax(ring_t[old])]] if len(old) else counts.copy()
+
+
+def saved_counts(z, layout, *names):
+    # The named arrays of a saved file in `layout`: as saved, remapped from an older baseline's
+    # categories, or None when they cannot be matched
+    if str(z["layout"]) == layout.key:
+        return [z[n].copy() for n in names]
+    return layout.remap([z[n] for n in names], str(z["spec"])) if "spec" in z.files else None
+
+
+def _saved_files(directory):
+    # Per-process files, minus those an interrupted compaction already folded into the archive
+    archive = os.path.join(directory, ARCHIVE)
+    absorbed = set()
+    if os.path.exists(archive):
+        with np.load(archive) as z:
+            absorbed = set(json.loads(str(z["absorbed"])))
+    return [p for p in glob.glob(os.path.join(directory, "*.npz"))
+            if not p.endswith(".tmp.npz") and os.path.basename(p) not in absorbed]
+
+
+def merged_window(layout, seconds=None, monitor=None, directory=DRIFT_DIR):
+    # One window over every process: this one live, the others (running or exited) from their saved state.
+    # A process that last saved before the window opened scored nobody in it.
+    total = monitor.window(seconds) if monitor is not None else np.zeros(layout.width, dtype=np.int64)
+    own, now = (monitor.path if monitor is not None else None), time.time()
+    for path in _saved_files(directory):
+        if path == own:
+            continue
+        with np.load(path) as z:
+            saved_at = float(z["saved_at"]) if "saved_at" in z.files else now
+            state = saved_counts(z, layout, "counts", "ring")
+            if state is None or (seconds is not None and saved_at <= now - seconds):
+                continue
+            total = total + window_counts(state[0], state[1], z["ring_t"], seconds, now)
+    return total
+
+
+def compact(layout, directory=DRIFT_DIR, now=None):
+    # Fold the files of processes that stopped saving more than PRUNE_AFTER ago into ARCHIVE and remove
+    # them. They are older than every finite window, so only their counts are kept. One process at a
+    # time (lock file); the archive lists what it absorbed, so a crash before the removals never
+    # counts a file twice. Returns the number of files folded in.
+    now = time.time() if now is None else now
+    if not os.path.isdir(directory):
+        return 0
+    lock = os.path.join(directory, ".compact.lock")
+    try:
+        if os.path.exists(lock) and os.path.getmtime(lock) < now - LOCK_STALE:
+            os.remove(lock)
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return 0
+    try:
+        archive = os.path.join(directory, ARCHIVE)
+        counts, saved_at = np.zeros(layout.width, dtype=np.int64), 0.0
+        if os.path.exists(archive):
+            with np.load(archive) as z:
+                state, saved_at = saved_counts(z, layout, "counts"), float(z["saved_at"])
+                absorbed = json.loads(str(z["absorbed"]))
+            counts = state[0] if state is not None else counts
+            for name in absorbed:                     # left behind by an interrupted run
+                if os.path.exists(os.path.join(directory, name)):
+                    os.remove(os.path.join(directory, name))
+        old = []
+        for path in _saved_files(directory):
+            if os.path.basename(path) == ARCHIVE:
+                continue
+            with np.load(path) as z:
+                if "saved_at" not in z.files or float(z["saved_at"]) > now - PRUNE_AFTER:
+                    continue
+                state = saved_counts(z, layout, "counts")
+                counts = counts + state[0] if state is not None else counts
+                saved_at = max(saved_at, float(z["saved_at"]))
+            old.append(path)
+        if not old:
+            return 0
+        tmp = archive + ".tmp.npz"
+        np.savez(tmp, counts=counts, ring=np.zeros((1, layout.width), dtype=np.int64), ring_t=np.zeros(1),
+                 started=0.0, saved_at=saved_at, layout=layout.key, spec=layout.spec,
+                 absorbed=json.dumps([os.path.basename(p) for p in old]))
+        os.replace(tmp, archive)
+        for path in old:
+            os.remove(path)
+        return len(old)
+    finally:
+        os.remove(lock)
+
+
+# ── COMPARE ───────────────────────────────────────────────────────
+def _psi(p, q, eps=1e-4):
+    p, q = p / max(p.sum(), 1) + eps, q / max(q.sum(), 1) + eps
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+def _quantile(hist, lo, hi, q):
+    c = np.cumsum(hist)
+    return lo + (np.searchsorted(c, q * c[-1]) + 0.5) * (hi - lo) / BINS if c[-1] else float("nan")
+
+
+def compare(layout, baseline, current):
+    # One row per field: window size, PSI, KS (numeric), status and what moved
+    rows = []
+    for f, (lo, hi) in NUMERIC.items():
+        b, c = baseline[layout.slices[f]], current[layout.slices[f]]
+        n, m = int(c.sum()), int(b.sum())
+        # PSI over baseline deciles (bin edges where the baseline CDF crosses k / 10)
+        edges = np.unique(np.searchsorted(np.cumsum(b), np.arange(1, PSI_BUCKETS) / PSI_BUCKETS * m, side="right"))
+        starts = np.r_[0, edges[(edges > 0) & (edges < BINS)]]
+        psi = _psi(np.add.reduceat(c, starts), np.add.reduceat(b, starts)) if n else float("nan")
+        ks = float(np.abs(np.cumsum(c) / max(n, 1) - np.cumsum(b) / max(m, 1)).max()) if n else float("nan")
+        ks_crit = 1.358 * np.sqrt((n + m) / (n * m)) if n and m else float("nan")      # α = 0.05
+        med_b, med_c = _quantile(b, lo, hi, 0.5), _quantile(c, lo, hi, 0.5)
+        rows.append({"feature": f, "kind": "numeric", "n": n, "psi": psi, "ks": ks,
+                     "status": _status(n, psi, ks > ks_crit),
+                     "shift": f"median {med_b:.1f} → {med_c:.1f}" if n else ""})
+    for f in CATEGORICAL:
+        b, c = baseline[layout.slices[f]], current[layout.slices[f]]
+        n = int(c.sum())
+        psi = _psi(c, b) if n else float("nan")
+        labels = layout.categories[f] + ["other"]
+        diff = c / max(n, 1) - b / max(b.sum(), 1)
+        i = int(np.argmax(np.abs(diff)))
+        rows.append({"feature": f, "kind": "categorical", "n": n, "psi": psi, "ks": float("nan"),
+                     "status": _status(n, psi, False),
+                     "shift": f"{labels[i]} {b[i] / max(b.sum(), 1):.0%} → {c[i] / max(n, 1):.0%}" if n else ""})
+    return pd.DataFrame(rows)
+
+
+def _status(n, psi, ks_significant):
+    if n < MIN_COUNT:
+        return "not enough data"
+    if psi >= PSI_DRIFT:
+        return "drift"
+    return "watch" if psi >= PSI_WATCH or ks_significant else "stable"
+
+
+def load_monitor(role="app", directory=None):
+    # Monitor for this process, saved as <role>-<host>-<pid> so replicas never overwrite each other's
+    # counts; DRIFT_NAME (env) fixes the name instead, DRIFT_DIR where every process keeps its state
+    layout, baseline = load_baseline()
+    name = os.environ.get("DRIFT_NAME") or f"{role}-{socket.gethostname()}-{os.getpid()}"
+    return DriftMonitor(layout, baseline, name=name, directory=directory or os.environ.get("DRIFT_DIR", DRIFT_DIR))
+
+
+def render(st, monitor):
+    # Ops view: which applicant fields have moved away from the training data
+    st.markdown("#### 📈 Applicant feature drift vs training data")
+    label = st.selectbox("Window", list(WINDOWS), key="drift_window")
+    current = merged_window(monitor.layout, WINDOWS[label], monitor, os.path.dirname(monitor.path or "") or DRIFT_DIR)
+    report = compare(monitor.layout, monitor.baseline, current)
+    flags = {"drift": "🔴 drift", "watch": "🟠 watch", "stable": "🟢 stable", "not enough data": "⚪ not enough data"}
+    st.caption(f"{int(current[monitor.layout.slices['age']].sum()):,} applicants scored in this window (all processes) · "
+               f"PSI ≥ {PSI_WATCH} watch, ≥ {PSI_DRIFT} drift · KS at α = 0.05 · "
+               f"{monitor.nbytes() / 1e3:,.0f} kB of counters in this process")
+    st.dataframe(report.assign(status=report["status"].map(flags)).round(3), use_container_width=True, hide_index=True)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Build the training baseline and print the current drift report")
+    ap.add_argument("--rebuild", action="store_true", help=f"rebuild the baseline from {TRAINING_CSV}")
+    ap.add_argument("--compact", action="store_true", help=f"fold exited processes' files into {ARCHIVE} now")
+    ap.add_argument("--window", default="Since start", choices=list(WINDOWS))
+    args = ap.parse_args()
+    layout, baseline = build_baseline() if args.rebuild else load_baseline()
+    print(f"baseline: {int(baseline[layout.slices['age']].sum()):,} training students · {layout.width} counters")
+    if args.compact:
+        print(f"compacted {compact(layout, os.environ.get('DRIFT_DIR', DRIFT_DIR))} files into {ARCHIVE}")
+    current = merged_window(layout, WINDOWS[args.window], directory=os.environ.get("DRIFT_DIR", DRIFT_DIR))
+    print(compare(layout, baseline, current).round(3).to_string(index=False))
@@ -0,0 +1,127 @@
+"""
+GABORONE TECHNICAL COLLEGE — LIST EXPORTS
+CSV / Parquet / XLSX exports of the at-risk lists, intervention log and registration queue, written
+chunk by chunk: a source is a DataFrame (sliced into CHUNK_ROWS pieces) or an iterator of DataFrame
+chunks (e.g. RecordStore.*_frames, read from SQLite in pieces), so only one chunk is ever formatted.
+Pages only write a file when someone clicks "Prepare" (download), never on an ordinary rerun.
+Percent columns stay numeric in the source; CSV renders them as "80%" one chunk at a time (vectorized),
+XLSX stores the number with a % cell format, Parquet keeps the number.
+"""
+
+import csv, io, tempfile
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+SPOOL_BYTES = 8 << 20        # exports larger than this are spooled to disk while they are written
+
+# Format label → (file extension, MIME type)
+FORMATS = {"CSV":     ("csv",     "text/csv"),
+           "Parquet": ("parquet", "application/vnd.apache.parquet"),
+           "Excel":   ("xlsx",    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+
+
+def percent(values):
+    # Vectorized f"{x:.0f}%" (same round-half-even); missing values stay missing
+    s = pd.Series(np.round(np.asarray(values, dtype=np.float64)), index=getattr(values, "index", None))
+    return s.astype("Int64").astype("string") + "%"
+
+
+def chunks(source, rows=CHUNK_ROWS):
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), rows):
+            yield source.iloc[start:start + rows]
+        if not len(source):
+            yield source
+    else:
+        yield from source
+
+
+# ── WRITERS ───────────────────────────────────────────────────────
+def write_csv(source, out, pct=(), rows=CHUNK_ROWS):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    try:
+        for i, chunk in enumerate(chunks(source, rows)):
+            if pct:
+                chunk = chunk.assign(**{c: percent(chunk[c]) for c in pct if c in chunk.columns})
+            chunk.to_csv(text, header=i == 0, index=False, quoting=csv.QUOTE_MINIMAL)
+    finally:
+        text.detach()        # leave `out` open for the caller
+
+
+def write_parquet(source, out, pct=(), rows=CHUNK_ROWS):
+    import pyarrow as pa, pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks(source, rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            elif table.schema != writer.schema:
+                table = table.cast(writer.schema)        # e.g. an all-null column in a later SQL chunk
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_xlsx(source, out, pct=(), rows=CHUNK_ROWS):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    wb = Workbook(write_only=True)       # rows go to a temp file as they are appended
+    ws = wb.create_sheet()
+    header = None
+    for chunk in chunks(source, rows):
+        if header is None:
+            header = list(chunk.columns)
+            ws.append(header)
+            pct_pos = [header.index(c) for c in pct if c in header]
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            row = list(row)
+            for j in pct_pos:
+                if row[j] is not None:
+                    cell = WriteOnlyCell(ws, value=row[j] / 100)
+                    cell.number_format = "0%"
+                    row[j] = cell
+            ws.append(row)
+    wb.save(out)
+
+
+WRITERS = {"CSV": write_csv, "Parquet": write_parquet, "Excel": write_xlsx}
+
+
+def write(source, fmt, out, pct=(), rows=CHUNK_ROWS):
+    # Stream `source` into the binary file object `out`
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r} (use {' / '.join(FORMATS)})")
+    WRITERS[fmt](source, out, pct=list(pct), rows=rows)
+    return out
+
+
+def to_bytes(source, fmt, pct=(), rows=CHUNK_ROWS):
+    # For st.download_button, which takes the finished file's bytes
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as f:
+        write(source, fmt, f, pct, rows)
+        f.seek(0)
+        return f.read()
+
+
+def download(st, label, source, file_stem, pct=(), key=None, version=None):
+    # Format picker + "Prepare" button: nothing is written until someone asks for the file. The finished
+    # bytes are held in session state for this (format, version) only until the download click's rerun.
+    # `source` may be a callable returning the chunk iterator; `version` identifies the data it reads.
+    key = key or file_stem
+    c1, c2 = st.columns([1, 3])
+    fmt = c1.selectbox("Format", list(FORMATS), key=f"{key}_format", label_visibility="collapsed")
+    ext, mime = FORMATS[fmt]
+    slot, held = c2.empty(), st.session_state.get(f"{key}_file")
+    if held is None or held[0] != (fmt, version):
+        if not slot.button(f"⚙️  Prepare {fmt} file", key=f"{key}_prepare"):
+            st.session_state.pop(f"{key}_file", None)        # stale or never asked for
+            return
+        data = to_bytes(source() if callable(source) else source, fmt, pct)
+        held = st.session_state[f"{key}_file"] = ((fmt, version), data)
+    if slot.download_button(label, held[1], f"{file_stem}.{ext}", mime, key=f"{key}_download"):
+        st.session_state.pop(f"{key}_file", None)            # downloaded: the next one is prepared afresh
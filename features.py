@@ -0,0 +1,199 @@
+"""
+GABORONE TECHNICAL COLLEGE — FEATURE PIPELINE
+The one place raw student columns become the 22-column model matrix (features.json order):
+label-encoded text columns, program length, and the attendance / grade / failure / distance / age /
+parent-education flags. transform() is column-wise NumPy for frames of any size; fill() writes one
+record (a dict) into a preallocated row with plain lookups, for the single-applicant path where a
+DataFrame would cost more than the model. test_features.py checks that the two agree.
+Run: python features.py   (parity check against every row of student_data_scored.csv)
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+FEATURES_PATH = "features.json"
+SCORED_CSV    = "student_data_scored.csv"
+
+# Encoded column → (raw column, encoder field)
+ENCODED = {"campus_enc":  ("campus",            "campus"),
+           "program_enc": ("program",           "program"),
+           "source_enc":  ("enrollment_source", "source"),
+           "parent_enc":  ("parent_education",  "parent_ed"),
+           "gender_enc":  ("gender",            "gender")}
+
+NUMERIC = ["age", "distance_from_campus_km", "has_transport", "has_financial_aid", "working_student",
+           "attendance_rate_pct", "grade_average_pct", "courses_failed", "warnings_issued", "year_enrolled"]
+RAW_COLUMNS = NUMERIC + [raw for raw, _ in ENCODED.values()]
+
+# Flag cut-offs (as in the training data)
+ATTENDANCE_LOW  = 75     # attendance_low:  attendance_rate_pct < 75
+GRADE_LOW       = 55     # grade_low:       grade_average_pct < 55
+FAILED_MULTIPLE = 2      # failed_multiple: courses_failed >= 2
+DISTANCE_FAR    = 40     # distance_far:    distance_from_campus_km > 40
+AGE_MATURE      = 30     # age_mature:      age > 30
+
+
+def _is_missing(c):
+    return c is None or (isinstance(c, float) and c != c)
+
+
+def _num(df, col):
+    return np.asarray(df[col], dtype=np.float64)
+
+
+def _factorize(values):
+    # (codes, distinct values); categoricals reuse their codes, anything else is hashed once
+    values = values if isinstance(values, pd.Series) else pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values.cat.codes, dtype=np.int64), values.cat.categories
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def _val(r, col):
+    # A record's number; None compares like NaN (False), as in the column-wise recipes
+    v = r[col]
+    return np.nan if v is None else v
+
+
+# transform()'s derived recipes for a single record (FeaturePipeline.fill)
+_SCALAR_DERIVED = {
+    "program_length_yrs": lambda r: 1 if isinstance(r["program"], str) and "Certificate" in r["program"] else 2,
+    "attendance_low":     lambda r: _val(r, "attendance_rate_pct") < ATTENDANCE_LOW,
+    "grade_low":          lambda r: _val(r, "grade_average_pct") < GRADE_LOW,
+    "failed_multiple":    lambda r: _val(r, "courses_failed") >= FAILED_MULTIPLE,
+    "distance_far":       lambda r: _val(r, "distance_from_campus_km") > DISTANCE_FAR,
+    "age_mature":         lambda r: _val(r, "age") > AGE_MATURE,
+    "parent_edu_low":     lambda r: r["parent_education"] == "Primary",
+}
+
+
+def derive_flags(df):
+    # Academic flags that move with new attendance / grade figures (used by changefeed.py too); with a
+    # status column also at_risk: an active student with any of them
+    df["attendance_low"]  = (_num(df, "attendance_rate_pct") < ATTENDANCE_LOW).astype(np.int8)
+    df["grade_low"]       = (_num(df, "grade_average_pct") < GRADE_LOW).astype(np.int8)
+    df["failed_multiple"] = (_num(df, "courses_failed") >= FAILED_MULTIPLE).astype(np.int8)
+    if "status" in df.columns:
+        flagged = (df["attendance_low"] | df["grade_low"] | df["failed_multiple"]).to_numpy() == 1
+        df["at_risk"] = ((np.asarray(df["status"], dtype=object) == "Active") & flagged).astype(np.int8)
+    return df
+
+
+class FeaturePipeline:
+    def __init__(self, features, classes):
+        self.features = list(features)
+        self._col = {f: i for i, f in enumerate(self.features)}
+        missing = set(self.features) - {*NUMERIC, *ENCODED, "program_length_yrs", "attendance_low", "grade_low",
+                                         "failed_multiple", "distance_far", "age_mature", "parent_edu_low"}
+        if missing:
+            raise ValueError(f"No recipe for feature(s): {', '.join(sorted(missing))}")
+        # Encoder classes; training read parent education "None" as NaN, so missing values and the
+        # string "None" both take the NaN class's code
+        self.classes, self._known, self._missing_code = {}, {}, {}
+        for field, cls in classes.items():
+            cls = list(cls)
+            self.classes[field] = cls
+            self._known[field] = pd.Index([c for c in cls if not _is_missing(c)])
+            self._missing_code[field] = next((i for i, c in enumerate(cls) if _is_missing(c)), -1)
+        # fill(): per-field code dicts ("None" → the NaN class) and the row slots each recipe writes
+        self._codes = {field: {("None" if _is_missing(c) else c): i for i, c in enumerate(cls)}
+                       for field, cls in self.classes.items()}
+        col = self._col
+        self._fill_numeric = [(col[f], f) for f in NUMERIC if f in col]
+        self._fill_encoded = [(col[enc], raw, field) for enc, (raw, field) in ENCODED.items() if enc in col]
+        self._fill_derived = [(col[f], fn) for f, fn in _SCALAR_DERIVED.items() if f in col]
+
+    @classmethod
+    def load(cls, features_path=FEATURES_PATH):
+        from scoring import load_encoders
+        with open(features_path) as f: features = json.load(f)
+        return cls(features, {field: le.classes_ for field, le in load_encoders().items()})
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls(bundle.features, bundle.encoders)
+
+    def categories(self, field):
+        return sorted(["None" if _is_missing(c) else c for c in self.classes[field]])
+
+    # ── ENCODE ────────────────────────────────────────────────────
+    def encode(self, values, field):
+        # Label codes for a text column; the lookup runs once per distinct value, not per row
+        codes, uniques = _factorize(values)
+        lut = self._known[field].get_indexer(uniques).astype(np.int64)
+        lut[(lut < 0) & (uniques.astype(str) == "None")] = self._missing_code[field]
+        codes = np.append(lut, self._missing_code[field])[codes]     # code -1 (missing) → last slot
+        if (codes < 0).any():
+            bad = sorted(set(map(str, pd.Series(values)[codes < 0].unique())))
+            raise ValueError(f"Unknown {field}: {', '.join(bad[:5])}")
+        return codes
+
+    def _by_category(self, values, fn):
+        # Apply a per-value rule to each distinct value, then gather (keeps text work O(categories))
+        codes, uniques = _factorize(values)
+        lut = np.array([fn(c) for c in uniques] + [fn(None)], dtype=np.float64)
+        return lut[codes]     # code -1 (missing) → last slot
+
+    def code(self, value, field):
+        # encode() for one value
+        if _is_missing(value):
+            value = "None"
+        code = self._codes[field].get(value)
+        if code is None:
+            raise ValueError(f"Unknown {field}: {value}")
+        return code
+
+    # ── TRANSFORM ─────────────────────────────────────────────────
+    def fill(self, rec, row):
+        # One record (raw column → value) → `row` in place; same recipes as transform, no pandas
+        for j, f in self._fill_numeric:
+            row[j] = _val(rec, f)
+        for j, raw, field in self._fill_encoded:
+            row[j] = self.code(rec[raw], field)
+        for j, fn in self._fill_derived:
+            row[j] = fn(rec)
+        return row
+
+    def transform(self, df, out=None):
+        # Raw student columns (RAW_COLUMNS) → float64 matrix in features.json order
+        n = len(df)
+        X = np.empty((n, len(self.features)), dtype=np.float64) if out is None else out[:n]
+        col = self._col
+        for f in NUMERIC:
+            if f in col:
+                X[:, col[f]] = _num(df, f)
+        for enc, (raw, field) in ENCODED.items():
+            if enc in col:
+                X[:, col[enc]] = self.encode(df[raw], field)
+
+        program, parent = df["program"], df["parent_education"]
+        age, distance = _num(df, "age"), _num(df, "distance_from_campus_km")
+        derived = {
+            "program_length_yrs": lambda: self._by_category(program, lambda p: 1 if p and "Certificate" in p else 2),
+            "attendance_low":     lambda: _num(df, "attendance_rate_pct") < ATTENDANCE_LOW,
+            "grade_low":          lambda: _num(df, "grade_average_pct") < GRADE_LOW,
+            "failed_multiple":    lambda: _num(df, "courses_failed") >= FAILED_MULTIPLE,
+            "distance_far":       lambda: distance > DISTANCE_FAR,
+            "age_mature":         lambda: age > AGE_MATURE,
+            # "None" was NaN in training, so only "Primary" counts as low parent education
+            "parent_edu_low":     lambda: self._by_category(parent, lambda p: p == "Primary"),
+        }
+        for f, fn in derived.items():
+            if f in col:
+                X[:, col[f]] = fn()
+        return X
+
+
+if __name__ == "__main__":
+    raw = pd.read_csv(SCORED_CSV)
+    pipe = FeaturePipeline.load()
+    X = pipe.transform(raw[RAW_COLUMNS])
+    expected = raw[pipe.features].to_numpy(np.float64)
+    diff = X != expected
+    for j in np.flatnonzero(diff.any(axis=0)):
+        print(f"MISMATCH {pipe.features[j]}: {diff[:, j].sum()} rows")
+    assert not diff.any(), "feature pipeline disagrees with the scored dataset"
+    print(f"{len(raw):,} rows × {len(pipe.features)} features: identical to {SCORED_CSV}")
@@ -0,0 +1,169 @@
+"""
+GABORONE TECHNICAL COLLEGE — BULK APPLICANT IMPORT
+Intake-week path behind the Bulk Import page: a CSV / XLSX of applicants (TEMPLATE columns) is read
+once, validated in vectorized passes (encoder classes, input ranges, whole-number age / year, yes / no
+flags, required fields, Omang numbers repeated in the file or already in the queue), scored in one batched model call and added to the registration queue in one
+transaction. Rows that fail validation are reported with their errors and left out.
+Run: python intake.py applicants.csv [--officer NAME] [--dry-run]   |   python intake.py --template applicants.csv
+"""
+
+import argparse, io
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import export
+from perf import Timer
+from scoring import ENCODER_PATHS, validate_table
+
+TEMPLATE = ["student_name", "omang", "age", "gender", "phone", "campus", "program", "year", "semester",
+            "source", "distance", "transport", "parent_ed", "fin_aid", "working", "notes"]
+OPTIONAL  = ["phone", "notes"]
+SEMESTERS = ["Semester 1", "Semester 2"]
+FLAGS     = ["transport", "fin_aid", "working"]
+NUMBERS   = ["age", "year", "distance"]
+WHOLE     = ["age", "year"]            # stored as INTEGER in the queue: 19.7 is an error, not 19
+
+# Yes / no cells as officers type them (or Excel stores them)
+YES = {"1", "1.0", "yes", "y", "true", "t"}
+NO  = {"0", "0.0", "no", "n", "false", "f", ""}
+
+
+# ── READ ──────────────────────────────────────────────────────────
+def read(file, name=None):
+    # Path or uploaded file → frame of text cells. Only empty cells are missing: "None" is a valid
+    # parent_ed answer, so pandas' default NA strings stay off.
+    name = str(name or getattr(file, "name", file)).lower()
+    opts = dict(dtype=str, keep_default_na=False, na_values=[""])
+    df = pd.read_excel(file, **opts) if name.endswith((".xlsx", ".xls")) else pd.read_csv(file, **opts)
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    missing = [c for c in TEMPLATE if c not in df.columns and c not in OPTIONAL]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)} (expected {', '.join(TEMPLATE)})")
+    for c in OPTIONAL:
+        if c not in df.columns:
+            df[c] = ""
+    return df[TEMPLATE].reset_index(drop=True)
+
+
+def prepare(df):
+    # Text trimmed, numbers parsed (NaN if unreadable), yes / no flags as 0 / 1 (NaN if unreadable)
+    out = df.apply(lambda s: s.str.strip())
+    for c in NUMBERS:
+        out[c] = pd.to_numeric(out[c], errors="coerce")
+    for c in FLAGS:
+        text = out[c].fillna("").str.lower()
+        out[c] = np.where(text.isin(YES), 1.0, np.where(text.isin(NO), 0.0, np.nan))
+    return out
+
+
+# ── VALIDATE ──────────────────────────────────────────────────────
+def validate(df, scorer, queued=None):
+    # Error text per row ("" = valid): the registration form's checks plus file-level ones.
+    # queued: Omang → reg_id of applicants already in the registration queue (RecordStore.queued_omangs)
+    choices = {field: scorer.categories(field) for field in ENCODER_PATHS}
+    errors = validate_table(df, choices)
+    extra = pd.Series("", index=df.index, dtype=object)
+    for c in ["student_name", "omang"]:
+        extra += np.where(df[c].isna(), f"; Missing {c}", "")
+    extra += np.where(df["semester"].notna() & ~df["semester"].isin(SEMESTERS),
+                      "; Unknown semester: " + df["semester"].astype(str), "")
+    for c in WHOLE:
+        extra += np.where(df[c].notna() & (df[c] % 1 != 0),
+                          f"; {c} must be a whole number (got " + df[c].astype(str) + ")", "")
+    extra += np.where(df["omang"].notna() & df["omang"].duplicated(), "; Duplicate omang in this file", "")
+    if queued:
+        reg = df["omang"].map(queued)
+        extra += np.where(reg.notna(), "; Omang already in the registration queue (" + reg.astype(str) + ")", "")
+    both = errors + extra
+    return both.str.removeprefix("; ")
+
+
+# ── SCORE + QUEUE ─────────────────────────────────────────────────
+def score(valid, scorer):
+    # Valid rows + probability / level columns, from one batched model call
+    ints = valid.astype({c: int for c in ["age", "year", *FLAGS]})
+    return valid.join(scorer.score_table(ints))
+
+
+def registrations(scored, officer=""):
+    # Queue rows (records.REG_FIELDS) for the scored applicants
+    regs = pd.DataFrame({
+        "date":         str(date.today()),
+        "student_name": scored["student_name"],
+        "omang":        scored["omang"],
+        "age":          scored["age"].astype(int),
+        "gender":       scored["gender"],
+        "phone":        scored["phone"].fillna(""),
+        "campus":       scored["campus"],
+        "program":      scored["program"],
+        "year":         scored["year"].astype(int),
+        "semester":     scored["semester"],
+        "source":       scored["source"],
+        "risk_level":   scored["level"],
+        "risk_score":   export.percent(scored["probability"] * 100),
+        "officer":      officer,
+        "notes":        scored["notes"].fillna(""),
+        "status":       "Pending Approval",
+    })
+    return regs.astype(object).to_dict("records")
+
+
+def check(df, scorer, progress=None, records=None):
+    # Validate + score; progress(fraction, text) is called between steps (the page's progress bar).
+    # With records (RecordStore), Omang numbers already in the queue are rejected too.
+    # Returns (summary, rejected rows with their errors, scored valid rows)
+    progress = progress or (lambda fraction, text: None)
+    with Timer() as t:
+        progress(0.1, f"Validating {len(df):,} rows")
+        df = prepare(df)
+        queued = records.queued_omangs(df["omang"].dropna().tolist()) if records is not None else None
+        errors = validate(df, scorer, queued)
+        ok = errors == ""
+        valid = df[ok]
+        progress(0.4, f"Scoring {len(valid):,} applicants in one batch")
+        scored = score(valid, scorer) if len(valid) else valid.assign(probability=np.nan, level="")
+        progress(1.0, "Checked")
+    summary = {"rows": len(df), "valid": int(ok.sum()), "invalid": int((~ok).sum()),
+               "levels": scored["level"].value_counts().to_dict(), "seconds": round(t.seconds, 3)}
+    return summary, df.loc[~ok].assign(errors=errors[~ok]), scored
+
+
+def queue(scored, records, officer=""):
+    # Every scored row into the registration queue in one transaction → new reg_ids
+    regs = registrations(scored, officer)
+    return records.add_registrations(regs) if regs else []
+
+
+def template_bytes():
+    buf = io.StringIO()
+    pd.DataFrame([{"student_name": "Kagiso Molefe", "omang": "123456789", "age": 19, "gender": "Female",
+                   "phone": "71234567", "campus": "Main Campus - Gaborone", "program": "Diploma in IT", "year": 2026,
+                   "semester": "Semester 1", "source": "Website Form", "distance": 12.5, "transport": "no",
+                   "parent_ed": "Secondary", "fin_aid": "yes", "working": "no", "notes": ""}],
+                 columns=TEMPLATE).to_csv(buf, index=False)
+    return buf.getvalue().encode()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Validate, score and queue a file of applicants")
+    ap.add_argument("file", help=".csv or .xlsx (with --template: where to write a blank template)")
+    ap.add_argument("--officer", default="")
+    ap.add_argument("--dry-run", action="store_true", help="validate + score only; nothing is queued")
+    ap.add_argument("--template", action="store_true")
+    args = ap.parse_args()
+    if args.template:
+        with open(args.file, "wb") as f: f.write(template_bytes())
+        raise SystemExit(f"template → {args.file}")
+
+    import bundle
+    from records import RecordStore
+    from scoring import ApplicantScorer
+    records = RecordStore()
+    summary, rejected, scored = check(read(args.file), ApplicantScorer.from_bundle(bundle.load_or_build()), records=records)
+    reg_ids = [] if args.dry_run else queue(scored, records, args.officer)
+    print(f"{summary['rows']:,} rows: {summary['valid']:,} valid, {summary['invalid']:,} rejected "
+          f"(checked in {summary['seconds']:.2f}s) · {summary['levels']} · {len(reg_ids):,} queued")
+    if len(rejected):
+        print(rejected[["student_name", "omang", "errors"]].head(20).to_string())
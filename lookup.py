@@ -0,0 +1,119 @@
+"""
+GABORONE TECHNICAL COLLEGE — STUDENT LOOKUP INDEX
+Hash index from the record key (student_id / reg_id) to row position, plus a typeahead search over
+ID, name and Omang: exact hit first, then prefix matches (binary search over the sorted keys), then
+substring matches (trigram postings intersected, candidates verified in row order until k are found).
+Keys are case-folded; queries shorter than 3 characters use the prefix search only.
+Built once per process (vectorized); a lookup never scans the table.
+"""
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ["student_id", "student_name", "omang"]
+_TOP = chr(0x10FFFF)
+
+
+def _normalize(values):
+    return np.asarray(pd.Series(values, dtype="string").fillna("").str.strip().str.casefold(), dtype=str)
+
+
+def _trigrams(keys):
+    # Each trigram packed into one int64 (21 bits per code point); rows of a "<U" array are NUL-padded
+    width = keys.dtype.itemsize // 4
+    if width < 3:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+    cp = keys.view(np.uint32).reshape(len(keys), width).astype(np.int64)
+    codes = (cp[:, :-2] << 42) | (cp[:, 1:-1] << 21) | cp[:, 2:]
+    valid = cp[:, 2:] != 0
+    docs = np.broadcast_to(np.arange(len(keys), dtype=np.int32)[:, None], codes.shape)
+    return codes[valid], docs[valid]
+
+
+class StudentIndex:
+    def __init__(self, df, key="student_id", fields=SEARCH_FIELDS):
+        self.key = key
+        self._pos = pd.Index(df[key].astype(str))
+        if not self._pos.is_unique:
+            raise ValueError(f"{key} values are not unique — cannot build a lookup index")
+
+        # Search documents: one per (row, field) with a non-empty value
+        fields = [f for f in dict.fromkeys([key, *fields]) if f in df.columns]
+        keys = np.concatenate([_normalize(df[f]) for f in fields]) if len(df) else np.empty(0, dtype="<U1")
+        doc_row = np.tile(np.arange(len(df), dtype=np.int32), len(fields))
+        keep = keys != ""
+        keys, self.doc_row = keys[keep], doc_row[keep]
+
+        # Prefix search: documents in key order (the only copy of the keys kept; _rank maps doc → slot)
+        self._order = np.argsort(keys, kind="stable").astype(np.int32)
+        self._sorted = keys[self._order]
+        self._rank = np.empty_like(self._order)
+        self._rank[self._order] = np.arange(len(keys), dtype=np.int32)
+
+        # Substring search: trigram → sorted, de-duplicated doc ids (CSR layout)
+        codes, docs = _trigrams(keys)
+        o = np.argsort(codes, kind="stable")             # stable keeps doc ids ascending per trigram
+        codes, docs = codes[o], docs[o]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (docs[1:] != docs[:-1])
+        codes, self._postings = codes[first], docs[first]
+        self._grams, start = np.unique(codes, return_index=True)
+        self._bounds = np.append(start, len(codes))
+
+    def __len__(self):
+        return len(self._pos)
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.doc_row, self._order, self._rank, self._sorted,
+                                      self._postings, self._grams, self._bounds))
+
+    # ── HASH LOOKUP ───────────────────────────────────────────────
+    def get(self, key):
+        # Row position for a key, or None
+        try:
+            return int(self._pos.get_loc(str(key)))
+        except KeyError:
+            return None
+
+    def get_indexer(self, keys):
+        # Row positions for many keys, -1 where missing (hashes only the keys asked for)
+        return self._pos.get_indexer(pd.Index(keys).astype(str))
+
+    # ── TYPEAHEAD ─────────────────────────────────────────────────
+    def _prefix(self, q, limit):
+        lo = np.searchsorted(self._sorted, q, "left")
+        hi = np.searchsorted(self._sorted, q + _TOP, "left")
+        return self._order[lo:min(hi, lo + limit)]
+
+    def _substring(self, q):
+        grams = np.unique(_trigrams(np.array([q]))[0])
+        at = np.searchsorted(self._grams, grams)
+        if not len(self._grams) or (at >= len(self._grams)).any() or (self._grams[at] != grams).any():
+            return
+        lists = sorted((self._postings[self._bounds[i]:self._bounds[i + 1]] for i in at), key=len)
+        cand = lists[0]
+        for p in lists[1:]:
+            cand = np.intersect1d(cand, p, assume_unique=True)
+            if not len(cand):
+                return
+        for d in cand:                                   # trigrams can match out of order: verify
+            if q in self._sorted[self._rank[d]]:
+                yield d
+
+    def search(self, query, k=10):
+        # Top-k row positions for a partial ID / name / Omang
+        q = str(query).strip().casefold()
+        out = {}
+        hit = self.get(str(query).strip())
+        if hit is not None:
+            out[hit] = None
+        for d in self._prefix(q, 2 * k + len(out)):
+            if len(out) >= k:
+                break
+            out.setdefault(int(self.doc_row[d]), None)
+        if len(out) < k and len(q) >= 3:
+            for d in self._substring(q):
+                out.setdefault(int(self.doc_row[d]), None)
+                if len(out) >= k:
+                    break
+        return np.fromiter(out, dtype=np.int64, count=min(len(out), k))
@@ -0,0 +1,246 @@
+"""
+GABORONE TECHNICAL COLLEGE — OPS INSTRUMENTATION
+Process-wide timings, cache hit / miss counters and gauges for both Streamlit apps. Each rerun is
+one Run (page name + wall time + the spans timed inside it + which caches hit), logged as one JSON
+line on the "gtc.ops" logger and summarised on the hidden Ops page (?ops=1). A run can also be
+profiled on demand (?profile=sample|cprofile, or GTC_PROFILE for every rerun; see profiler.py).
+Overhead is a perf_counter pair and a locked dict update per span (~5 µs), so it stays on.
+Logging: OPS_LOG unset or "-" → stderr, a path → that file (appended), "off" → no log lines.
+"""
+
+import functools, json, logging, os, sys, threading, time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from perf import rss_mb
+
+RECENT = 512        # durations kept per span name for p50 / p95
+
+log = logging.getLogger("gtc.ops")
+
+
+class _Stats:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self):
+        self.count, self.total, self.max = 0, 0.0, 0.0
+        self.recent = deque(maxlen=RECENT)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+
+class Run:
+    # One script rerun; spans / caches timed while it is current are attached to it. Started at the
+    # top of the script, named once the sidebar has picked the page.
+    def __init__(self, recorder, app, page=""):
+        self.recorder, self.app = recorder, app
+        self.set_page(page)
+        self.spans, self.caches = {}, {}
+        self.profile = None
+        self.t0 = time.perf_counter()
+        self.finished = False
+
+    def set_page(self, page):
+        self.page = page.split(maxsplit=1)[-1] if page else ""     # sidebar labels lead with an emoji
+
+    def finish(self):
+        # Called from the apps' finally: a rerun cut short by st.stop() / st.rerun() (or an error) is still
+        # timed, and counted as stopped
+        if self.finished:
+            return
+        self.finished = True
+        seconds = time.perf_counter() - self.t0
+        rec = self.recorder
+        rec.observe(f"page:{self.app}:{self.page}", seconds)
+        rec.gauge("process.rss_mb", rss_mb())
+        record = {"event": "rerun", "app": self.app, "page": self.page, "ms": round(seconds * 1e3, 2),
+                  "spans": self.spans, "caches": self.caches, "rss_mb": round(rec.gauges["process.rss_mb"], 1)}
+        if sys.exc_info()[0] is not None:
+            rec.count(f"page:{self.app}:{self.page}:stopped")
+            record["stopped"] = True
+        if self.profile is not None:
+            record["profile"] = self.profile.finish(self.page)
+        rec.emit(record)
+
+    def abandon(self):
+        # Never reached finish() (an error before the page body): nothing to report, but a profiler must
+        # not keep running
+        self.finished = True
+        if self.profile is not None:
+            self.profile.impl.stop()
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()          # Streamlit runs each session's rerun on its own thread
+        self.timings, self.counters, self.gauges = {}, Counter(), {}
+
+    # ── RECORD ────────────────────────────────────────────────────
+    def observe(self, name, seconds):
+        with self._lock:
+            stats = self.timings.get(name)
+            if stats is None:
+                stats = self.timings[name] = _Stats()
+            stats.add(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def gauge(self, name, value):
+        self.gauges[name] = float(value)
+
+    @contextmanager
+    def span(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            self.observe(name, seconds)
+            run = self.current()
+            if run is not None:
+                run.spans[name] = round(run.spans.get(name, 0.0) + seconds * 1e3, 3)
+
+    # ── RUNS ──────────────────────────────────────────────────────
+    def current(self):
+        return getattr(self._local, "run", None)
+
+    def start(self, app, page="", profile=None):
+        # A previous run on this thread that never reached finish() failed before its page body
+        prev = self.current()
+        if prev is not None and not prev.finished:
+            self.count(f"page:{prev.app}:{prev.page}:stopped")
+            prev.abandon()
+        run = self._local.run = Run(self, app, page)
+        mode = profile or os.environ.get("GTC_PROFILE")
+        if mode:
+            from profiler import Profile       # only imported when profiling is switched on
+            try:
+                run.profile = Profile(mode, app).start()
+            except ValueError as e:
+                log.warning(str(e))
+        return run
+
+    def emit(self, record):
+        if log.isEnabledFor(logging.INFO):
+            log.info(json.dumps(record, separators=(",", ":"), default=str))
+
+    # ── READ ──────────────────────────────────────────────────────
+    def snapshot(self):
+        with self._lock:
+            timings = {name: (s.count, s.total, s.max, np.array(s.recent)) for name, s in self.timings.items()}
+            counters = dict(self.counters)
+        rows = [{"name": name, "count": n, "mean_ms": total / n * 1e3,
+                 "p50_ms": np.percentile(recent, 50) * 1e3, "p95_ms": np.percentile(recent, 95) * 1e3,
+                 "max_ms": worst * 1e3}
+                for name, (n, total, worst, recent) in timings.items()]
+        caches = {}
+        for name, n in counters.items():
+            if name.startswith("cache:"):
+                _, fn, kind = name.split(":")
+                caches.setdefault(fn, {"hits": 0, "misses": 0})[kind] = n
+        return {"timings": rows, "caches": [{"cache": fn, **c, "hit_rate": c["hits"] / max(1, c["hits"] + c["misses"])}
+                                            for fn, c in caches.items()],
+                "counters": {k: v for k, v in counters.items() if not k.startswith("cache:")},
+                "gauges": dict(self.gauges)}
+
+
+REC = Recorder()
+span, count, gauge, start, current = REC.span, REC.count, REC.gauge, REC.start, REC.current
+
+
+def timed(fn):
+    # Decorator: every call is a span named after the function
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def cached(cache_decorator, name=None):
+    # Wrap st.cache_data / st.cache_resource so hits and misses are counted: the inner function
+    # only runs on a miss. Use as @ops.cached(st.cache_data) in place of @st.cache_data.
+    def deco(fn):
+        key = name or fn.__name__
+        local = threading.local()
+
+        @functools.wraps(fn)
+        def build(*args, **kwargs):
+            local.missed = True
+            with span(f"cache:{key}"):
+                return fn(*args, **kwargs)
+
+        cached_fn = cache_decorator(build)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            local.missed = False
+            out = cached_fn(*args, **kwargs)
+            count(f"cache:{key}:{'misses' if local.missed else 'hits'}")
+            run = current()
+            if run is not None:
+                run.caches[key] = "miss" if local.missed else "hit"
+            return out
+
+        call.clear = cached_fn.clear
+        return call
+    return deco
+
+
+def frame_mb(name, df):
+    # Gauge the in-memory size of a loaded frame (call from inside a cached loader: runs once per load)
+    gauge(f"memory.{name}_mb", df.memory_usage(deep=True).sum() / 1e6)
+    return df
+
+
+def render(st):
+    # The hidden Ops page (both apps link it as ?ops=1)
+    snap = REC.snapshot()
+    st.markdown("### 🛠 Ops — this server process")
+    st.caption(f"RSS {snap['gauges'].get('process.rss_mb', rss_mb()):,.0f} MB · "
+               + " · ".join(f"{k} {v:,.1f}" for k, v in sorted(snap["gauges"].items()) if k != "process.rss_mb"))
+    if snap["timings"]:
+        st.markdown("#### ⏱ Page + span timings")
+        st.dataframe(pd.DataFrame(snap["timings"]).sort_values("p95_ms", ascending=False).round(2),
+                     use_container_width=True, hide_index=True)
+    if snap["caches"]:
+        st.markdown("#### 🗄 Cache hits / misses")
+        st.dataframe(pd.DataFrame(snap["caches"]).round(3), use_container_width=True, hide_index=True)
+    if snap["counters"]:
+        st.markdown("#### 🔢 Counters")
+        st.json(snap["counters"])
+
+
+def render_profile(st, run, n=20):
+    # Top-N hotspots of a profiled rerun, under the page it profiled (call after run.finish())
+    if run.profile is None:
+        return
+    if "profile" in st.query_params:
+        del st.query_params["profile"]          # one rerun per ?profile= request
+    prof = run.profile
+    st.markdown("---")
+    st.markdown(f"### 🔬 Profile of this rerun — {prof.mode}")
+    st.caption(f"{prof.seconds * 1e3:,.0f} ms profiled · saved to {prof.path}")
+    st.dataframe(prof.hotspots(n).round(2), use_container_width=True, hide_index=True)
+
+
+def configure_logging(target=None):
+    target = os.environ.get("OPS_LOG", "-") if target is None else target
+    if log.handlers or target == "off":
+        return log
+    handler = logging.StreamHandler() if target == "-" else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
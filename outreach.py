@@ -0,0 +1,277 @@
+"""
+GABORONE TECHNICAL COLLEGE — OUTREACH DISPATCHER
+Sends templated SMS / email check-ins to a cohort of at-risk students (by default the alert board's
+Critical + High Risk active students) concurrently on one asyncio loop. Each channel has its own
+token-bucket rate limit, shared by every job sending through the same transport; a send that fails
+with TransientError is retried with exponential backoff (plus jitter), anything else fails that
+student only. Every delivered message becomes one
+intervention record ("SMS Sent" / "Email Sent"), written to records.py in batched transactions, with
+its own follow-up a week out, which replaces the student's earlier automated one; open follow-ups
+staff scheduled stay open.
+Delivery goes through a transport per channel: StubTransport (local outbox file, simulated latency
+and failures) for testing, SMTPTransport for a real or local debugging SMTP server. OutreachJob runs a
+dispatch on a background thread so the app page only polls its progress.
+The student dataset carries no phone numbers or e-mail addresses: CONTACTS resolves them (the stub
+derives placeholder addresses from the student ID; point it at the student information system).
+Run: python outreach.py [--channel SMS] [--levels Critical "High Risk"] [--staff NAME] [--fail-rate 0.05]
+"""
+
+import argparse, asyncio, json, os, random, smtplib, threading, time, uuid, weakref, zlib
+from datetime import date, timedelta
+from email.message import EmailMessage
+
+from records import DB_PATH, RecordStore
+
+# Channel → intervention type logged per send, messages / second, burst
+CHANNELS = {"SMS":   {"intervention": "SMS Sent",   "rate": 30.0, "burst": 30},
+            "Email": {"intervention": "Email Sent", "rate": 20.0, "burst": 20}}
+LEVELS      = ["Critical", "High Risk"]
+CONCURRENCY = 200        # sends in flight at once (the rate limits still apply)
+RETRIES     = 3
+BACKOFF     = 0.5        # seconds before the first retry, doubled for each further one
+FLUSH_ROWS  = 250        # intervention records per write transaction
+OUTBOX      = "outbox.jsonl"
+
+SUBJECT = "Gaborone Technical College — checking in"
+TEMPLATES = {
+    "SMS":   "GTC: Hi {student_id}, your {program} advisor would like to check in with you this week. "
+             "Please visit Student Support at {campus} or reply to this message. - {staff}",
+    "Email": "Dear student ({student_id}),\n\nWe would like to check in on how your {program} studies are "
+             "going. Student Support at {campus} can help with tutoring, transport and financial aid — "
+             "please book a meeting this week or reply to this e-mail.\n\nKind regards,\n{staff}\n"
+             "Gaborone Technical College",
+}
+
+
+class TransientError(Exception):
+    # Delivery failed in a way worth retrying (gateway busy, timeout, connection dropped)
+    pass
+
+
+def stub_contact(student_id, channel):
+    # Placeholder addresses until the student information system is wired in
+    if channel == "SMS":
+        return f"+267 7{zlib.crc32(student_id.encode()) % 10_000_000:07d}"
+    return f"{student_id.lower()}@students.gtc.ac.bw"
+
+
+CONTACTS = stub_contact
+
+
+def render(template, row, staff):
+    # KeyError for a placeholder the cohort rows do not have
+    return template.format_map({**row, "staff": staff})
+
+
+# ── RATE LIMIT ────────────────────────────────────────────────────
+class RateLimiter:
+    # Token bucket: `rate` sends per second on average, up to `burst` at once. Jobs run on their own
+    # threads and event loops, so the bucket sits behind a thread lock: each caller reserves the next
+    # token (the count goes negative while callers wait) and sleeps until it is due, in order.
+    def __init__(self, rate, burst):
+        self.rate, self.burst = rate, burst
+        self.tokens, self.t = float(burst), time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        # Seconds until this caller's token is due
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.t) * self.rate) - 1
+            self.t = now
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_limiters, _limiters_lock = weakref.WeakKeyDictionary(), threading.Lock()
+
+
+def channel_limiter(transport, channel, cfg):
+    # One bucket per channel per transport: concurrent jobs on a shared transport (the app caches its
+    # transports) split the channel's rate instead of each getting all of it
+    with _limiters_lock:
+        buckets = _limiters.setdefault(transport, {})
+        if channel not in buckets:
+            buckets[channel] = RateLimiter(cfg["rate"], cfg["burst"])
+        return buckets[channel]
+
+
+# ── TRANSPORTS ────────────────────────────────────────────────────
+class StubTransport:
+    # Local stand-in for the SMS gateway / mail server: appends each message to an outbox file
+    def __init__(self, outbox=OUTBOX, latency=0.05, fail_rate=0.0, seed=None):
+        self.outbox, self.latency, self.fail_rate = outbox, latency, fail_rate
+        self._rng = random.Random(seed)
+        self.sent = 0
+
+    async def send(self, channel, to, subject, body):
+        await asyncio.sleep(self.latency * (0.5 + self._rng.random()))
+        if self._rng.random() < self.fail_rate:
+            raise TransientError(f"{channel} gateway busy")
+        if self.outbox:
+            with open(self.outbox, "a") as f:
+                f.write(json.dumps({"channel": channel, "to": to, "subject": subject, "body": body,
+                                    "sent_at": time.time()}) + "\n")
+        self.sent += 1
+
+
+class SMTPTransport:
+    # E-mail through an SMTP server (e.g. a local debugging server); smtplib runs on worker threads
+    def __init__(self, host="127.0.0.1", port=1025, sender="studentsupport@gtc.ac.bw", timeout=10.0):
+        self.host, self.port, self.sender, self.timeout = host, port, sender, timeout
+
+    def _send(self, to, subject, body):
+        msg = EmailMessage()
+        msg["From"], msg["To"], msg["Subject"] = self.sender, to, subject
+        msg.set_content(body)
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as s:
+                s.send_message(msg)
+        except (OSError, smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+            raise TransientError(str(e)) from e
+        except smtplib.SMTPResponseException as e:
+            if 400 <= e.smtp_code < 500:          # 4xx: try again later
+                raise TransientError(str(e)) from e
+            raise
+
+    async def send(self, channel, to, subject, body):
+        await asyncio.to_thread(self._send, to, subject, body)
+
+
+# ── DISPATCH ──────────────────────────────────────────────────────
+class Dispatcher:
+    def __init__(self, transports, records, channels=CHANNELS, concurrency=CONCURRENCY,
+                 retries=RETRIES, backoff=BACKOFF, contacts=None):
+        self.transports, self.records, self.channels = transports, records, channels
+        self.concurrency, self.retries, self.backoff = concurrency, retries, backoff
+        self.contacts = contacts or CONTACTS
+        self.progress = {"total": 0, "sent": 0, "failed": 0, "retries": 0, "logged": 0, "errors": []}
+        self._pending = []
+
+    async def run(self, cohort, channel, staff, template=None, follow_up_days=7, batch=None):
+        # cohort: list of row dicts (student_id + the template's placeholders) → progress dict
+        cfg, transport = self.channels[channel], self.transports[channel]
+        template = template or TEMPLATES[channel]
+        batch = batch or uuid.uuid4().hex[:8]
+        limiter = channel_limiter(transport, channel, cfg)
+        gate = asyncio.Semaphore(self.concurrency)
+        follow_up = str(date.today() + timedelta(days=follow_up_days))
+        self.progress.update(total=len(cohort), channel=channel, batch=batch, started=time.time())
+
+        async def one(row):
+            body = render(template, row, staff)
+            to = self.contacts(row["student_id"], channel)
+            async with gate:
+                for attempt in range(self.retries + 1):
+                    await limiter.acquire()
+                    try:
+                        await transport.send(channel, to, SUBJECT, body)
+                        break
+                    except TransientError as e:
+                        if attempt == self.retries:
+                            return self._fail(row, e)
+                        self.progress["retries"] += 1
+                        await asyncio.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+                    except Exception as e:            # permanent: this student only
+                        return self._fail(row, e)
+            self.progress["sent"] += 1
+            self._pending.append({"student_id": row["student_id"], "date": str(date.today()),
+                                  "intervention": cfg["intervention"], "outcome": "No response yet",
+                                  "staff": staff, "follow_up": follow_up,
+                                  "notes": f"Outreach {batch} to {to}: {body[:200]}"})
+            if len(self._pending) >= FLUSH_ROWS:
+                await self._flush()
+
+        try:
+            await asyncio.gather(*(one(row) for row in cohort))
+        finally:
+            await self._flush()
+            self.progress["finished"] = time.time()
+        return self.progress
+
+    def _fail(self, row, error):
+        self.progress["failed"] += 1
+        self.progress["errors"] = (self.progress["errors"] + [f"{row['student_id']}: {error}"])[-20:]
+
+    async def _flush(self):
+        # One short transaction per FLUSH_ROWS records, on a worker thread so sends keep going meanwhile.
+        # The batch is taken before the await: a flush that starts while this one writes gets the next rows.
+        # Automated: closes the student's earlier outreach follow-up, never one a counselor scheduled.
+        if self._pending:
+            rows, self._pending = self._pending, []
+            await asyncio.to_thread(self.records.add_interventions, rows, automated=True)
+            self.progress["logged"] += len(rows)
+
+
+class OutreachJob:
+    # One dispatch on its own thread + event loop; the page reads .progress on each rerun
+    def __init__(self, dispatcher, cohort, channel, staff, template=None):
+        self.dispatcher, self.error = dispatcher, None
+        self.progress = dispatcher.progress
+        self.progress.update(total=len(cohort), channel=channel, staff=staff, started=time.time())
+        self._thread = threading.Thread(target=self._run, args=(cohort, channel, staff, template),
+                                        name=f"outreach-{channel}", daemon=True)
+        self._thread.start()
+
+    def _run(self, cohort, channel, staff, template):
+        try:
+            asyncio.run(self.dispatcher.run(cohort, channel, staff, template))
+        except Exception as e:
+            self.error = e
+            self.progress["finished"] = time.time()
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def eta(self):
+        # Seconds left at the channel's rate limit
+        p = self.progress
+        left = p["total"] - p["sent"] - p["failed"]
+        return left / self.dispatcher.channels[p["channel"]]["rate"]
+
+
+def transports_from_env(environ=None):
+    # OUTREACH_SMTP=host:port sends e-mail through that server; everything else goes to the stub outbox
+    environ = os.environ if environ is None else environ
+    stub = StubTransport(environ.get("OUTREACH_OUTBOX", OUTBOX))
+    smtp = environ.get("OUTREACH_SMTP")
+    if smtp:
+        host, _, port = smtp.partition(":")
+        return {"SMS": stub, "Email": SMTPTransport(host, int(port or 25))}
+    return {"SMS": stub, "Email": stub}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Send a templated check-in to the at-risk cohort")
+    ap.add_argument("--channel",   default="SMS", choices=list(CHANNELS))
+    ap.add_argument("--levels",    nargs="+", default=LEVELS)
+    ap.add_argument("--staff",     default="Student Support")
+    ap.add_argument("--limit",     type=int, default=0, help="first N students of the cohort only")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="stub transport: share of transient failures")
+    ap.add_argument("--rate",      type=float, default=0.0, help="override the channel's messages / second")
+    ap.add_argument("--db",        default=DB_PATH)
+    args = ap.parse_args()
+
+    import pages, store
+    cohort = pages.outreach_cohort(store.load(columns=["student_id", "status", "program", "campus", "risk_level",
+                                                       "dropout_probability"]), args.levels)
+    cohort = cohort.head(args.limit) if args.limit else cohort
+    channels = {k: dict(v, rate=args.rate or v["rate"], burst=int(args.rate or v["burst"])) for k, v in CHANNELS.items()}
+    stub = StubTransport(fail_rate=args.fail_rate)
+    dispatcher = Dispatcher({"SMS": stub, "Email": stub}, RecordStore(args.db), channels)
+    job = OutreachJob(dispatcher, cohort.to_dict("records"), args.channel, args.staff)
+    while not job.done:
+        p = job.progress
+        print(f"\r{p['sent']:,} sent · {p['failed']:,} failed · {p['retries']:,} retries / {p['total']:,} "
+              f"(~{job.eta():.0f}s left)", end="", flush=True)
+        time.sleep(0.5)
+    p = job.progress
+    print(f"\r{p['sent']:,} sent · {p['failed']:,} failed · {p['retries']:,} retries · {p['logged']:,} interventions "
+          f"logged in {p['finished'] - p['started']:.1f}s → {stub.outbox}")
+    if job.error:
+        raise job.error
@@ -0,0 +1,223 @@
+"""
+GABORONE TECHNICAL COLLEGE — PAGE COMPUTATIONS
+The data behind every chart, table and KPI in both Streamlit apps, as pure functions (frames in,
+frames / dicts out, no st.* calls), so each one can be timed on its own by bench_pages.py.
+Each is an ops span, so page reruns also report where their time went.
+Dashboard functions take a metrics-cube slice (cube.select); management-system functions take the
+student frame the page already loaded.
+"""
+
+import pandas as pd
+
+import cube
+import export
+from ops import timed
+
+URGENT_LEVELS = ["Critical", "High Risk"]
+
+# Student lists keep these as numbers; the table renders them as "80%", exports format per chunk
+PCT_COLUMNS = ["Attendance", "Avg Grade"]
+
+
+def _pct(s):
+    return export.percent(s)
+
+def _label(s):
+    # f"{x}%" for the one-decimal rates, vectorized
+    return s.astype(str) + "%"
+
+
+# ════════════════════════════════════════════════════════════════
+# DASHBOARD (03_dashboard.py) — answered from the cube
+# ════════════════════════════════════════════════════════════════
+@timed
+def status_breakdown(cf):
+    # Chart 1
+    s = cube.status_counts(cf).reset_index()
+    s.columns = ["Status", "Count"]
+    return s
+
+@timed
+def grade_by_status(cf):
+    # Chart 2
+    g = cube.grade_by_status(cf).sort_values("grade_average_pct", ascending=False)
+    g["label"] = _pct(g["grade_average_pct"])
+    return g
+
+@timed
+def risk_distribution(cf):
+    # Chart 3 (and the At-Risk page KPI cards)
+    return cube.risk_counts(cf)
+
+@timed
+def warning_signs(cf):
+    # Chart 4
+    return cube.warning_signs(cf)
+
+@timed
+def program_dropout(cf):
+    # Chart 5
+    pg = cube.program_dropout(cf).sort_values("Dropout Rate %", ascending=True)
+    pg["label"] = _label(pg["Dropout Rate %"])
+    return pg
+
+@timed
+def attendance_outcome(cf):
+    # Chart 6
+    return cube.attendance_outcome(cf)
+
+@timed
+def enrollment_trend(cf):
+    # Chart 7 (and the per-year KPI cards)
+    return cube.enrollment_by_year(cf)
+
+def year_enrollments(yr_enr, year):
+    hit = yr_enr.loc[yr_enr["year_enrolled"] == year, "Enrollments"]
+    return hit.iloc[0] if len(hit) else 0
+
+@timed
+def source_counts(cf):
+    # Chart 8
+    return cube.source_counts(cf)
+
+@timed
+def source_effectiveness(cf):
+    # Chart 9
+    return cube.source_performance(cf).sort_values("Enrollments", ascending=False)
+
+@timed
+def campus_dropout(cf):
+    # Chart 10
+    camp = cube.campus_performance(cf).sort_values("Dropout_Rate", ascending=True)
+    camp["label"] = _label(camp["Dropout_Rate"])
+    return camp
+
+@timed
+def campus_size(cf):
+    # Chart 11 (and the Campus Performance KPI cards)
+    return cube.campus_performance(cf)
+
+def campus_extremes(camp):
+    ranked = camp.sort_values("Dropout_Rate")
+    return ranked.iloc[0], ranked.iloc[-1]
+
+@timed
+def program_table(cf):
+    ps = cube.program_summary(cf)
+    ps["Avg_Attendance"] = _pct(ps["Avg_Attendance"])
+    ps["Avg_Grade"]      = _pct(ps["Avg_Grade"])
+    ps.columns = ["Program", "Total", "Graduated", "Dropped", "Avg Attendance", "Avg Grade", "Grad Rate %", "Drop Rate %"]
+    return ps.reset_index(drop=True)
+
+@timed
+def campus_table(camp):
+    show = camp.copy()
+    show["Avg_Attendance"] = _pct(show["Avg_Attendance"])
+    show["Avg_Grade"]      = _pct(show["Avg_Grade"])
+    show.columns = ["Campus", "Students", "Dropout Rate %", "Avg Attendance", "Avg Grade"]
+    return show.reset_index(drop=True)
+
+@timed
+def urgent_students(dff):
+    # At-Risk page: active Critical / High Risk students, most likely to drop out first
+    active = dff[dff["status"] == "Active"]
+    if "risk_level" not in active.columns:
+        return pd.DataFrame()
+    urgent = active[active["risk_level"].isin(URGENT_LEVELS)]
+    if not len(urgent):
+        return pd.DataFrame()
+    urgent = urgent.sort_values("dropout_probability" if "dropout_probability" in urgent.columns else "at_risk",
+                                ascending=False)
+    show = urgent[["student_id", "program", "campus", "attendance_rate_pct", "grade_average_pct",
+                   "courses_failed", "warnings_issued", "risk_level"]]
+    show.columns = ["Student ID", "Program", "Campus", "Attendance", "Avg Grade", "Failed Courses", "Warnings", "Risk"]
+    return show.reset_index(drop=True)
+
+# Chart number → computation (bench_pages.py times each one)
+DASHBOARD_CHARTS = {
+    "chart01_status":        status_breakdown,
+    "chart02_grade":         grade_by_status,
+    "chart03_risk":          risk_distribution,
+    "chart04_warning_signs": warning_signs,
+    "chart05_program":       program_dropout,
+    "chart06_attendance":    attendance_outcome,
+    "chart07_enrollment":    enrollment_trend,
+    "chart08_source":        source_counts,
+    "chart09_source_perf":   source_effectiveness,
+    "chart10_campus":        campus_dropout,
+    "chart11_campus_size":   campus_size,
+}
+
+
+# ════════════════════════════════════════════════════════════════
+# MANAGEMENT SYSTEM (04_software.py) — answered from the student frame
+# ════════════════════════════════════════════════════════════════
+@timed
+def sidebar_counts(df):
+    active = df["status"] == "Active"
+    return {"active": int(active.sum()), "at_risk": int((active & (df["at_risk"] == 1)).sum())}
+
+@timed
+def alert_counts(df):
+    active = df[df["status"] == "Active"]
+    if "risk_level" in active.columns and not active["risk_level"].isna().all():
+        return active["risk_level"].value_counts()
+    return pd.Series(dtype=int)
+
+def _priority_rows(rows):
+    has_risk = "risk_level" in rows.columns
+    show = rows[["student_id", "program", "campus", "attendance_rate_pct", "grade_average_pct",
+                 "courses_failed", "warnings_issued"] + (["risk_level"] if has_risk else [])]
+    show.columns = ["Student ID", "Program", "Campus", "Attendance", "Avg Grade", "Failed Courses", "Warnings"] + (["Risk"] if has_risk else [])
+    return show.reset_index(drop=True)
+
+@timed
+def priority_list(df):
+    # Alert board: every active at-risk student, highest dropout probability first
+    active = df[df["status"] == "Active"]
+    urgent = active[active["at_risk"] == 1] if "at_risk" in active.columns else pd.DataFrame()
+    if not len(urgent):
+        return pd.DataFrame()
+    by_prob = "dropout_probability" in urgent.columns
+    urgent = urgent.sort_values("dropout_probability" if by_prob else "attendance_rate_pct", ascending=not by_prob)
+    return _priority_rows(urgent)
+
+@timed
+def priority_page(df, board, start=0, k=200, campus=None, program=None):
+    # Alert board from the priority index (priority.py): entries start..start+k only
+    return _priority_rows(df.iloc[board.page(start, k, campus, program)])
+
+@timed
+def priority_all(df, board, campus=None, program=None):
+    # Whole board in order (downloads)
+    return _priority_rows(df.iloc[board.ordered(campus, program)])
+
+@timed
+def outreach_cohort(df, levels):
+    # Outreach: active students at the given risk levels, highest dropout probability first
+    cohort = df[(df["status"] == "Active") & df["risk_level"].isin(levels)]
+    if "dropout_probability" in cohort.columns:
+        cohort = cohort.sort_values("dropout_probability", ascending=False)
+    cols = [c for c in ["student_id", "program", "campus", "risk_level", "dropout_probability"] if c in cohort.columns]
+    return cohort[cols].astype({c: object for c in cols if c != "dropout_probability"}).reset_index(drop=True)
+
+@timed
+def lookup_matches(df, index, query, k=20, status=None):
+    # Check Student Record / Log Intervention: typeahead candidates for the select box. With `status`,
+    # a wider search is filtered down to students with that status (never a scan of the table)
+    hits = df.iloc[index.search(query, k=k if status is None else 5 * k)]
+    if status is not None:
+        hits = hits[hits["status"] == status]
+    return hits["student_id"].head(k).tolist()
+
+@timed
+def student_record(df, index, student_id):
+    return df.iloc[index.get(student_id)]
+
+@timed
+def registration_queue(records, keys, index, query, after=0, k=50):
+    # Registration Queue: the next k registrations after seq `after` (keyset page), or the top-k search
+    # hits in rank order. keys / index: reg_ids and their StudentIndex, built once per new registration
+    if not query:
+        return records.registration_page(after, k)
+    return records.registrations_by_id(keys[index.search(query, k=k)].tolist())
@@ -0,0 +1,51 @@
+"""
+GABORONE TECHNICAL COLLEGE — PERFORMANCE HELPERS
+Small timing / memory helpers shared by the batch jobs and benchmark scripts.
+"""
+
+import os, sys, time
+
+try:
+    import resource
+except ImportError:          # Windows
+    resource = None
+
+
+def rss_mb():
+    # Current resident set size of this process
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+def pss_mb():
+    # Proportional set size: pages shared with other processes count 1/k each (Linux; else RSS)
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return rss_mb()
+
+
+def peak_rss_mb(children=False):
+    # Peak resident set size (optionally of finished child processes, e.g. pool workers)
+    if resource is None:
+        return float("nan")
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    kb = resource.getrusage(who).ru_maxrss
+    return kb / 1e6 if sys.platform == "darwin" else kb / 1e3
+
+
+class Timer:
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.t0
@@ -0,0 +1,158 @@
+"""
+GABORONE TECHNICAL COLLEGE — ALERT BOARD PRIORITY INDEX
+Keeps the At-Risk Alert Board's order instead of re-sorting on every page load. Active at-risk
+students are held per (campus, program) in arrays sorted by dropout probability (highest first), then
+attendance (lowest first), then row position. The board is built once per dataset version.
+When the change feed rescores students, each one is moved within its group: O(log n) to find it
+plus an array shift; a student whose at_risk flips joins or leaves the board the same way. A large
+batch re-sorts only the groups it touches.
+A page of the board is a lazy k-way merge of the selected groups, so rows start..start+k cost
+O((start + k) log groups) however long the list is; "load more" asks for the next page.
+"""
+
+import heapq, itertools, threading
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ["student_id", "status", "at_risk", "campus", "program", "dropout_probability", "attendance_rate_pct"]
+RESORT_MOVES = 16          # a group with more changed rows than this re-sorts instead (each move shifts the arrays)
+
+
+class _Group:
+    # One (campus, program): row positions with their keys, in board order
+    def __init__(self, pos, prob, att):
+        order = np.lexsort((pos, att, -prob))
+        self.pos, self.neg_prob, self.att = pos[order], -prob[order], att[order]
+
+    def __len__(self):
+        return len(self.pos)
+
+    def _find(self, neg_prob, att, pos):
+        lo, hi = np.searchsorted(self.neg_prob, neg_prob, "left"), np.searchsorted(self.neg_prob, neg_prob, "right")
+        lo, hi = lo + np.searchsorted(self.att[lo:hi], att, "left"), lo + np.searchsorted(self.att[lo:hi], att, "right")
+        return lo + np.searchsorted(self.pos[lo:hi], pos)
+
+    def remove(self, pos, key):
+        i = self._find(-key[0], key[1], pos)
+        self.pos, self.neg_prob, self.att = (np.delete(a, i) for a in (self.pos, self.neg_prob, self.att))
+
+    def insert(self, pos, key):
+        j = self._find(-key[0], key[1], pos)
+        self.pos, self.neg_prob, self.att = (np.insert(a, j, v) for a, v in
+                                             zip((self.pos, self.neg_prob, self.att), (pos, -key[0], key[1])))
+
+    def resort(self, prob, att, leave=(), join=()):
+        # prob / att: the board's full-length key arrays; leave / join: positions dropping off / joining
+        pos = self.pos[~np.isin(self.pos, leave)] if len(leave) else self.pos
+        pos = np.concatenate([pos, join]).astype(np.int64) if len(join) else pos
+        self.__init__(pos, prob[pos], att[pos])
+
+    def keyed(self, chunk=256):
+        # (key, position) pairs in board order for heapq.merge, converted a chunk at a time as it is consumed
+        pos, neg_prob, att = self.pos, self.neg_prob, self.att
+        for s in range(0, len(pos), chunk):
+            p = pos[s:s + chunk].tolist()
+            yield from zip(zip(neg_prob[s:s + chunk].tolist(), att[s:s + chunk].tolist(), p), p)
+
+
+class PriorityBoard:
+    def __init__(self, df):
+        # df: the snapshot frame (KEY_COLUMNS); positions are its row positions
+        self.on = ((df["status"] == "Active") & (df["at_risk"] == 1)).to_numpy(copy=True)
+        self.n = int(self.on.sum())
+        self.prob = df["dropout_probability"].to_numpy(np.float64, copy=True)
+        self.att = df["attendance_rate_pct"].to_numpy(np.float64, copy=True)
+        self.ids = pd.Index(df["student_id"])
+        # Every row's (campus, program) group, so a student who becomes at risk can join theirs
+        campus, program = (pd.Categorical(df[c]) for c in ["campus", "program"])
+        n_prog = len(program.categories)
+        gid = campus.codes.astype(np.int64) * n_prog + program.codes
+        uniq, self.group_of = np.unique(gid, return_inverse=True)            # row → index into self._keys
+        self.group_of = self.group_of.astype(np.int32)
+        self._keys = [(str(campus.categories[c]), str(program.categories[p])) for c, p in
+                      (divmod(int(u), n_prog) for u in uniq)]
+        # Board rows by group: one stable sort, then contiguous slices
+        pos = np.flatnonzero(self.on)
+        g = self.group_of[pos]
+        order = np.argsort(g, kind="stable")
+        pos, g = pos[order], g[order]
+        bounds = np.searchsorted(g, np.arange(len(self._keys) + 1))
+        self.groups = {key: _Group(pos[s:e], self.prob[pos[s:e]], self.att[pos[s:e]])
+                       for key, s, e in zip(self._keys, bounds[:-1], bounds[1:])}
+        self.watermark = 0.0                                      # newest overlay scored_at applied
+        self._lock = threading.Lock()
+
+    # ── UPDATES ───────────────────────────────────────────────────
+    def update(self, positions, prob, att, at_risk=None):
+        # New keys for some rows (any rows: students not on the board are just recorded); at_risk, when
+        # given, moves students on to / off the board (it already implies an active status)
+        positions = np.asarray(positions, dtype=np.int64)
+        prob, att = np.asarray(prob, np.float64), np.asarray(att, np.float64)
+        on = self.on[positions] if at_risk is None else np.asarray(at_risk) == 1
+        _, last = np.unique(positions[::-1], return_index=True)      # a row updated twice: its last values
+        last = len(positions) - 1 - last
+        positions, prob, att, on = positions[last], prob[last], att[last], on[last]
+        with self._lock:
+            old_prob, old_att, was_on = self.prob[positions], self.att[positions], self.on[positions]
+            changed = ((old_prob != prob) | (old_att != att) | (was_on != on)) & (was_on | on)
+            self.prob[positions], self.att[positions] = prob, att          # off-board rows: just recorded
+            positions, prob, att, on = positions[changed], prob[changed], att[changed], on[changed]
+            old_prob, old_att, was_on = old_prob[changed], old_att[changed], was_on[changed]
+            self.on[positions] = on
+            self.n += int(on.sum()) - int(was_on.sum())
+            groups = self.group_of[positions]
+            for g in np.unique(groups):
+                group, mine = self.groups[self._keys[g]], np.flatnonzero(groups == g)
+                if len(mine) > RESORT_MOVES:
+                    group.resort(self.prob, self.att, positions[mine][was_on[mine] & ~on[mine]],
+                                 positions[mine][on[mine] & ~was_on[mine]])
+                    continue
+                for i in mine:
+                    if was_on[i]:
+                        group.remove(positions[i], (old_prob[i], old_att[i]))
+                    if on[i]:
+                        group.insert(positions[i], (prob[i], att[i]))
+        return int(changed.sum())
+
+    def sync(self, overlay):
+        # Apply the change-feed overlay rows scored since the last sync
+        fresh = overlay[overlay["scored_at"] > self.watermark] if len(overlay) else overlay
+        if not len(fresh):
+            return 0
+        pos = self.ids.get_indexer(fresh["student_id"])
+        hit = pos >= 0
+        at_risk = fresh["at_risk"].to_numpy()[hit] if "at_risk" in fresh.columns else None
+        moved = self.update(pos[hit], fresh["dropout_probability"].to_numpy()[hit],
+                            fresh["attendance_rate_pct"].to_numpy()[hit], at_risk)
+        self.watermark = max(self.watermark, float(fresh["scored_at"].max()))
+        return moved
+
+    # ── READS ─────────────────────────────────────────────────────
+    def _selected(self, campus=None, program=None):
+        return [g for (c, p), g in self.groups.items()
+                if len(g) and (campus is None or c == campus) and (program is None or p == program)]
+
+    def count(self, campus=None, program=None):
+        return sum(len(g) for g in self._selected(campus, program))
+
+    def page(self, start=0, k=200, campus=None, program=None):
+        # Row positions of board entries start..start+k, in board order
+        with self._lock:
+            merged = heapq.merge(*(g.keyed() for g in self._selected(campus, program)))
+            return np.fromiter((pos for _, pos in itertools.islice(merged, start, start + k)), dtype=np.int64)
+
+    def ordered(self, campus=None, program=None):
+        # Every position in board order (exports), one vectorized sort of the selected groups
+        with self._lock:
+            groups = self._selected(campus, program)
+            if not groups:
+                return np.empty(0, dtype=np.int64)
+            pos = np.concatenate([g.pos for g in groups])
+            return pos[np.lexsort((pos, self.att[pos], -self.prob[pos]))]
+
+    def campuses(self):
+        return sorted({c for (c, _), g in self.groups.items() if len(g)})
+
+    def programs(self, campus=None):
+        return sorted({p for (c, p), g in self.groups.items() if len(g) and (campus is None or c == campus)})
@@ -0,0 +1,134 @@
+"""
+GABORONE TECHNICAL COLLEGE — RERUN PROFILER
+Wraps one Streamlit rerun in a profiler (started / stopped by ops.Run, so it is only imported when
+switched on): ?profile=sample or ?profile=cprofile on the URL profiles that one rerun; GTC_PROFILE=
+sample|cprofile in the environment profiles every rerun of that server.
+  sample   — a background thread records the script thread's stack every ~2 ms; writes folded stacks
+             (profiles/<app>-<page>-<time>.folded) for flamegraph.pl / speedscope / inferno.
+  cprofile — deterministic cProfile of the script thread; writes a .prof (pstats) for snakeviz /
+             flameprof / gprof2dot.
+Both report the top-N hotspots (self and total time per function) shown under the page.
+"""
+
+import cProfile, os, pstats, re, sys, threading, time
+from collections import Counter
+
+import pandas as pd
+
+PROFILE_DIR = "profiles"
+TOP_N = 25
+SAMPLE_INTERVAL = 0.002
+MAX_SECONDS = 120        # a rerun cut short by st.stop never calls stop(); the sampler gives up on its own
+MODES = ("sample", "cprofile")
+
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "rerun"
+
+
+class SamplingProfiler:
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.get_ident()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="rerun-profiler", daemon=True)
+
+    def start(self):
+        self.t0 = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        deadline = time.perf_counter() + MAX_SECONDS
+        while not self._done.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self.t0
+
+    def save(self, path):
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+    def hotspots(self, n=TOP_N):
+        total = sum(self.stacks.values())
+        if not total:
+            return pd.DataFrame(columns=["function", "self_ms", "total_ms", "samples"])
+        per_sample = self.seconds * 1e3 / total
+        own, incl = Counter(), Counter()
+        for stack, k in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += k
+            for fn in set(frames):
+                incl[fn] += k
+        df = pd.DataFrame({"function": list(incl), "samples": list(incl.values())})
+        df["self_ms"] = df["function"].map(own).fillna(0) * per_sample
+        df["total_ms"] = df["samples"] * per_sample
+        return df.sort_values(["self_ms", "total_ms"], ascending=False).head(n)[["function", "self_ms", "total_ms", "samples"]]
+
+
+class DeterministicProfiler:
+    def __init__(self):
+        self.prof = cProfile.Profile()
+
+    def start(self):
+        self.t0 = time.perf_counter()
+        self.prof.enable()
+        return self
+
+    def stop(self):
+        self.prof.disable()
+        self.seconds = time.perf_counter() - self.t0
+
+    def save(self, path):
+        self.prof.dump_stats(path)
+
+    def hotspots(self, n=TOP_N):
+        stats = pstats.Stats(self.prof).stats
+        rows = [{"function": f"{name} ({os.path.basename(file)}:{line})", "self_ms": tt * 1e3, "total_ms": ct * 1e3,
+                 "calls": nc} for (file, line, name), (cc, nc, tt, ct, callers) in stats.items()]
+        df = pd.DataFrame(rows, columns=["function", "self_ms", "total_ms", "calls"])
+        return df.sort_values(["self_ms", "total_ms"], ascending=False).head(n)
+
+
+class Profile:
+    # One profiled rerun: start() at the top of the script, finish() at the end
+    def __init__(self, mode, app):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r} (use {' / '.join(MODES)})")
+        self.mode, self.app, self.path = mode, app, None
+        self.impl = SamplingProfiler() if mode == "sample" else DeterministicProfiler()
+
+    def start(self):
+        self.impl.start()
+        return self
+
+    def finish(self, page, directory=PROFILE_DIR):
+        self.impl.stop()
+        os.makedirs(directory, exist_ok=True)
+        ext = "folded" if self.mode == "sample" else "prof"
+        self.path = os.path.join(directory, f"{_slug(self.app)}-{_slug(page)}-{time.strftime('%Y%m%d-%H%M%S')}.{ext}")
+        self.impl.save(self.path)
+        return self.path
+
+    @property
+    def seconds(self):
+        return self.impl.seconds
+
+    def hotspots(self, n=TOP_N):
+        return self.impl.hotspots(n)
@@ -0,0 +1,261 @@
+"""
+GABORONE TECHNICAL COLLEGE — REGISTRATION & INTERVENTION RECORDS
+Durable store behind the Registration Queue and intervention log, shared by every officer's session.
+SQLite in WAL mode: readers never block the writer, concurrent writers queue on a busy timeout.
+Indexed on student_id, reg_id, status, Omang and follow-up date so pages read with indexed queries;
+the Registration Queue reads one keyset page (seq > last seen, LIMIT n) at a time.
+Open follow-ups live in their own table with partial B-tree indexes on (due) and (staff, due) over the
+open rows only: logging or closing one is O(log n), a "due by today" board or a staff worklist reads the
+first k index entries, and neither ever touches the intervention history.
+Follow-ups opened by automated sends (outreach) are marked auto: a later send closes only those, so
+they never pile up, and a counselor's follow-up stays open until staff log something themselves.
+"""
+
+import sqlite3, threading, time
+
+import pandas as pd
+
+DB_PATH = "student_records.db"
+
+REG_FIELDS = ["date", "student_name", "omang", "age", "gender", "phone", "campus", "program", "year",
+              "semester", "source", "risk_level", "risk_score", "officer", "notes", "status"]
+INT_FIELDS = ["student_id", "date", "intervention", "outcome", "staff", "follow_up", "notes"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS registrations (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+    reg_id       TEXT UNIQUE,
+    date         TEXT,
+    student_name TEXT,
+    omang        TEXT,
+    age          INTEGER,
+    gender       TEXT,
+    phone        TEXT,
+    campus       TEXT,
+    program      TEXT,
+    year         INTEGER,
+    semester     TEXT,
+    source       TEXT,
+    risk_level   TEXT,
+    risk_score   TEXT,
+    officer      TEXT,
+    notes        TEXT,
+    status       TEXT NOT NULL DEFAULT 'Pending Approval',
+    updated_at   REAL
+);
+CREATE INDEX IF NOT EXISTS ix_registrations_status ON registrations(status);
+CREATE INDEX IF NOT EXISTS ix_registrations_omang  ON registrations(omang);
+
+CREATE TABLE IF NOT EXISTS interventions (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id   TEXT NOT NULL,
+    date         TEXT,
+    intervention TEXT,
+    outcome      TEXT,
+    staff        TEXT,
+    follow_up    TEXT,
+    notes        TEXT,
+    created_at   REAL
+);
+CREATE INDEX IF NOT EXISTS ix_interventions_student   ON interventions(student_id, id);
+CREATE INDEX IF NOT EXISTS ix_interventions_follow_up ON interventions(follow_up);
+
+CREATE TABLE IF NOT EXISTS follow_ups (
+    id           INTEGER PRIMARY KEY,          -- the intervention that set it
+    student_id   TEXT NOT NULL,
+    staff        TEXT,
+    due          TEXT NOT NULL,                -- ISO date, so text order is date order
+    done_at      REAL,
+    auto         INTEGER NOT NULL DEFAULT 0    -- opened by an automated send
+);
+CREATE INDEX IF NOT EXISTS ix_follow_ups_due     ON follow_ups(due, id)        WHERE done_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_follow_ups_staff   ON follow_ups(staff, due, id) WHERE done_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_follow_ups_student ON follow_ups(student_id)     WHERE done_at IS NULL;
+"""
+
+# Databases from before the follow_ups table: each student's latest intervention opens their follow-up
+BACKFILL = """
+INSERT INTO follow_ups (id, student_id, staff, due)
+SELECT id, student_id, staff, follow_up FROM interventions i
+WHERE follow_up > '' AND id = (SELECT MAX(id) FROM interventions WHERE student_id = i.student_id)
+"""
+
+# Databases from before follow_ups.auto: outreach sends are the ones whose notes start "Outreach <batch>"
+ADD_AUTO = """
+ALTER TABLE follow_ups ADD COLUMN auto INTEGER NOT NULL DEFAULT 0;
+UPDATE follow_ups SET auto = 1 WHERE id IN (SELECT id FROM interventions WHERE notes LIKE 'Outreach %');
+"""
+
+FOLLOW_UP_COLS = ("f.id, f.student_id, f.due, f.staff, i.date, i.intervention, i.outcome, i.notes "
+                  "FROM follow_ups f JOIN interventions i ON i.id = f.id")
+
+
+class RecordStore:
+    def __init__(self, path=DB_PATH, timeout=10.0):
+        self.path, self.timeout = path, timeout
+        self._local = threading.local()
+        with self.conn() as c:
+            new = not c.execute("SELECT 1 FROM sqlite_master WHERE name = 'follow_ups'").fetchone()
+            c.executescript(SCHEMA)
+            if new:
+                c.execute(BACKFILL)
+            elif "auto" not in {r["name"] for r in c.execute("PRAGMA table_info(follow_ups)")}:
+                c.executescript(ADD_AUTO)
+
+    def conn(self):
+        # One connection per thread (Streamlit runs each session's reruns on its own thread)
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=self.timeout)
+            c.row_factory = sqlite3.Row
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+        return c
+
+    def _rows(self, sql, args=()):
+        return [dict(r) for r in self.conn().execute(sql, args)]
+
+    def _frames(self, sql, args=(), chunk_rows=50_000):
+        # Result as an iterator of DataFrame chunks (exports never hold the whole table)
+        return pd.read_sql_query(sql, self.conn(), params=args, chunksize=chunk_rows)
+
+    # ── REGISTRATIONS ─────────────────────────────────────────────
+    def add_registration(self, reg):
+        c = self.conn()
+        with c:
+            cur = c.execute(f"INSERT INTO registrations ({', '.join(REG_FIELDS)}, updated_at) "
+                            f"VALUES ({', '.join('?' * len(REG_FIELDS))}, ?)",
+                            [reg.get(f, "Pending Approval" if f == "status" else None) for f in REG_FIELDS] + [time.time()])
+            reg_id = f"REG-{cur.lastrowid:04d}"
+            c.execute("UPDATE registrations SET reg_id = ? WHERE seq = ?", (reg_id, cur.lastrowid))
+        return reg_id
+
+    def add_registrations(self, regs):
+        # Bulk import: every row in one transaction, so the whole file lands in the queue or none of it does
+        now = time.time()
+        rows = [[reg.get(f, "Pending Approval" if f == "status" else None) for f in REG_FIELDS] + [now] for reg in regs]
+        c = self.conn()
+        with c:
+            c.executemany(f"INSERT INTO registrations ({', '.join(REG_FIELDS)}, updated_at) "
+                          f"VALUES ({', '.join('?' * len(REG_FIELDS))}, ?)", rows)
+            # Holding the write lock: the only rows without a reg_id are the ones just inserted
+            seqs = [r[0] for r in c.execute("SELECT seq FROM registrations WHERE reg_id IS NULL ORDER BY seq")]
+            c.execute("UPDATE registrations SET reg_id = printf('REG-%04d', seq) WHERE reg_id IS NULL")
+        return [f"REG-{s:04d}" for s in seqs]
+
+    def registration_page(self, after=0, limit=50):
+        # Keyset page: the next `limit` registrations after seq `after` (a primary-key range scan, however deep)
+        return self._rows(f"SELECT seq, reg_id, {', '.join(REG_FIELDS)} FROM registrations "
+                          f"WHERE seq > ? ORDER BY seq LIMIT ?", (after, limit))
+
+    def registrations_by_id(self, reg_ids):
+        # Rows for the given reg_ids, in that order (search hits)
+        if not len(reg_ids):
+            return []
+        rows = {r["reg_id"]: r for r in self._rows(
+            f"SELECT seq, reg_id, {', '.join(REG_FIELDS)} FROM registrations "
+            f"WHERE reg_id IN ({', '.join('?' * len(reg_ids))})", list(reg_ids))}
+        return [rows[i] for i in reg_ids if i in rows]
+
+    def registration_keys(self):
+        # reg_id / name / Omang of every registration (the queue's search index is built from these)
+        return pd.read_sql_query("SELECT reg_id, student_name, omang FROM registrations ORDER BY seq", self.conn())
+
+    def last_registration(self):
+        # Highest seq so far: changes exactly when registrations are added
+        return self.conn().execute("SELECT COALESCE(MAX(seq), 0) FROM registrations").fetchone()[0]
+
+    def queued_omangs(self, omangs, chunk=500):
+        # Omang → reg_id for those already in the queue (declined applications may apply again)
+        omangs, found = list(dict.fromkeys(omangs)), {}
+        for i in range(0, len(omangs), chunk):
+            part = omangs[i:i + chunk]
+            found.update((r["omang"], r["reg_id"]) for r in self._rows(
+                f"SELECT omang, MIN(reg_id) AS reg_id FROM registrations WHERE status != 'Declined' "
+                f"AND omang IN ({', '.join('?' * len(part))}) GROUP BY omang", part))
+        return found
+
+    def registration_frames(self, chunk_rows=50_000):
+        return self._frames(f"SELECT reg_id, {', '.join(REG_FIELDS)} FROM registrations ORDER BY seq", chunk_rows=chunk_rows)
+
+    def registration_counts(self):
+        return {r["status"]: r["n"] for r in self._rows("SELECT status, COUNT(*) AS n FROM registrations GROUP BY status")}
+
+    def set_registration_status(self, reg_id, status):
+        c = self.conn()
+        with c:
+            c.execute("UPDATE registrations SET status = ?, updated_at = ? WHERE reg_id = ?", (status, time.time(), reg_id))
+
+    # ── INTERVENTIONS ─────────────────────────────────────────────
+    def add_intervention(self, rec):
+        return self.add_interventions([rec])[0]
+
+    def add_interventions(self, recs, automated=False):
+        # One transaction for the batch (outreach logs its sends this way). A new intervention is the
+        # student's follow-up: it closes their open one and opens its own if it sets a date.
+        # automated=True (outreach sends) closes only earlier automated follow-ups and marks its own.
+        close = "UPDATE follow_ups SET done_at = ? WHERE student_id = ? AND done_at IS NULL" + \
+                (" AND auto = 1" if automated else "")
+        now = time.time()
+        c = self.conn()
+        ids = []
+        with c:
+            for rec in recs:
+                cur = c.execute(f"INSERT INTO interventions ({', '.join(INT_FIELDS)}, created_at) "
+                                f"VALUES ({', '.join('?' * len(INT_FIELDS))}, ?)",
+                                [rec.get(f) for f in INT_FIELDS] + [now])
+                ids.append(cur.lastrowid)
+                c.execute(close, (now, rec["student_id"]))
+                if rec.get("follow_up"):
+                    c.execute("INSERT INTO follow_ups (id, student_id, staff, due, auto) VALUES (?, ?, ?, ?, ?)",
+                              (cur.lastrowid, rec["student_id"], rec.get("staff"), rec["follow_up"], int(automated)))
+        return ids
+
+    def interventions(self, student_id=None, limit=None):
+        cols = ", ".join(INT_FIELDS)
+        lim = f" LIMIT {int(limit)}" if limit else ""
+        if student_id is None:
+            return self._rows(f"SELECT {cols} FROM interventions ORDER BY id DESC{lim}")
+        return self._rows(f"SELECT {cols} FROM interventions WHERE student_id = ? ORDER BY id DESC{lim}", (student_id,))
+
+    def intervention_frames(self, chunk_rows=50_000):
+        return self._frames(f"SELECT {', '.join(INT_FIELDS)} FROM interventions ORDER BY id DESC", chunk_rows=chunk_rows)
+
+    def intervention_count(self):
+        return self.conn().execute("SELECT COUNT(*) FROM interventions").fetchone()[0]
+
+    # ── FOLLOW-UPS ────────────────────────────────────────────────
+    def due_follow_ups(self, by, staff=None, limit=100):
+        # Open follow-ups due on or before `by` (ISO date), oldest first: the first `limit` index entries
+        if staff is None:
+            return self._rows(f"SELECT {FOLLOW_UP_COLS} WHERE f.done_at IS NULL AND f.due <= ? "
+                              f"ORDER BY f.due, f.id LIMIT ?", (by, limit))
+        return self._rows(f"SELECT {FOLLOW_UP_COLS} WHERE f.done_at IS NULL AND f.staff = ? AND f.due <= ? "
+                          f"ORDER BY f.due, f.id LIMIT ?", (staff, by, limit))
+
+    def follow_up_counts(self, today, staff=None):
+        # Overdue / due today / open: range counts over the open-rows index (index only, no table reads)
+        ix, where, args = ("ix_follow_ups_due", "done_at IS NULL", ()) if staff is None else \
+                          ("ix_follow_ups_staff", "done_at IS NULL AND staff = ?", (staff,))
+        count = f"SELECT COUNT(*) FROM follow_ups INDEXED BY {ix} WHERE {where}"
+        r = self.conn().execute(f"SELECT ({count} AND due < ?), ({count} AND due = ?), ({count})",
+                                (*args, today, *args, today, *args)).fetchone()
+        return {"overdue": r[0], "today": r[1], "open": r[2]}
+
+    def follow_up_staff(self):
+        # Staff with open follow-ups → how many each (walks the (staff, due) index of open rows)
+        return {r["staff"]: r["n"] for r in self._rows(
+            "SELECT staff, COUNT(*) AS n FROM follow_ups WHERE done_at IS NULL GROUP BY staff ORDER BY staff")}
+
+    def complete_follow_ups(self, ids):
+        c = self.conn()
+        with c:
+            c.executemany("UPDATE follow_ups SET done_at = ? WHERE id = ? AND done_at IS NULL",
+                          [(time.time(), i) for i in ids])
+
+    def reschedule_follow_up(self, follow_up_id, due):
+        c = self.conn()
+        with c:
+            c.execute("UPDATE follow_ups SET due = ? WHERE id = ? AND done_at IS NULL", (due, follow_up_id))
+            c.execute("UPDATE interventions SET follow_up = ? WHERE id = ?", (due, follow_up_id))
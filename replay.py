@@ -0,0 +1,107 @@
+"""
+GABORONE TECHNICAL COLLEGE — SCORING REPLAY
+Streams recorded scoring requests (one applicant JSON object per line) at a fixed rate into the
+scoring service and reports throughput and tail latency. Sends are open-loop: latency is measured
+from each request's scheduled send time, so a stalled service shows up in the tail instead of
+silently slowing the replay down. Lines that are not applicant payloads are skipped and counted.
+Run: python replay.py [--file requests.jsonl] [--rate 500] [--url http://127.0.0.1:8600] [--start]
+     python replay.py --synthetic 5000 --start     (random applicants when no recording is at hand)
+"""
+
+import argparse, http.client, json, threading, time, urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import service
+
+APPLICANT_KEYS = {"age", "gender", "campus", "program", "year", "source", "distance",
+                  "transport", "parent_ed", "fin_aid", "working"}
+
+
+def read_requests(path):
+    payloads, skipped = [], 0
+    with open(path) as f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            if isinstance(obj, dict) and APPLICANT_KEYS <= obj.keys():
+                payloads.append(obj)
+            elif line.strip():
+                skipped += 1
+    return payloads, skipped
+
+
+def replay(url, payloads, rate, concurrency=32):
+    u = urllib.parse.urlparse(url)
+    local = threading.local()
+    lat = np.full(len(payloads), np.nan)
+    codes = {}
+    lock = threading.Lock()
+
+    def send(i, body, scheduled):
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(u.hostname, u.port, timeout=30)
+        try:
+            conn.request("POST", "/score", body, {"Content-Type": "application/json"})
+            r = conn.getresponse()
+            r.read()
+            code = r.status
+        except (OSError, http.client.HTTPException):
+            local.conn = None
+            code = "conn-error"
+        lat[i] = (time.perf_counter() - scheduled) * 1e3
+        with lock:
+            codes[code] = codes.get(code, 0) + 1
+
+    bodies = [json.dumps(p) for p in payloads]
+    with ThreadPoolExecutor(concurrency) as pool:
+        t0 = time.perf_counter()
+        for i, body in enumerate(bodies):
+            scheduled = t0 + i / rate
+            pause = scheduled - time.perf_counter()
+            if pause > 0:
+                time.sleep(pause)
+            pool.submit(send, i, body, scheduled)
+    elapsed = time.perf_counter() - t0
+    return {"requests": len(payloads), "seconds": round(elapsed, 3),
+            "target_rps": rate, "achieved_rps": round(len(payloads) / elapsed, 1),
+            "status": {str(k): v for k, v in sorted(codes.items(), key=str)},
+            **{f"p{q}_ms": round(float(np.nanpercentile(lat, q)), 2) for q in (50, 95, 99)},
+            "max_ms": round(float(np.nanmax(lat)), 2)}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Replay recorded scoring requests against the service")
+    ap.add_argument("--file",        default="requests.jsonl")
+    ap.add_argument("--synthetic",   type=int, default=0, help="replay N random applicants instead of --file")
+    ap.add_argument("--rate",        type=float, default=500, help="requests per second")
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--url",         default=f"http://{service.HOST}:{service.PORT}")
+    ap.add_argument("--start",       action="store_true", help="start an in-process service on --url first")
+    ap.add_argument("--max-batch",   type=int, default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = ap.parse_args()
+
+    if args.start:
+        u = urllib.parse.urlparse(args.url)
+        server = service.serve(u.hostname, u.port, args.max_batch, args.max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = service.ScoringClient(args.url)
+
+    if args.synthetic:
+        from bench_applicant import random_applicants
+        payloads, skipped = random_applicants(client, args.synthetic), 0
+    else:
+        payloads, skipped = read_requests(args.file)
+    if not payloads:
+        raise SystemExit(f"No applicant payloads in {args.file} ({skipped} other lines skipped) — "
+                         f"record some or use --synthetic N")
+
+    report = replay(args.url, payloads, args.rate, args.concurrency)
+    report["skipped_lines"] = skipped
+    report["service"] = client._call("GET", "/stats")
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,279 @@
+"""
+GABORONE TECHNICAL COLLEGE — DROPOUT SCORING
+Batch: runs model.pkl over the whole student table and writes dropout_probability + risk_level back out.
+Large tables are read in chunks and scored on a process pool (one model copy per worker). The change
+feed's figures since the last run are folded in first (changefeed.fold), so the new dataset holds them.
+Single applicant: ApplicantScorer is the low-latency path behind the registration form (and the
+service's micro-batches): each applicant is written into a preallocated per-thread row with dict
+lookups (FeaturePipeline.fill), no DataFrame; bulk imports go through the column-wise transform.
+Run: python scoring.py [--input student_data_scored.csv] [--output student_data_scored.csv]
+                       [--chunksize 250000] [--workers 4] [--feed student_changes.db | --feed '']
+"""
+
+import argparse, json, os, threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import joblib
+
+from features import AGE_MATURE, DISTANCE_FAR, FeaturePipeline
+from perf import Timer, peak_rss_mb
+from trees import TreeEnsemble
+
+MODEL_PATH    = "model.pkl"
+FEATURES_PATH = "features.json"
+SCORED_CSV    = "student_data_scored.csv"
+
+# Dropout probability (%) cut-offs → board risk levels
+RISK_BINS   = [30, 55, 75]
+RISK_LEVELS = np.array(["Low Risk", "Medium Risk", "High Risk", "Critical"])
+
+# Registration form uses three levels
+APPLICANT_BINS   = [30, 55]
+APPLICANT_LEVELS = ["LOW RISK", "MEDIUM RISK", "HIGH RISK"]
+
+# Encoder pickles keyed by the applicant field they encode
+ENCODER_PATHS = {"campus":    "le_campus.pkl",
+                 "program":   "le_program.pkl",
+                 "source":    "le_source.pkl",
+                 "parent_ed": "le_parent.pkl",
+                 "gender":    "le_gender.pkl"}
+
+
+def load_model(model_path=MODEL_PATH, features_path=FEATURES_PATH):
+    with open(features_path) as f: feat = json.load(f)
+    return joblib.load(model_path), feat
+
+
+def load_encoders(paths=ENCODER_PATHS):
+    return {field: joblib.load(path) for field, path in paths.items()}
+
+
+def risk_level(prob):
+    return RISK_LEVELS[np.searchsorted(RISK_BINS, np.asarray(prob) * 100, side="right")]
+
+
+def predict(model, X):
+    return model.predict_proba(X)[:, 1]
+
+
+def score_frame(df, model, features):
+    prob = predict(model, df[features].to_numpy(np.float64))
+    out = df.copy()
+    out["dropout_probability"] = prob.round(4)
+    out["risk_level"]          = risk_level(prob)
+    return out
+
+
+# ── SINGLE APPLICANT ──────────────────────────────────────────────
+# Registration-form field → raw student column fed to the feature pipeline
+APPLICANT_COLUMNS = {"age": "age", "gender": "gender", "campus": "campus", "program": "program",
+                     "year": "year_enrolled", "source": "enrollment_source",
+                     "distance": "distance_from_campus_km", "transport": "has_transport",
+                     "parent_ed": "parent_education", "fin_aid": "has_financial_aid", "working": "working_student"}
+
+# Attendance / grades are unknown at registration — score with typical values
+APPLICANT_DEFAULTS = {"attendance_rate_pct": 80.0, "grade_average_pct": 55.0,
+                      "courses_failed": 0, "warnings_issued": 0}
+
+RANGES = {"age": (16, 65), "distance": (0.5, 150.0), "year": (2020, 2035)}
+FLAG_FIELDS = ["transport", "fin_aid", "working"]
+
+
+def applicant_record(a):
+    # Registration-form dict → raw student columns (FeaturePipeline.fill)
+    rec = {col: a[field] for field, col in APPLICANT_COLUMNS.items()}
+    rec.update(APPLICANT_DEFAULTS)
+    return rec
+
+
+def applicant_frame(applicants):
+    cols = {col: [a[field] for a in applicants] for field, col in APPLICANT_COLUMNS.items()}
+    cols.update({col: [v] * len(applicants) for col, v in APPLICANT_DEFAULTS.items()})
+    return pd.DataFrame(cols)
+
+
+def applicant_table(frame):
+    # Same columns as applicant_frame, from a frame with one registration-form field per column
+    cols = {col: frame[field].to_numpy() for field, col in APPLICANT_COLUMNS.items()}
+    cols.update({col: np.full(len(frame), v) for col, v in APPLICANT_DEFAULTS.items()})
+    return pd.DataFrame(cols)
+
+
+def applicant_level(prob):
+    return np.asarray(APPLICANT_LEVELS)[np.searchsorted(APPLICANT_BINS, np.asarray(prob) * 100, side="right")]
+
+
+def validate_table(frame, choices):
+    # ApplicantScorer.validate for a whole frame: one vectorized pass per field, error text per row ("" = valid).
+    # Flags must already be 0 / 1 (NaN = unreadable); choices maps field → allowed values.
+    errors = pd.Series("", index=frame.index, dtype=object)
+    def add(mask, msg):
+        nonlocal errors
+        errors = errors + np.where(mask, "; " + msg, "")
+    for field, allowed in choices.items():
+        values = frame[field]
+        add(values.isna(), f"Missing {field}")
+        add(values.notna() & ~values.isin(list(allowed)), f"Unknown {field}: " + values.astype(str))
+    for field, (lo, hi) in RANGES.items():
+        v = pd.to_numeric(frame[field], errors="coerce")
+        add(~v.between(lo, hi), f"{field} must be between {lo} and {hi} (got " + frame[field].astype(str) + ")")
+    for field in FLAG_FIELDS:
+        add(frame[field].isna(), f"{field} must be yes / no")
+    return errors.str.removeprefix("; ")
+
+
+class ApplicantScorer:
+    def __init__(self, model, features, classes):
+        self.model = model
+        self.pipeline = FeaturePipeline(features, classes)
+        self.features = self.pipeline.features
+        self._choices = {field: set(self.pipeline.categories(field)) for field in classes}
+        self._local = threading.local()
+
+    @classmethod
+    def load(cls):
+        # One row at a time: the flattened trees skip sklearn's per-call overhead (see bench_trees.py)
+        model, features = load_model()
+        return cls(TreeEnsemble.from_model(model), features,
+                   {field: le.classes_ for field, le in load_encoders().items()})
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls(bundle.ensemble, bundle.features, bundle.encoders)
+
+    def categories(self, field):
+        return self.pipeline.categories(field)
+
+    def validate(self, a):
+        errors = [f"Unknown {field}: {a.get(field)!r}" for field in self._choices if a.get(field) not in self._choices[field]]
+        for field, (lo, hi) in RANGES.items():
+            v = a.get(field)
+            if not isinstance(v, (int, float)) or isinstance(v, bool) or not lo <= v <= hi:
+                errors.append(f"{field} must be between {lo} and {hi} (got {v!r})")
+        errors += [f"Missing {field}" for field in FLAG_FIELDS if field not in a]
+        if errors:
+            raise ValueError("; ".join(errors))
+
+    def score(self, a):
+        self.validate(a)
+        return self.score_batch([a])[0]
+
+    def _buffer(self, n):
+        # Preallocated feature rows per thread (Streamlit sessions and service requests run on their own)
+        buf = getattr(self._local, "buf", None)
+        if buf is None or len(buf) < n:
+            buf = self._local.buf = np.empty((max(n, 1), len(self.features)), dtype=np.float64)
+        return buf
+
+    def score_batch(self, applicants, X=None):
+        # Applicants must already be validated; X is an optional preallocated (>= n, features) buffer
+        X = (self._buffer(len(applicants)) if X is None else X)[:len(applicants)]
+        for a, row in zip(applicants, X):
+            self.pipeline.fill(applicant_record(a), row)
+        return [self._result(a, float(p)) for a, p in zip(applicants, predict(self.model, X))]
+
+    def score_table(self, frame):
+        # Bulk import: a validated frame of form fields → probability + level per row, in one model call
+        prob = predict(self.model, self.pipeline.transform(applicant_table(frame)))
+        return pd.DataFrame({"probability": prob, "level": applicant_level(prob)}, index=frame.index)
+
+    def _result(self, a, prob):
+        return {"probability": prob,
+                "level":       str(applicant_level(prob)),
+                "flags":       risk_factors(a)}
+
+
+def risk_factors(a):
+    flags = []
+    if a["distance"] > DISTANCE_FAR:        flags.append(f"Lives {a['distance']:.0f}km from campus — commute is difficult")
+    if not a["transport"]:                  flags.append("No personal transport — relies on public transport")
+    if a["working"]:                        flags.append("Working part-time — may struggle to balance job and studies")
+    if a["parent_ed"] in ("None","Primary"): flags.append("Low parent/guardian education — less academic support at home")
+    if not a["fin_aid"]:                    flags.append("Not applying for financial aid — may face financial pressure")
+    if a["age"] > AGE_MATURE:               flags.append(f"Age {a['age']} — mature students often face work/family competing priorities")
+    return flags
+
+
+# ── PROCESS POOL ──────────────────────────────────────────────────
+_worker_model = None
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = joblib.load(model_path)
+
+def _predict_chunk(X):
+    return predict(_worker_model, X)
+
+
+def score_csv(input_path=SCORED_CSV, output_path=SCORED_CSV, chunksize=250_000, workers=None,
+              model_path=MODEL_PATH, features_path=FEATURES_PATH, feed_path=None):
+    import changefeed, store
+    model, features = load_model(model_path, features_path)
+    workers = workers or os.cpu_count() or 1
+    tmp_path = output_path + ".tmp"
+    rows = 0
+
+    # Change-feed entries the input does not hold yet: each student's latest figures, folded into every chunk
+    # (feed_path None = changefeed.FEED_PATH, "" = fold nothing)
+    feed_path = changefeed.FEED_PATH if feed_path is None else feed_path
+    folded = store.feed_seq(input_path)
+    latest = None
+    if feed_path and os.path.exists(feed_path):
+        feed = changefeed.ChangeFeed(feed_path)
+        head = feed.head()
+        latest, folded = feed.latest(folded, head), max(folded, head)
+
+    def fold(chunk):
+        return changefeed.fold(chunk, latest) if latest is not None and len(latest) else chunk
+
+    def write(chunk, prob, first):
+        chunk = chunk.drop(columns=["dropout_probability", "risk_level"], errors="ignore")
+        chunk["dropout_probability"] = prob.round(4)
+        chunk["risk_level"]          = risk_level(prob)
+        chunk.to_csv(tmp_path, mode="w" if first else "a", header=first, index=False)
+        return len(chunk)
+
+    with Timer() as t:
+        chunks = map(fold, pd.read_csv(input_path, chunksize=chunksize))
+        if workers == 1:
+            for i, chunk in enumerate(chunks):
+                rows += write(chunk, predict(model, chunk[features].to_numpy(np.float64)), i == 0)
+        else:
+            # Keep at most 2 chunks per worker in flight so memory stays bounded
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append((chunk, pool.submit(_predict_chunk, chunk[features].to_numpy(np.float64))))
+                    if len(pending) >= 2 * workers:
+                        c, fut = pending.popleft()
+                        rows += write(c, fut.result(), rows == 0)
+                while pending:
+                    c, fut = pending.popleft()
+                    rows += write(c, fut.result(), rows == 0)
+        os.replace(tmp_path, output_path)
+        store.set_feed_seq(folded, output_path)
+
+    return {
+        "rows":             rows,
+        "feed_students":    0 if latest is None else len(latest),
+        "seconds":          round(t.seconds, 3),
+        "rows_per_sec":     round(rows / t.seconds) if t.seconds else None,
+        "workers":          workers,
+        "peak_rss_mb":      round(peak_rss_mb(), 1),
+        "peak_rss_workers_mb": round(peak_rss_mb(children=True), 1),
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Score every student with model.pkl")
+    ap.add_argument("--input",     default=SCORED_CSV)
+    ap.add_argument("--output",    default=SCORED_CSV)
+    ap.add_argument("--chunksize", type=int, default=250_000)
+    ap.add_argument("--workers",   type=int, default=None, help="default: all cores")
+    ap.add_argument("--feed",      default=None, help="change feed to fold in (default student_changes.db, '' = none)")
+    args = ap.parse_args()
+    stats = score_csv(args.input, args.output, args.chunksize, args.workers, feed_path=args.feed)
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,226 @@
+"""
+GABORONE TECHNICAL COLLEGE — SCORING SERVICE
+Local HTTP service around the same ApplicantScorer (model.bundle) the registration form uses.
+Requests are validated on arrival, queued, and scored in micro-batches: a batch closes when it
+holds --max-batch applicants or --max-wait-ms has passed since its first request.
+  POST /score        one applicant (JSON object) → {"probability", "level", "flags"}; 400 if invalid
+  POST /score_table  {"applicants": [...]} (bulk import) → {"probability": [...], "level": [...]} in one
+                     model call, outside the micro-batches; 400 listing the invalid rows
+  GET  /categories   campus / program / source / parent_ed / gender choices
+  GET  /stats        requests, batches, mean batch size, queue wait
+ScoringClient is the drop-in scorer the Streamlit app uses when SCORING_URL is set. A refused
+connection, timeout or 5xx raises ServiceUnavailable, or goes to the client's in-process fallback.
+Run: python service.py [--port 8600] [--max-batch 64] [--max-wait-ms 5] [--drift]
+"""
+
+import argparse, json, queue, threading, time, urllib.error, urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import bundle
+import drift
+from scoring import ApplicantScorer, validate_table
+
+HOST, PORT = "127.0.0.1", 8600
+FIELDS     = ["campus", "program", "source", "parent_ed", "gender"]
+
+
+# ── MICRO-BATCHING ────────────────────────────────────────────────
+class MicroBatcher:
+    def __init__(self, scorer, max_batch=64, max_wait_ms=5.0, monitor=None):
+        self.scorer, self.max_batch, self.max_wait = scorer, max_batch, max_wait_ms / 1e3
+        self.monitor = monitor                    # drift.DriftMonitor (--drift), else nothing is counted
+        self._queue = queue.Queue()
+        self._X = np.empty((max_batch, len(scorer.features)))
+        self.stats = {"requests": 0, "batches": 0, "max_batch_seen": 0, "queue_wait_ms_total": 0.0}
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, applicant):
+        self.scorer.validate(applicant)           # ValueError → caller answers 400; never poisons a batch
+        fut = Future()
+        self._queue.put((applicant, fut, time.perf_counter()))
+        return fut
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            now = time.perf_counter()
+            try:
+                results = self.scorer.score_batch([a for a, _, _ in batch], self._X)
+            except Exception as e:                # a model failure fails this batch only
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut, _), r in zip(batch, results):
+                fut.set_result(r)
+            if self.monitor is not None:
+                self.monitor.observe([a for a, _, _ in batch])
+            s = self.stats
+            s["requests"] += len(batch)
+            s["batches"] += 1
+            s["max_batch_seen"] = max(s["max_batch_seen"], len(batch))
+            s["queue_wait_ms_total"] += sum(now - t for _, _, t in batch) * 1e3
+
+    def summary(self):
+        s = dict(self.stats)
+        s["mean_batch"] = round(s["requests"] / s["batches"], 2) if s["batches"] else 0
+        s["mean_queue_wait_ms"] = round(s.pop("queue_wait_ms_total") / s["requests"], 3) if s["requests"] else 0
+        s.update(max_batch=self.max_batch, max_wait_ms=self.max_wait * 1e3, queued=self._queue.qsize())
+        return s
+
+
+# ── HTTP ──────────────────────────────────────────────────────────
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                 # keep-alive: replay clients reuse one connection each
+    disable_nagle_algorithm = True                # headers + body go out as separate writes
+    batcher = None
+
+    def _send(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/categories":
+            self._send(200, {f: self.batcher.scorer.categories(f) for f in FIELDS})
+        elif self.path == "/stats":
+            self._send(200, self.batcher.summary())
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path == "/score_table":
+            return self._score_table()
+        if self.path != "/score":
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        try:
+            applicant = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if not isinstance(applicant, dict):
+                raise ValueError("expected one applicant as a JSON object")
+            fut = self.batcher.submit(applicant)
+        except ValueError as e:                   # includes json.JSONDecodeError
+            return self._send(400, {"error": str(e)})
+        try:
+            self._send(200, fut.result(timeout=30))
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _score_table(self):
+        scorer = self.batcher.scorer
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            frame = pd.DataFrame(body["applicants"])
+            errors = validate_table(frame, {f: scorer.categories(f) for f in FIELDS})
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400, {"error": f"expected {{\"applicants\": [...]}} with every form field ({e})"})
+        bad = errors[errors != ""]
+        if len(bad):
+            return self._send(400, {"error": "; ".join(f"row {i}: {e}" for i, e in bad.head(20).items())})
+        try:
+            scores = scorer.score_table(frame)
+            if self.batcher.monitor is not None:
+                self.batcher.monitor.observe_table(frame)
+            self._send(200, {"probability": scores["probability"].tolist(), "level": scores["level"].tolist()})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(host=HOST, port=PORT, max_batch=64, max_wait_ms=5.0, scorer=None, drift_monitor=False):
+    # drift_monitor: count every applicant scored here on the Ops page. Off by default so replay and
+    # benchmark traffic never reaches drift/; the app counts the registrations it saves itself.
+    scorer = ApplicantScorer.from_bundle(bundle.load_or_build()) if scorer is None else scorer
+    monitor = drift.load_monitor("service") if drift_monitor else None
+    handler = type("ScoringHandler", (Handler,), {"batcher": MicroBatcher(scorer, max_batch, max_wait_ms, monitor)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ── CLIENT ────────────────────────────────────────────────────────
+class ServiceUnavailable(Exception):
+    # The service could not answer (connection refused, timeout, 5xx) — not a problem with the applicant
+    pass
+
+
+class ScoringClient:
+    # Same score() / score_table() / categories() interface as ApplicantScorer, backed by the service.
+    # fallback: zero-argument callable returning an in-process scorer, used for any call the service
+    # cannot answer; .degraded tells whether the last call went to it
+    def __init__(self, url, timeout=5.0, fallback=None):
+        self.url, self.timeout, self.fallback = url.rstrip("/"), timeout, fallback
+        self.degraded, self.last_error = False, None
+        self._categories = self._answer("GET", "/categories", None,
+                                        lambda s: {f: s.categories(f) for f in FIELDS})
+
+    def _call(self, method, path, body=None):
+        req = urllib.request.Request(self.url + path, method=method,
+                                     data=None if body is None else json.dumps(body).encode(),
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as r:
+                return json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 400:
+                raise ValueError(json.loads(e.read())["error"]) from None
+            raise ServiceUnavailable(f"scoring service returned HTTP {e.code} for {path}") from e
+        except (urllib.error.URLError, OSError) as e:          # refused, reset, timed out
+            raise ServiceUnavailable(f"scoring service at {self.url} unreachable ({getattr(e, 'reason', e)})") from e
+
+    def _answer(self, method, path, body, local):
+        # local(scorer): the same answer from the fallback scorer
+        try:
+            out = self._call(method, path, body)
+            self.degraded = False
+            return out
+        except ServiceUnavailable as e:
+            if self.fallback is None:
+                raise
+            self.degraded, self.last_error = True, str(e)
+            return local(self.fallback())
+
+    def categories(self, field):
+        return self._categories[field]
+
+    def score(self, a):
+        return self._answer("POST", "/score", a, lambda s: s.score(a))
+
+    def score_table(self, frame):
+        rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        out = self._answer("POST", "/score_table", {"applicants": rows}, lambda s: s.score_table(frame))
+        return out if isinstance(out, pd.DataFrame) else pd.DataFrame(out, index=frame.index)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Micro-batching HTTP scoring service")
+    ap.add_argument("--host",        default=HOST)
+    ap.add_argument("--port",        type=int,   default=PORT)
+    ap.add_argument("--max-batch",   type=int,   default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    ap.add_argument("--drift",       action="store_true", help="count scored applicants for the Ops drift view "
+                                                               "(for clients other than the app, which counts its own)")
+    args = ap.parse_args()
+    server = serve(args.host, args.port, args.max_batch, args.max_wait_ms, drift_monitor=args.drift)
+    print(f"Scoring service on http://{args.host}:{args.port} (batch ≤ {args.max_batch}, wait ≤ {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
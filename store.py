@@ -0,0 +1,135 @@
+"""
+GABORONE TECHNICAL COLLEGE — COLUMNAR STUDENT STORE
+Typed Parquet copy of student_data_scored.csv: categorical text columns, int8 flags, float32 metrics.
+Pages read only the columns they use (column projection) instead of re-parsing the whole CSV.
+The model-input columns that are pure functions of other columns (*_enc label codes and the six
+risk flags) are not stored: load() derives them on demand from the category codes / metrics
+(features.FeaturePipeline with the bundle's encoders), so a resident frame holds each fact once.
+Run: python store.py [--csv student_data_scored.csv] [--out student_data_scored.parquet] [--report]
+"""
+
+import argparse, os
+
+import pandas as pd
+
+from features import ENCODED, RAW_COLUMNS
+
+SCORED_CSV = "student_data_scored.csv"
+STORE_PATH = "student_data_scored.parquet"
+
+CATEGORY_COLS = ["gender", "campus", "program", "semester_enrolled", "enrollment_source",
+                 "parent_education", "status", "risk_level"]
+INT8_COLS     = ["age", "program_length_yrs", "has_transport", "has_financial_aid", "working_student",
+                 "courses_failed", "warnings_issued", "at_risk",
+                 "attendance_low", "grade_low", "failed_multiple", "distance_far", "age_mature", "parent_edu_low",
+                 "campus_enc", "program_enc", "source_enc", "parent_enc", "gender_enc"]
+INT16_COLS    = ["year_enrolled", "expected_grad_year"]
+# Derived on load, never stored
+DERIVED_COLS  = [*ENCODED, "attendance_low", "grade_low", "failed_multiple", "distance_far", "age_mature",
+                 "parent_edu_low"]
+FLOAT32_COLS  = ["distance_from_campus_km", "attendance_rate_pct", "grade_average_pct", "dropout_probability"]
+
+SCHEMA = {"student_id": "string",
+          **{c: "category" for c in CATEGORY_COLS},
+          **{c: "int8"     for c in INT8_COLS},
+          **{c: "int16"    for c in INT16_COLS},
+          **{c: "float32"  for c in FLOAT32_COLS}}
+
+
+def apply_schema(df):
+    return df.astype({c: t for c, t in SCHEMA.items() if c in df.columns})
+
+
+def derive(df, columns, model_bundle=None):
+    # Add derived model columns to a frame holding their raw inputs (features.RAW_COLUMNS)
+    import bundle
+    from features import FeaturePipeline
+    b = model_bundle or bundle.load_or_build()
+    X = FeaturePipeline(columns, b.encoders).transform(df)
+    return df.assign(**{c: X[:, j].astype(SCHEMA[c]) for j, c in enumerate(columns)})
+
+
+def convert(csv_path=SCORED_CSV, out_path=STORE_PATH):
+    df = pd.read_csv(csv_path, dtype={c: t for c, t in SCHEMA.items() if t in ("category", "string")})
+    df = apply_schema(df.drop(columns=DERIVED_COLS, errors="ignore"))
+    tmp_path = out_path + ".tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, out_path)
+    return df
+
+
+def is_stale(path=STORE_PATH, csv_path=SCORED_CSV):
+    if not os.path.exists(path):
+        return True
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+        return True
+    import pyarrow.parquet as pq
+    return bool(set(DERIVED_COLS) & set(pq.read_schema(path).names))       # written before columns were derived
+
+
+def feed_seq(csv_path=SCORED_CSV):
+    # Last change-feed entry scoring.py folded into the CSV (0 = none): later entries are not in the dataset
+    try:
+        with open(csv_path + ".feed_seq") as f: return int(f.read())
+    except FileNotFoundError:
+        return 0
+
+
+def set_feed_seq(seq, csv_path=SCORED_CSV):
+    # Written after the CSV itself, so a reader never pairs an older CSV with a newer seq
+    with open(csv_path + ".feed_seq.tmp", "w") as f: f.write(str(int(seq)))
+    os.replace(csv_path + ".feed_seq.tmp", csv_path + ".feed_seq")
+
+
+def load(columns=None, path=STORE_PATH, csv_path=SCORED_CSV):
+    # Rebuild the store when the CSV has been regenerated (e.g. by scoring.py)
+    if path == STORE_PATH and is_stale(path, csv_path):
+        convert(csv_path, path)
+    import pyarrow.parquet as pq
+    have = [c for c in pq.read_schema(path).names if c not in DERIVED_COLS]
+    if columns is None:
+        return _read(path, have)
+    derived = [c for c in columns if c in DERIVED_COLS]
+    stored = [c for c in columns if c in have]
+    if not derived:
+        return _read(path, stored)
+    inputs = [c for c in RAW_COLUMNS if c in have and c not in stored]
+    df = derive(_read(path, stored + inputs), derived)
+    return df[[c for c in columns if c in df.columns]]
+
+
+def _read(path, columns):
+    import pyarrow as pa
+    df = pd.read_parquet(path, columns=columns, engine="pyarrow")
+    pa.default_memory_pool().release_unused()      # hand the Arrow read buffers back; only the frame stays resident
+    return df
+
+
+# ── MEMORY REPORT ─────────────────────────────────────────────────
+def memory_report(raw, compact):
+    # Bytes per student, column by column: raw read_csv frame vs the compact resident frame
+    n = len(raw)
+    before = raw.memory_usage(deep=True, index=False) / n
+    after = compact.memory_usage(deep=True, index=False).reindex(before.index) / n
+    rep = pd.DataFrame({"raw_dtype": raw.dtypes.astype(str),
+                        "compact_dtype": compact.dtypes.astype(str).reindex(before.index).fillna("derived"),
+                        "raw_B": before, "compact_B": after.fillna(0)})
+    rep.loc["TOTAL"] = ["", "", rep["raw_B"].sum(), rep["compact_B"].sum()]
+    return rep.round(1)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Convert the scored CSV into the typed Parquet store")
+    ap.add_argument("--csv", default=SCORED_CSV)
+    ap.add_argument("--out", default=STORE_PATH)
+    ap.add_argument("--report", action="store_true", help="bytes per student, raw CSV frame vs compact frame")
+    args = ap.parse_args()
+    df = convert(args.csv, args.out)
+    print(f"{len(df):,} rows → {args.out} ({os.path.getsize(args.out)/1e6:.1f} MB on disk, "
+          f"{df.memory_usage(deep=True).sum()/1e6:.1f} MB in memory)")
+    if args.report:
+        rep = memory_report(pd.read_csv(args.csv), df)
+        print(rep.to_string())
+        total = rep.loc["TOTAL"]
+        print(f"{total['raw_B']:.0f} → {total['compact_B']:.0f} bytes per student "
+              f"({total['raw_B'] / total['compact_B']:.1f}x smaller)")
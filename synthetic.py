@@ -0,0 +1,182 @@
+"""
+GABORONE TECHNICAL COLLEGE — SYNTHETIC STUDENT GENERATOR
+Datasets of any size with the student_data.csv schema: campuses, programs and enrollment sources,
+a background-driven dropout model, attendance / grades / failures / warnings correlated with the
+outcome, and the at_risk rule used by the boards. Each chunk is drawn with NumPy in one vectorized
+pass (text columns are categoricals built from codes) and streamed to disk, so memory stays flat
+whatever the row count. --scored adds the model features (label codes from the shipped encoders),
+dropout_probability and risk_level, i.e. the student_data_scored.csv schema.
+Run: python synthetic.py --rows 10000000 --out students_10m.parquet [--scored] [--chunksize 500000] [--seed 0]
+"""
+
+import argparse, os
+
+import numpy as np
+import pandas as pd
+
+import bundle
+import store
+from features import FeaturePipeline
+from perf import Timer, peak_rss_mb
+from scoring import RISK_LEVELS, risk_level
+
+CAMPUSES = ["Main Campus - Gaborone", "Extension Campus - Mogoditshane", "Block 8 Campus"]
+PROGRAMS = ["Certificate in Auto Mechanics", "Certificate in Business Admin", "Certificate in Construction",
+            "Certificate in Hospitality", "Diploma in Accounting", "Diploma in Engineering",
+            "Diploma in Health Sciences", "Diploma in IT"]
+SOURCES  = ["Agent", "Facebook Ad", "Open Day", "Radio Ad", "Referral", "School Fair", "Walk-In", "Website Form"]
+GENDERS  = ["Female", "Male"]
+SEMESTERS = ["Semester 1", "Semester 2"]
+PARENT_EDUCATION = ["Primary", "Secondary", "Tertiary"]     # plus "None", stored as missing (as in training)
+STATUSES = ["Active", "Dropped Out", "Graduated", "On Leave"]
+YEARS = np.array([2023, 2024, 2025])
+CURRENT_YEAR = 2025
+
+SCORED_EXTRA = ["attendance_low", "grade_low", "failed_multiple", "distance_far", "age_mature", "parent_edu_low",
+                "campus_enc", "program_enc", "source_enc", "parent_enc", "gender_enc"]
+
+# Dropout model: log-odds contributions of each background factor
+DROP_BASE      = -0.05
+DROP_DISTANCE  = 0.015                                   # per km beyond the 43 km average
+DROP_WORKING   = 0.75
+DROP_TRANSPORT = -0.70
+DROP_FIN_AID   = -0.30
+DROP_PARENT    = np.array([0.35, -0.25, -0.40, 0.45])    # Primary, Secondary, Tertiary, None
+DROP_SOURCE    = np.array([0.0, 0.0, 0.0, 0.1, -0.35, 0.0, 0.05, 0.05])
+DROP_CERT      = 0.25
+DROP_YEAR      = np.array([0.0, -0.15, -0.75])           # later intakes have had less time to drop out
+ON_LEAVE_RATE  = 0.035
+
+# Attendance / grade by status (Active, Dropped Out, Graduated, On Leave)
+ATT_MEAN   = np.array([77.0, 68.8, 80.6, 79.0]);  ATT_SD = 10.0
+GRADE_MEAN = np.array([48.0, 31.0, 54.0, 52.0]);  GRADE_SD = 17.0
+GRADE_ATT_CORR = 0.55
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def chunk(n, rng, start=1, id_width=5):
+    # n students numbered from `start`, drawn in one vectorized pass
+    age       = rng.integers(18, 46, n)
+    gender    = rng.integers(0, len(GENDERS), n)
+    campus    = rng.integers(0, len(CAMPUSES), n)
+    program   = rng.integers(0, len(PROGRAMS), n)
+    year_i    = rng.integers(0, len(YEARS), n)
+    semester  = rng.integers(0, len(SEMESTERS), n)
+    source    = rng.integers(0, len(SOURCES), n)
+    distance  = np.round(rng.uniform(0.5, 85.0, n), 1)
+    transport = rng.random(n) < 0.69
+    parent    = rng.choice(4, n, p=[0.25, 0.25, 0.24, 0.26])          # 3 = "None"
+    fin_aid   = rng.random(n) < 0.45
+    working   = rng.random(n) < 0.34
+
+    cert = program < 4                                                 # PROGRAMS lists certificates first
+    length = np.where(cert, 1, 2)
+    year = YEARS[year_i]
+    grad_year = year + length
+
+    # Outcome: dropout from background, otherwise graduated once the program has run its course
+    logit = (DROP_BASE + DROP_DISTANCE * (distance - 43) + DROP_WORKING * working + DROP_TRANSPORT * transport
+             + DROP_FIN_AID * fin_aid + DROP_PARENT[parent] + DROP_SOURCE[source] + DROP_CERT * cert
+             + DROP_YEAR[year_i])
+    dropped = rng.random(n) < 1 / (1 + np.exp(-logit))
+    status = np.where(dropped, 1, np.where(grad_year <= CURRENT_YEAR, 2, 0))
+    status[(status == 0) & (rng.random(n) < ON_LEAVE_RATE)] = 3
+
+    # Attendance and grade: status-dependent means, correlated noise, clipped to the recorded ranges
+    z_att, z_gr = rng.standard_normal(n), rng.standard_normal(n)
+    attendance = np.clip(ATT_MEAN[status] + ATT_SD * z_att, 40, 100).round(1)
+    grade = GRADE_MEAN[status] + GRADE_SD * (GRADE_ATT_CORR * z_att + np.sqrt(1 - GRADE_ATT_CORR ** 2) * z_gr)
+    grade = np.clip(grade, 30, 95).round(1)
+    failed = np.minimum(rng.poisson(2.6 * np.exp(-0.045 * (grade - 30))), 5)
+    att_low, grade_low, fail_multi = attendance < 75, grade < 55, failed >= 2
+    warnings = np.minimum(att_low.astype(np.int64) + grade_low + fail_multi, 3)
+    at_risk = (status == 0) & (att_low | grade_low | fail_multi)
+
+    ids = pd.Series(np.arange(start, start + n)).astype(str).str.zfill(id_width)
+    return pd.DataFrame({
+        "student_id":              "GTC-" + ids,
+        "age":                     age,
+        "gender":                  _categorical(gender, GENDERS),
+        "campus":                  _categorical(campus, CAMPUSES),
+        "program":                 _categorical(program, PROGRAMS),
+        "program_length_yrs":      length,
+        "year_enrolled":           year,
+        "semester_enrolled":       _categorical(semester, SEMESTERS),
+        "expected_grad_year":      grad_year,
+        "enrollment_source":       _categorical(source, SOURCES),
+        "distance_from_campus_km": distance,
+        "has_transport":           transport.astype(np.int64),
+        "parent_education":        _categorical(np.where(parent == 3, -1, parent), PARENT_EDUCATION),
+        "has_financial_aid":       fin_aid.astype(np.int64),
+        "working_student":         working.astype(np.int64),
+        "attendance_rate_pct":     attendance,
+        "grade_average_pct":       grade,
+        "courses_failed":          failed,
+        "warnings_issued":         warnings,
+        "status":                  _categorical(status, STATUSES),
+        "at_risk":                 at_risk.astype(np.int64),
+    })
+
+
+def add_scores(df, model_bundle):
+    # Model features (flags + label codes from the bundle's encoders), dropout_probability, risk_level
+    pipe = FeaturePipeline.from_bundle(model_bundle)
+    X = pipe.transform(df)
+    col = {f: i for i, f in enumerate(pipe.features)}
+    for f in SCORED_EXTRA:
+        df[f] = X[:, col[f]].astype(np.int64)
+    prob = model_bundle.ensemble.predict_proba(X)[:, 1]
+    df["dropout_probability"] = prob.round(4)
+    df["risk_level"] = pd.Categorical(risk_level(prob), categories=RISK_LEVELS)
+    return df
+
+
+def frame(n, seed=0, scored=False):
+    # One in-memory dataset (benchmarks); use write() for anything that should not fit in memory
+    df = chunk(n, np.random.default_rng([seed, 0]), id_width=max(5, len(str(n))))
+    if scored:
+        df = add_scores(df, bundle.load_or_build())
+    return df
+
+
+def write(path, rows, chunksize=500_000, seed=0, scored=False):
+    # Stream `rows` students to .csv or .parquet, one chunk in memory at a time
+    model_bundle = bundle.load_or_build() if scored else None
+    parquet = path.endswith(".parquet")
+    tmp_path, writer = path + ".tmp", None
+    width = max(5, len(str(rows)))
+    try:
+        for i, start in enumerate(range(0, rows, chunksize)):
+            df = chunk(min(chunksize, rows - start), np.random.default_rng([seed, i]), start + 1, width)
+            if scored:
+                df = add_scores(df, model_bundle)
+            if parquet:
+                import pyarrow as pa, pyarrow.parquet as pq
+                table = pa.Table.from_pandas(store.apply_schema(df), preserve_index=False)
+                writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                df.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return rows
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Generate a synthetic student dataset of any size")
+    ap.add_argument("--rows", type=int, default=2_500)
+    ap.add_argument("--out", default="student_data_synthetic.csv", help=".csv or .parquet")
+    ap.add_argument("--chunksize", type=int, default=500_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--scored", action="store_true", help="add model features, dropout_probability, risk_level")
+    args = ap.parse_args()
+
+    with Timer() as t:
+        rows = write(args.out, args.rows, args.chunksize, args.seed, args.scored)
+    print(f"{rows:,} rows → {args.out} in {t.seconds:.1f}s ({rows / t.seconds:,.0f} rows/s, "
+          f"{os.path.getsize(args.out) / 1e6:.1f} MB on disk, peak RSS {peak_rss_mb():.0f} MB)")
@@ -0,0 +1,89 @@
+"""
+GABORONE TECHNICAL COLLEGE — FEATURE PIPELINE TESTS
+FeaturePipeline.fill (one record into a preallocated row, the registration form / service path) must
+build exactly the matrix FeaturePipeline.transform builds column-wise, transform must reproduce every
+stored *_enc / flag column of student_data_scored.csv, and ApplicantScorer must score the same as the
+model on transform's matrix.
+Run: python -m pytest -q test_features.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bundle
+import store
+from features import RAW_COLUMNS, SCORED_CSV, FeaturePipeline
+from scoring import ApplicantScorer, applicant_frame, applicant_record, predict
+
+
+@pytest.fixture(scope="module")
+def model_bundle():
+    return bundle.load()
+
+
+@pytest.fixture(scope="module")
+def pipe(model_bundle):
+    return FeaturePipeline.from_bundle(model_bundle)
+
+
+def random_applicants(pipe, n, seed=0):
+    rng = np.random.default_rng(seed)
+    pick = lambda field: pipe.categories(field)[rng.integers(len(pipe.categories(field)))]
+    return [{"age": int(rng.integers(16, 66)), "gender": pick("gender"), "campus": pick("campus"),
+             "program": pick("program"), "year": int(rng.integers(2020, 2036)), "source": pick("source"),
+             "distance": float(rng.uniform(0.5, 150)), "transport": bool(rng.integers(2)),
+             "parent_ed": pick("parent_ed"), "fin_aid": bool(rng.integers(2)), "working": bool(rng.integers(2))}
+            for _ in range(n)]
+
+
+def fill_all(pipe, records):
+    X = np.full((len(records), len(pipe.features)), -1.0)
+    for rec, row in zip(records, X):
+        pipe.fill(rec, row)
+    return X
+
+
+def test_fill_matches_transform_for_applicants(pipe):
+    applicants = random_applicants(pipe, 2_000)
+    assert {a["parent_ed"] for a in applicants} >= {"None", "Primary"}
+    expected = pipe.transform(applicant_frame(applicants))
+    assert (fill_all(pipe, [applicant_record(a) for a in applicants]) == expected).all()
+
+
+def test_transform_matches_scored_csv(pipe):
+    # The columns the model was trained on, straight from the file (not through store's dtypes)
+    raw = pd.read_csv(SCORED_CSV)
+    X = pipe.transform(raw[RAW_COLUMNS])
+    mismatched = {f: int((X[:, j] != raw[f].to_numpy(np.float64)).sum()) for j, f in enumerate(pipe.features)}
+    assert {f: n for f, n in mismatched.items() if n} == {}
+
+
+def test_fill_matches_transform_for_students(pipe):
+    # Real rows: attendance / grade / failure flags and every category the dataset holds
+    df = store.load(columns=RAW_COLUMNS)
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    assert (fill_all(pipe, records) == pipe.transform(df)).all()
+
+
+def test_fill_missing_values_match_transform(pipe):
+    rec = applicant_record(random_applicants(pipe, 1)[0])
+    rec.update(parent_education=None, attendance_rate_pct=None, courses_failed=None)
+    expected = pipe.transform(pd.DataFrame([rec]))
+    np.testing.assert_array_equal(fill_all(pipe, [rec]), expected)     # NaN where transform has NaN
+
+
+def test_fill_rejects_unknown_category(pipe):
+    rec = applicant_record(random_applicants(pipe, 1)[0])
+    rec["campus"] = "Nowhere Campus"
+    with pytest.raises(ValueError, match="Unknown campus"):
+        pipe.fill(rec, np.empty(len(pipe.features)))
+
+
+def test_scorer_matches_model_on_transform(model_bundle, pipe):
+    scorer = ApplicantScorer.from_bundle(model_bundle)
+    applicants = random_applicants(pipe, 500, seed=1)
+    expected = predict(model_bundle.ensemble, pipe.transform(applicant_frame(applicants)))
+    got = [r["probability"] for r in scorer.score_batch(applicants)]
+    assert np.array_equal(got, expected)
+    assert [scorer.score(a)["probability"] for a in applicants[:20]] == got[:20]
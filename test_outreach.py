@@ -0,0 +1,49 @@
+"""
+GABORONE TECHNICAL COLLEGE — OUTREACH FOLLOW-UP TESTS
+Repeated outreach runs keep one automated follow-up per student and never close one a counselor scheduled.
+Run: python -m pytest -q test_outreach.py
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from outreach import Dispatcher, StubTransport
+from records import RecordStore
+
+COHORT = [{"student_id": f"GTC-{i:05d}", "program": "Diploma in IT", "campus": "Main Campus - Gaborone"}
+          for i in range(1, 6)]
+LATER = str(date.today() + timedelta(days=30))
+
+
+def send(records):
+    stub = StubTransport(outbox=None, latency=0.0)
+    progress = asyncio.run(Dispatcher({"SMS": stub}, records).run(COHORT, "SMS", "Student Support"))
+    assert progress["sent"] == progress["logged"] == len(COHORT)
+
+
+def open_follow_ups(records):
+    return records.due_follow_ups(LATER, limit=1000)
+
+
+def test_outreach_replaces_its_own_follow_ups(tmp_path):
+    records = RecordStore(str(tmp_path / "records.db"))
+    counselor = records.add_intervention({"student_id": "GTC-00001", "date": str(date.today()),
+                                          "intervention": "Counseling Session", "outcome": "Positive",
+                                          "staff": "Ms Dube", "follow_up": str(date.today() + timedelta(days=3))})
+    send(records)
+    send(records)
+
+    rows = open_follow_ups(records)
+    auto = [r for r in rows if r["intervention"] == "SMS Sent"]
+    assert sorted(r["student_id"] for r in auto) == [s["student_id"] for s in COHORT]    # one each, not two
+    assert [r["id"] for r in rows if r["staff"] == "Ms Dube"] == [counselor]
+    assert records.intervention_count() == 1 + 2 * len(COHORT)
+
+
+def test_counselor_intervention_closes_automated_follow_up(tmp_path):
+    records = RecordStore(str(tmp_path / "records.db"))
+    send(records)
+    records.add_intervention({"student_id": "GTC-00002", "date": str(date.today()), "intervention": "Phone Call",
+                              "outcome": "Positive", "staff": "Mr Sello", "follow_up": ""})
+    assert "GTC-00002" not in {r["student_id"] for r in open_follow_ups(records)}
+    assert records.follow_up_counts(str(date.today()))["open"] == len(COHORT) - 1
@@ -0,0 +1,112 @@
+"""
+GABORONE TECHNICAL COLLEGE — NATIVE TREE INFERENCE
+Flattens the GradientBoosting trees in model.pkl into contiguous numpy arrays and evaluates all
+trees for a whole batch at once, without sklearn's per-call overhead.
+Every tree is padded to a complete binary tree of the ensemble's max depth (a leaf above the bottom
+level is copied into all of its descendants), so a row walks level by level with index arithmetic:
+node → 2·node + 1 + (x[feature] > threshold). Matches model.predict_proba to within 1e-9.
+Run: python trees.py   (exports model.pkl → model_trees.npz and checks parity)
+"""
+
+import numpy as np
+
+MODEL_PATH = "model.pkl"
+TREES_PATH = "model_trees.npz"
+ARRAYS     = ["feature", "threshold", "value"]
+
+
+def _floor32(t):
+    # Largest float32 <= t: for float32 inputs, x > t  ⇔  x > _floor32(t)
+    t32 = np.float32(t)
+    return np.nextafter(t32, np.float32(-np.inf)) if t32 > t else t32
+
+
+class TreeEnsemble:
+    def __init__(self, feature, threshold, value, init):
+        self.feature   = feature      # (trees, 2^depth - 1) intp    split feature per internal slot
+        self.threshold = threshold    # (trees, 2^depth - 1) float32 split threshold per internal slot
+        self.value     = value        # (trees, 2^depth)     float64 leaf value × learning rate
+        self.init      = float(init)  # raw score of the prior
+        self.n_trees, n_inner = feature.shape
+        self.depth = int(np.log2(n_inner + 1))
+        self._feat  = np.asarray(feature, dtype=np.intp).reshape(-1)    # a view (no copy) when already intp
+        self._thr   = threshold.ravel()
+        self._leaf  = value.ravel()
+        self._base  = (np.arange(self.n_trees, dtype=np.intp) * n_inner)[None, :]
+        self._lbase = (np.arange(self.n_trees, dtype=np.intp) * (n_inner + 1) - n_inner)[None, :]
+
+    # ── EXPORT ────────────────────────────────────────────────────
+    @classmethod
+    def from_model(cls, model):
+        if model.n_classes_ != 2:
+            raise ValueError("Only binary GradientBoosting classifiers can be exported")
+        trees = [est.tree_ for est in model.estimators_[:, 0]]
+        depth = max(t.max_depth for t in trees)
+        n_inner = 2 ** depth - 1
+        feature   = np.zeros((len(trees), n_inner), dtype=np.intp)
+        threshold = np.full((len(trees), n_inner), np.inf, dtype=np.float32)
+        value     = np.zeros((len(trees), n_inner + 1), dtype=np.float64)
+
+        for i, t in enumerate(trees):
+            stack = [(0, 0)]                      # (sklearn node, slot in the complete tree)
+            while stack:
+                node, slot = stack.pop()
+                if slot >= n_inner:
+                    value[i, slot - n_inner] = model.learning_rate * t.value[node, 0, 0]
+                elif t.children_left[node] < 0:   # early leaf: pad with an always-left split
+                    stack += [(node, 2 * slot + 1), (node, 2 * slot + 2)]
+                else:
+                    feature[i, slot]   = t.feature[node]
+                    threshold[i, slot] = _floor32(t.threshold[node])
+                    stack += [(t.children_left[node], 2 * slot + 1), (t.children_right[node], 2 * slot + 2)]
+
+        init = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0]
+        return cls(feature, threshold, value, init)
+
+    def save(self, path=TREES_PATH):
+        np.savez(path, init=self.init, **{k: getattr(self, k) for k in ARRAYS})
+
+    @classmethod
+    def load(cls, path=TREES_PATH):
+        with np.load(path) as z:
+            return cls(*(z[k] for k in ARRAYS), z["init"])
+
+    # ── EVALUATE ──────────────────────────────────────────────────
+    def raw(self, X, chunk=256):
+        # sklearn trees see float32 inputs; thresholds were floored to float32 so the compare is exact
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        out = np.empty(len(X), dtype=np.float64)
+        for s in range(0, len(X), chunk):
+            Xc = X[s:s + chunk]
+            flat = Xc.ravel()
+            rows = (np.arange(len(Xc), dtype=np.intp) * X.shape[1])[:, None]
+            slot = np.zeros((len(Xc), self.n_trees), dtype=np.intp)
+            for _ in range(self.depth):
+                k = self._base + slot
+                slot = 2 * slot + 1 + (flat[rows + self._feat[k]] > self._thr[k])
+            out[s:s + chunk] = self.init + self._leaf[self._lbase + slot].sum(axis=1)
+        return out
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.raw(X)))
+        return np.column_stack([1.0 - p, p])
+
+
+def export(model_path=MODEL_PATH, path=TREES_PATH):
+    import joblib
+    model = joblib.load(model_path)
+    ens = TreeEnsemble.from_model(model)
+    ens.save(path)
+    return model, ens
+
+
+if __name__ == "__main__":
+    import json, warnings
+    import pandas as pd
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    model, ens = export()
+    with open("features.json") as f: features = json.load(f)
+    X = pd.read_csv("student_data_scored.csv")[features].to_numpy(np.float64)
+    diff = np.abs(ens.predict_proba(X) - model.predict_proba(X)).max()
+    print(f"{ens.n_trees} trees, depth {ens.depth} → {TREES_PATH}; max |Δp| vs sklearn = {diff:.2e}")
+    assert diff < 1e-9